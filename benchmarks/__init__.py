@@ -0,0 +1,5 @@
+"""
+Benchmarks for the Rays RAG system.
+Each module is a standalone script; run them from the project root, e.g.
+`python -m benchmarks.bench_cleaning`.
+"""
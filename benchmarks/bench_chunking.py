@@ -0,0 +1,119 @@
+"""
+Micro-benchmark for ContentChunker.create_chunks.
+Compares the current chunk builder with the previous string-concatenating
+implementation (kept below) on the raw knowledge-base files, and checks that
+both produce identical chunks. The previous implementation's progress output
+is counted but not written anywhere, so its timings exclude console I/O.
+
+Run from the project root:
+    python -m benchmarks.bench_chunking
+"""
+
+import argparse
+import contextlib
+import timeit
+from pathlib import Path
+from typing import List
+
+from src.rag.processing.chunker import ContentChunker
+
+DEFAULT_FILES = [
+    "content/rays_content_raw.md",
+    "crawl/content/rays_content_raw.md",
+]
+
+
+class _CountingWriter:
+    """Text stream that discards output and counts characters written."""
+
+    def __init__(self):
+        self.chars = 0
+
+    def write(self, text: str) -> int:
+        self.chars += len(text)
+        return len(text)
+
+    def flush(self) -> None:
+        pass
+
+
+def legacy_create_chunks(chunker: ContentChunker, content: str) -> List[str]:
+    """ContentChunker.create_chunks as it was before the rewrite."""
+    chunks = []
+    current_chunk = ""
+
+    sections = [content]
+    print(f"split_by_headers produced {len(sections)} sections")
+    for idx, sec in enumerate(sections):
+        print(f"Section {idx} (first 100 chars): {sec[:100]}")
+
+    for section in sections:
+        paragraphs = section.split('\n\n')
+        print(f"Section {idx} has {len(paragraphs)} paragraphs")
+        for pidx, para in enumerate(paragraphs):
+            print(f"Paragraph {pidx} (len {len(para)}): {para[:100]}")
+
+        for paragraph in paragraphs:
+            if not paragraph.strip():
+                continue
+
+            if len(current_chunk) + len(paragraph) > chunker.max_chunk_size:
+                if len(current_chunk) >= chunker.min_chunk_size:
+                    chunks.append(current_chunk.strip())
+
+                if len(current_chunk) > chunker.overlap_size:
+                    current_chunk = current_chunk[-chunker.overlap_size:] + "\n\n" + paragraph
+                else:
+                    current_chunk = paragraph
+            else:
+                if current_chunk:
+                    current_chunk += "\n\n" + paragraph
+                else:
+                    current_chunk = paragraph
+
+    if current_chunk and len(current_chunk) >= chunker.min_chunk_size:
+        chunks.append(current_chunk.strip())
+
+    return chunks
+
+
+def bench_file(path: Path, repeat: int, scale: int, chunker: ContentChunker) -> None:
+    """Time both chunk builders on one file and print the results."""
+    content = "\n\n".join([path.read_text(encoding="utf-8")] * scale)
+
+    writer = _CountingWriter()
+    with contextlib.redirect_stdout(writer):
+        legacy_output = legacy_create_chunks(chunker, content)
+    printed = writer.chars
+    if chunker.create_chunks(content) != legacy_output:
+        raise SystemExit(f"!!! Output mismatch on {path}")
+
+    megabytes = len(content.encode("utf-8")) / 1e6
+    with contextlib.redirect_stdout(writer):
+        legacy = min(timeit.repeat(lambda: legacy_create_chunks(chunker, content), number=1, repeat=repeat))
+    current = min(timeit.repeat(lambda: chunker.create_chunks(content), number=1, repeat=repeat))
+
+    print(f"\n{path} x{scale} ({megabytes:.2f} MB, {len(legacy_output)} chunks)")
+    print(f"  legacy:  {legacy * 1e3:8.2f} ms  ({megabytes / legacy:7.1f} MB/s, "
+          f"plus {printed / 1e3:.1f} KB of stdout per call)")
+    print(f"  current: {current * 1e3:8.2f} ms  ({megabytes / current:7.1f} MB/s, no stdout)")
+    print(f"  speedup: {legacy / current:8.2f}x  (outputs identical)")
+
+
+def main():
+    """Run the chunking benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark ContentChunker.create_chunks")
+    parser.add_argument("files", nargs="*", default=DEFAULT_FILES, help="Markdown files to chunk")
+    parser.add_argument("--repeat", type=int, default=10, help="Timing repetitions (best is reported)")
+    parser.add_argument("--scale", type=int, default=1, help="Concatenate each file this many times")
+    parser.add_argument("--max-chunk-size", type=int, default=512, help="ContentChunker max_chunk_size")
+    parser.add_argument("--overlap", type=int, default=50, help="ContentChunker overlap_size")
+    args = parser.parse_args()
+
+    chunker = ContentChunker(max_chunk_size=args.max_chunk_size, overlap_size=args.overlap)
+    for name in args.files:
+        bench_file(Path(name), args.repeat, args.scale, chunker)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Micro-benchmark for ContentCleaner.
+Compares the compiled cleaning engine (`clean_content`) with the stepwise
+reference pipeline on the raw knowledge-base files, and checks that both
+produce identical output.
+
+Run from the project root:
+    python -m benchmarks.bench_cleaning
+"""
+
+import argparse
+import timeit
+from pathlib import Path
+
+from src.rag.processing.cleaner import ContentCleaner
+
+DEFAULT_FILES = [
+    "content/rays_content_raw.md",
+    "crawl/content/rays_content_raw.md",
+]
+
+
+def bench_file(path: Path, repeat: int) -> None:
+    """Time both cleaning pipelines on one file and print the results."""
+    raw = path.read_text(encoding="utf-8")
+    cleaner = ContentCleaner()
+
+    engine_output = cleaner.clean_content(raw)
+    stepwise_output = ContentCleaner.clean_content_stepwise(raw) or None
+    if engine_output != stepwise_output:
+        raise SystemExit(f"!!! Output mismatch on {path}")
+
+    megabytes = len(raw.encode("utf-8")) / 1e6
+    stepwise = min(timeit.repeat(lambda: ContentCleaner.clean_content_stepwise(raw), number=1, repeat=repeat))
+    engine = min(timeit.repeat(lambda: cleaner.clean_content(raw), number=1, repeat=repeat))
+
+    print(f"\n{path} ({megabytes:.2f} MB)")
+    print(f"  stepwise: {stepwise * 1e3:8.2f} ms  ({megabytes / stepwise:7.1f} MB/s)")
+    print(f"  engine:   {engine * 1e3:8.2f} ms  ({megabytes / engine:7.1f} MB/s)")
+    print(f"  speedup:  {stepwise / engine:8.2f}x  (outputs identical)")
+
+
+def main():
+    """Run the cleaning benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark ContentCleaner")
+    parser.add_argument("files", nargs="*", default=DEFAULT_FILES, help="Markdown files to clean")
+    parser.add_argument("--repeat", type=int, default=20, help="Timing repetitions (best is reported)")
+    args = parser.parse_args()
+
+    for name in args.files:
+        bench_file(Path(name), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Startup benchmark for the RAG packages.
+Measures cold-import time of each target in a fresh interpreter using
+`python -X importtime`, and lists the slowest modules it pulls in and any
+heavy dependencies that were loaded.
+
+Run from the project root:
+    python -m benchmarks.bench_startup [module ...]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+DEFAULT_TARGETS = [
+    "src.rag",
+    "src.rag.processing",
+    "src.rag.storage",
+    "rays_rag",
+]
+
+# Dependencies that should only load when a feature actually needs them
+HEAVY_MODULES = [
+    "torch",
+    "transformers",
+    "sentence_transformers",
+    "chromadb",
+    "crawl4ai",
+    "langchain_core",
+    "langchain_anthropic",
+    "streamlit",
+]
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int, int]]:
+    """
+    Parse `-X importtime` output.
+
+    Args:
+        stderr: Interpreter stderr
+
+    Returns:
+        List of (module, depth, self microseconds, cumulative microseconds)
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        rows.append((name.strip(), depth, int(self_us), int(cumulative_us)))
+    return rows
+
+
+def run_import(statement: str) -> List[Tuple[str, int, int, int]]:
+    """Run `statement` in a fresh interpreter and return its import timings."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        raise SystemExit(f"!!! `{statement}` failed:\n{result.stderr.splitlines()[-1]}")
+    return parse_importtime(result.stderr)
+
+
+def bench_target(target: str, baseline: set, runs: int, top: int) -> None:
+    """Time importing one module and print the results."""
+    totals = []
+    slowest: Dict[str, int] = {}
+    loaded = set()
+    for _ in range(runs):
+        rows = [row for row in run_import(f"import {target}") if row[0] not in baseline]
+        # Top-level rows are the imports made by the statement itself
+        totals.append(sum(cumulative for _, depth, _, cumulative in rows if depth == 0))
+        for name, _, self_us, _ in rows:
+            slowest[name] = min(slowest.get(name, self_us), self_us)
+        loaded = {name for name, _, _, _ in rows}
+
+    heavy = [name for name in HEAVY_MODULES if name in loaded]
+    print(f"\nimport {target}")
+    print(f"  cold import: {statistics.median(totals) / 1e3:8.1f} ms median over {runs} runs "
+          f"({len(loaded)} modules)")
+    print(f"  heavy deps:  {', '.join(heavy) if heavy else 'none'}")
+    for name, self_us in sorted(slowest.items(), key=lambda item: -item[1])[:top]:
+        print(f"    {self_us / 1e3:7.1f} ms  {name}")
+
+
+def main():
+    """Run the startup benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark cold-import time")
+    parser.add_argument("targets", nargs="*", default=DEFAULT_TARGETS, help="Modules to import")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per target (median is reported)")
+    parser.add_argument("--top", type=int, default=5, help="Slowest modules to list per target")
+    args = parser.parse_args()
+
+    # Modules the interpreter loads at startup are not part of any target's cost
+    baseline = {name for name, _, _, _ in run_import("pass")}
+    for target in args.targets:
+        bench_target(target, baseline, args.runs, args.top)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Vector search benchmark for the RAG stores.
+Compares NumpyVectorStore (exact float32 search), QuantizedVectorStore (int8
+first pass plus full-precision rescoring), and optionally a Chroma HNSW
+collection on an index snapshot or a synthetic clustered corpus, reporting
+recall@k against exact search, query latency, and the memory held for vectors.
+
+Run from the project root:
+    python -m benchmarks.bench_vector_search [--snapshot index_snapshot] [--size 50000] [--hnsw]
+"""
+
+import argparse
+import time
+from typing import Callable, List
+
+import numpy as np
+
+from src.rag.storage.numpy_store import NumpyVectorStore
+from src.rag.storage.quantized import QuantizedVectorStore
+
+
+def synthetic_corpus(size: int, dim: int, clusters: int = 64, seed: int = 0) -> np.ndarray:
+    """Unit vectors drawn around random topic centres, like chunk embeddings of a few sites."""
+    rng = np.random.default_rng(seed)
+    centres = rng.normal(size=(clusters, dim))
+    vectors = centres[rng.integers(clusters, size=size)] + 0.6 * rng.normal(size=(size, dim))
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+
+def time_queries(search: Callable[[np.ndarray], List[List[int]]], queries: np.ndarray, repeat: int) -> float:
+    """Best-of-`repeat` milliseconds per query."""
+    search(queries[:1])
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for query in queries:
+            search(query[None, :])
+        best = min(best, (time.perf_counter() - start) / len(queries))
+    return best * 1e3
+
+
+def main():
+    """Run the vector search benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark exact and quantized vector search")
+    parser.add_argument("--snapshot", help="Index snapshot directory to take vectors from")
+    parser.add_argument("--size", type=int, default=50000, help="Synthetic corpus size")
+    parser.add_argument("--dim", type=int, default=1024, help="Synthetic vector dimension")
+    parser.add_argument("--queries", type=int, default=100, help="Number of queries")
+    parser.add_argument("--k", type=int, default=10, help="Results per query")
+    parser.add_argument("--rescore-factor", type=int, nargs="+", default=[1, 2, 4, 8], help="Rescored candidates per result")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing repetitions (best is reported)")
+    parser.add_argument("--hnsw", action="store_true", help="Also build and query a Chroma HNSW collection")
+    args = parser.parse_args()
+
+    if args.snapshot:
+        from src.rag.storage.snapshot import IndexSnapshot
+
+        snapshot = IndexSnapshot.load(args.snapshot)
+        if snapshot is None:
+            raise SystemExit(f"No index snapshot at {args.snapshot}")
+        corpus = np.asarray(snapshot.embeddings, dtype=np.float32)
+        corpus /= np.linalg.norm(corpus, axis=1, keepdims=True)
+        source = f"{args.snapshot} ({snapshot.model_name})"
+    else:
+        corpus = synthetic_corpus(args.size, args.dim)
+        source = "synthetic clustered corpus"
+    rng = np.random.default_rng(1)
+    # Queries are perturbed corpus vectors, so each has genuine near neighbours
+    queries = corpus[rng.choice(len(corpus), size=args.queries, replace=False)]
+    queries = queries + 0.05 * rng.normal(size=queries.shape).astype(np.float32)
+    k = min(args.k, len(corpus))
+
+    ids = [str(i) for i in range(len(corpus))]
+    empty_documents, empty_metadatas = [""] * len(corpus), [{}] * len(corpus)
+    exact_store = NumpyVectorStore("bench_vector_search", embedding_function=None, max_exact_documents=0)
+    exact_store.add_embeddings(ids, corpus, empty_documents, empty_metadatas)
+
+    def exact_search(batch: np.ndarray) -> List[List[int]]:
+        return [[int(i) for i in row] for row in exact_store.query(query_embeddings=batch, n_results=k)["ids"]]
+
+    exact = exact_search(queries)
+    print(f"\n{len(corpus)} x {corpus.shape[1]} vectors from {source}, {len(queries)} queries, k={k}")
+    print(f"{'store':<24}{'vector MB in RAM':>18}{'ms/query':>10}{f'recall@{k}':>11}")
+    latency = time_queries(exact_search, queries, args.repeat)
+    print(f"{'numpy exact':<24}{exact_store.embeddings.nbytes / 1e6:>18.1f}{latency:>10.3f}{1.0:>11.3f}")
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        exact_search(queries)
+    batched = (time.perf_counter() - start) / args.repeat / len(queries) * 1e3
+    print(f"{'numpy exact, batched':<24}{exact_store.embeddings.nbytes / 1e6:>18.1f}{batched:>10.3f}{1.0:>11.3f}")
+
+    if args.hnsw:
+        import chromadb
+
+        client = chromadb.EphemeralClient()
+        collection = client.create_collection("bench_vector_search_hnsw", metadata={"hnsw:space": "cosine"})
+        for start in range(0, len(corpus), client.get_max_batch_size()):
+            stop = start + client.get_max_batch_size()
+            collection.add(ids=ids[start:stop], embeddings=corpus[start:stop].tolist())
+
+        def hnsw_search(batch: np.ndarray) -> List[List[int]]:
+            return [[int(i) for i in row] for row in collection.query(query_embeddings=batch.tolist(), n_results=k, include=[])["ids"]]
+
+        found = hnsw_search(queries)
+        recall = np.mean([len(set(a) & set(b)) / k for a, b in zip(exact, found)])
+        print(f"{'chroma hnsw':<24}{'-':>18}{time_queries(hnsw_search, queries, args.repeat):>10.3f}{recall:>11.3f}")
+        client.delete_collection("bench_vector_search_hnsw")
+
+    store = QuantizedVectorStore("bench_vector_search", embedding_function=lambda texts: [])
+    store.add_embeddings(ids, corpus, empty_documents, empty_metadatas)
+    for factor in args.rescore_factor:
+        store.rescore_factor = factor
+
+        def quantized_search(batch: np.ndarray) -> List[List[int]]:
+            return [[int(i) for i in row] for row in store.query_by_embeddings(batch, n_results=k)["ids"]]
+
+        found = quantized_search(queries)
+        recall = np.mean([len(set(a) & set(b)) / k for a, b in zip(exact, found)])
+        latency = time_queries(quantized_search, queries, args.repeat)
+        print(f"{f'int8 + rescore x{factor}':<24}{store.codes.nbytes / 1e6:>18.1f}{latency:>10.3f}{recall:>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Fallback threshold calibration for the RAG system.
+Retrieves every question of a labelled set against the serving index, then
+picks the best-match distance threshold above which RaysRAG answers with the
+templated fallback instead of calling the LLM.
+
+Each line of the question file is {"question": "...", "answerable": true|false}.
+
+Run from the project root:
+    python -m benchmarks.calibrate_fallback [--questions benchmarks/fallback_questions.jsonl] [--max-false-fallback-rate 0.02]
+"""
+
+import argparse
+import json
+
+from rays_rag import create_embedding_function, open_index
+from src.rag.config.settings import ADAPTIVE_K_MAX, FALLBACK_DISTANCE_THRESHOLD
+from src.rag.serving.fallback import best_distance, calibrate_threshold
+
+
+def main():
+    """Run the fallback threshold calibration."""
+    parser = argparse.ArgumentParser(description="Calibrate the low-confidence fallback threshold")
+    parser.add_argument("--questions", default="benchmarks/fallback_questions.jsonl", help="Labelled question file (JSON lines)")
+    parser.add_argument(
+        "--max-false-fallback-rate",
+        type=float,
+        default=0.02,
+        help="Tolerated share of answerable questions that get the fallback"
+    )
+    args = parser.parse_args()
+
+    with open(args.questions, encoding="utf-8") as f:
+        labelled = [json.loads(line) for line in f if line.strip()]
+    questions = [item["question"] for item in labelled]
+
+    retriever, embedding_function, index_version = open_index(create_embedding_function())
+    results = retriever.retrieve_many(
+        questions,
+        n_results=ADAPTIVE_K_MAX,
+        query_embeddings=embedding_function(questions)
+    )
+    distances = [best_distance(result["distances"]) for result in results]
+
+    answerable = [d for d, item in zip(distances, labelled) if item["answerable"] and d is not None]
+    unanswerable = [d for d, item in zip(distances, labelled) if not item["answerable"] and d is not None]
+    print(f"\nIndex {index_version}: {len(answerable)} answerable, {len(unanswerable)} unanswerable questions")
+    print(f"{'best distance':>14}  {'label':<12}question")
+    for distance, item in sorted(zip(distances, labelled), key=lambda pair: pair[0] if pair[0] is not None else -1.0):
+        label = "answerable" if item["answerable"] else "off-topic"
+        shown = f"{distance:.3f}" if distance is not None else "-"
+        print(f"{shown:>14}  {label:<12}{item['question']}")
+
+    report = calibrate_threshold(answerable, unanswerable, args.max_false_fallback_rate)
+    print(
+        f"\nThreshold {report['threshold']:.3f} (currently {FALLBACK_DISTANCE_THRESHOLD:.3f}): "
+        f"{report['false_fallback_rate']:.1%} of answerable questions fall back, "
+        f"{report['fallback_recall']:.1%} of unanswerable questions skip the LLM"
+    )
+    print(
+        f"Set FALLBACK_DISTANCE_THRESHOLD = {report['threshold']:.2f} and FALLBACK_ENABLED = True "
+        "in src/rag/config/settings.py to apply it."
+    )
+
+
+if __name__ == "__main__":
+    main()
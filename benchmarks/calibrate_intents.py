@@ -0,0 +1,75 @@
+"""
+Intent routing calibration for the RAG system.
+Embeds every message of a labelled set with the serving embedding model, then
+picks the intent centroid similarity at or above which RaysRAG gives a canned
+small-talk reply instead of retrieving and calling the LLM.
+
+Each line of the message file is {"message": "...", "small_talk": true|false}.
+Messages that are exact intent examples, or longer than INTENT_MAX_WORDS, are
+routed the same way at any threshold and are left out.
+
+Run from the project root:
+    python -m benchmarks.calibrate_intents [--messages benchmarks/intent_messages.jsonl] [--max-false-route-rate 0.0]
+"""
+
+import argparse
+import json
+import math
+
+from rays_rag import create_embedding_function
+from src.rag.config.settings import INTENT_SIMILARITY_THRESHOLD
+from src.rag.embeddings.cache import uncached
+from src.rag.serving.intents import IntentRouter, calibrate_similarity_threshold
+
+
+def main():
+    """Run the intent similarity threshold calibration."""
+    parser = argparse.ArgumentParser(description="Calibrate the intent routing similarity threshold")
+    parser.add_argument("--messages", default="benchmarks/intent_messages.jsonl", help="Labelled message file (JSON lines)")
+    parser.add_argument(
+        "--max-false-route-rate",
+        type=float,
+        default=0.0,
+        help="Tolerated share of real questions that get a canned reply"
+    )
+    args = parser.parse_args()
+
+    with open(args.messages, encoding="utf-8") as f:
+        labelled = [json.loads(line) for line in f if line.strip()]
+
+    # Queries are embedded without the on-disk cache, as when serving
+    embedding_function = uncached(create_embedding_function())
+    router = IntentRouter(embedding_function=embedding_function)
+    candidates = [item for item in labelled if router.match_phrase(item["message"]) is None]
+    embeddings = embedding_function([item["message"] for item in candidates])
+    scored = []
+    for item, query_embedding in zip(candidates, embeddings):
+        nearest = router.nearest(item["message"], query_embedding)
+        if nearest is not None:
+            scored.append((nearest[1], nearest[0], item))
+
+    small_talk = [similarity for similarity, _, item in scored if item["small_talk"]]
+    questions = [similarity for similarity, _, item in scored if not item["small_talk"]]
+    print(f"\n{len(small_talk)} small-talk messages, {len(questions)} real questions "
+          f"({len(labelled) - len(scored)} skipped as exact phrases or too long)")
+    print(f"{'similarity':>10}  {'label':<12}{'nearest':<14}message")
+    for similarity, intent, item in sorted(scored, key=lambda entry: entry[0], reverse=True):
+        label = "small talk" if item["small_talk"] else "question"
+        print(f"{similarity:>10.3f}  {label:<12}{intent:<14}{item['message']}")
+
+    report = calibrate_similarity_threshold(small_talk, questions, args.max_false_route_rate)
+    print(
+        f"\nThreshold {report['threshold']:.3f} (currently {INTENT_SIMILARITY_THRESHOLD:.3f}): "
+        f"{report['false_route_rate']:.1%} of real questions get a canned reply, "
+        f"{report['route_recall']:.1%} of small talk skips retrieval"
+    )
+    # Round up, so the rounded threshold still keeps the questions out
+    suggested = math.ceil(report["threshold"] * 1000) / 1000
+    print(
+        f"Set INTENT_SIMILARITY_THRESHOLD = {suggested:.3f} in src/rag/config/settings.py "
+        "to enable centroid routing, if that recall is worth it."
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -24,6 +24,8 @@ import chromadb
 from chromadb.config import Settings
 from chromadb.utils import embedding_functions
 
+from src.rag.embeddings.cache import cached_embedding_function
+
 # Import Crawl4AI components
 from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig, CacheMode
 from crawl4ai.content_filter_strategy import PruningContentFilter
@@ -58,10 +60,14 @@ def initialize_chromadb():
         persist_directory="./chroma_db"  # Where to store the database
     ))
     
-    # Create or get the collection
+    # Create or get the collection; the on-disk cache skips re-embedding unchanged text
     collection = client.get_or_create_collection(
         name="rays_website_content",
-        embedding_function=embedding_functions.DefaultEmbeddingFunction()
+        embedding_function=cached_embedding_function(
+            embedding_functions.DefaultEmbeddingFunction(),
+            model_name="all-MiniLM-L6-v2",
+            revision="onnx"
+        )
     )
     
     return client, collection
@@ -4,8 +4,11 @@ This module provides a web interface for interacting with the Rays RAG chatbot.
 """
 
 import streamlit as st
-from rays_rag import RaysRAG
-import time
+from rays_rag import get_shared_rag
+from src.rag.utils.log import configure_logging
+
+# Routing, fallback, and top-k decisions go to the server log
+configure_logging()
 
 # Page configuration
 st.set_page_config(
@@ -46,12 +49,14 @@ st.markdown("""
     </style>
     """, unsafe_allow_html=True)
 
-# Initialize session state for chat history
+# Initialize session state for chat history; sessions hold nothing else
 if "messages" not in st.session_state:
     st.session_state.messages = []
 
-if "rag" not in st.session_state:
-    st.session_state.rag = RaysRAG()
+# The model, index, and LLM client are built once per server process and
+# shared by every session
+with st.spinner("Warming up Robo Raymond..."):
+    rag = get_shared_rag()
 
 # Header
 st.title("⚾ Robo Raymond")
@@ -80,17 +85,16 @@ if prompt := st.chat_input("Ask about the Rays..."):
     # Get bot response
     with st.chat_message("assistant"):
         message_placeholder = st.empty()
-        # Add a typing indicator
+        # Render tokens as the LLM produces them; the spinner covers retrieval
+        # until the first one arrives. Time to first token is in rag.metrics.
         with st.spinner("Thinking..."):
-            response = st.session_state.rag.ask(prompt)
-        
-        # Stream the response
-        full_response = ""
-        for chunk in response.split():
-            full_response += chunk + " "
-            time.sleep(0.05)  # Add a small delay for typing effect
-            message_placeholder.markdown(full_response + "▌")
-        message_placeholder.markdown(full_response)
+            tokens = rag.stream(prompt)
+            response = next(tokens, "")
+        message_placeholder.markdown(response + "▌")
+        for token in tokens:
+            response += token
+            message_placeholder.markdown(response + "▌")
+        message_placeholder.markdown(response)
     
     # Add assistant response to chat history
     st.session_state.messages.append({"role": "assistant", "content": response})
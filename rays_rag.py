@@ -6,68 +6,387 @@ This module:
 3. Uses LangChain for the RAG implementation
 """
 
-from typing import List, Dict, Any
-import chromadb
-from chromadb.config import Settings
-from chromadb.utils import embedding_functions
-import torch
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_anthropic import ChatAnthropic
-from langchain_core.output_parsers import StrOutputParser
-from langchain_core.runnables import RunnablePassthrough
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, AsyncIterator, Iterator, Optional, Tuple
+import argparse
+import asyncio
+import functools
+import logging
+import sys
+import time
+import numpy as np
 from dotenv import load_dotenv
 import os
-from src.rag.processing.cleaner import ContentCleaner
-from src.rag.processing.chunker import ContentChunker
-import re
+from src.rag.processing.pipeline import preprocess_sections
+from src.rag.utils.markdown_utils import iter_markdown_file
+from src.rag.utils.log import configure_logging
+from src.rag.config.settings import (
+    ADAPTIVE_K_ENABLED,
+    ADAPTIVE_K_MAX,
+    ANSWER_CACHE_ENABLED,
+    ANSWER_CONCURRENCY,
+    FALLBACK_DISTANCE_THRESHOLD,
+    FALLBACK_ENABLED,
+    INTENT_ROUTER_ENABLED,
+    INTENT_SIMILARITY_THRESHOLD,
+    BM25_B,
+    BM25_K1,
+    EMBEDDING_BATCH_SIZE,
+    EMBEDDING_PROJECTION_DIM,
+    EMBEDDING_PROJECTION_WHITEN,
+    HYBRID_RETRIEVAL_ENABLED,
+    PREPROCESS_BATCH_WORKERS,
+    QUERY_CACHE_ENABLED,
+    QUERY_CACHE_TTL_SECONDS,
+    QUERY_EMBEDDING_CACHE_SIZE,
+    RETRIEVAL_CACHE_SIZE,
+    RETRIEVAL_WORKERS,
+    VECTOR_STORE,
+)
+from src.rag.embeddings.backends import create_embedding_backend, embedding_model_id
+from src.rag.storage.batching import iter_embedding_batches
+from src.rag.storage.snapshot import IndexSnapshot, FINGERPRINT_PROBE_TEXT, file_sha256
+from src.rag.serving.registry import ResourceRegistry, shared_registry
+from src.rag.serving.answer_cache import SemanticAnswerCache
+from src.rag.serving.query_cache import LRUCache, normalize_query, retrieval_key
+from src.rag.serving.metrics import LatencyMetrics
+from src.rag.serving.fallback import fallback_answer, is_low_confidence
+from src.rag.serving.intents import IntentRouter
+from src.rag.retrieval.context import assemble_context
+from src.rag.retrieval.adaptive import adaptive_k
 
-try:
+# chromadb, sentence-transformers, and LangChain are imported where they are
+# first used, so importing this module (e.g. for load_knowledge_base) stays cheap
+
+# Inside the Streamlit app, streamlit is already imported; read the API key from its secrets
+if "streamlit" in sys.modules:
     import streamlit as st
     if "anthropic" in st.secrets and "api_key" in st.secrets["anthropic"]:
         os.environ["ANTHROPIC_API_KEY"] = st.secrets["anthropic"]["api_key"]
-except ImportError:
-    # Not running in Streamlit, ignore
-    pass
 
 # Load environment variables
 load_dotenv()
 
+# Named explicitly so the logs are configured the same when run as a script
+logger = logging.getLogger("rays_rag")
+
 # Configuration
 COLLECTION_NAME = "rays_website_content_bge"
+EMBEDDING_MODEL_NAME = "BAAI/bge-large-en-v1.5"
+KNOWLEDGE_BASE_PATH = "crawl/content/rays_content_raw.md"
+INDEX_SNAPSHOT_DIR = "index_snapshot"  # Written by `python rays_rag.py --build-index`
+WARMUP_QUERY = "Where can I buy tickets for a Rays game?"
+STREAM_ERROR_SEPARATOR = "\n\n---\n\n"  # Sets an error notice apart from a partially streamed answer
+TOP_K = 4  # Chunks sent to the LLM when adaptive top-k is off
+# Vectors differ between backends, so caches and snapshots key on this
+EMBEDDING_MODEL_ID = embedding_model_id(EMBEDDING_MODEL_NAME)
+
+
+def create_embedding_function():
+    """Create the embedding function shared by index builds and queries."""
+    from src.rag.embeddings.cache import cached_embedding_function
+
+    # Always use CPU for embeddings on Streamlit Cloud; EMBEDDING_BACKEND picks
+    # PyTorch or an exported ONNX graph, pinned to EMBEDDING_MODEL_REVISION
+    embedding_function = create_embedding_backend(EMBEDDING_MODEL_NAME, device="cpu")
+    # Only genuinely new text is embedded; everything else comes from the on-disk
+    # cache, keyed on the revision the model was actually loaded from. Queries
+    # bypass it (see RaysRAG.query_embedding_function).
+    return cached_embedding_function(embedding_function, model_name=EMBEDDING_MODEL_ID)
+
+
+def load_knowledge_base(
+    md_path: str = KNOWLEDGE_BASE_PATH,
+    workers: Optional[int] = None
+) -> Tuple[List[str], List[Dict], List[str]]:
+    """
+    Parse the markdown knowledge base into cleaned, chunked documents.
+
+    Args:
+        md_path: Path of the markdown file written by MarkdownGenerator
+        workers: Cleaning/chunking processes; defaults to PREPROCESS_WORKERS
+
+    Returns:
+        Tuple of (documents, metadatas, ids)
+    """
+    if not os.path.isfile(md_path):
+        raise RuntimeError(f"Knowledge base markdown file not found at {md_path}")
+    if os.path.getsize(md_path) == 0:
+        raise RuntimeError(f"Knowledge base markdown file at {md_path} is empty.")
+
+    # Sections are parsed line by line and handed to the cleaning/chunking pool
+    # as they are read; results come back in section order
+    sections_seen = []
+
+    def sections():
+        for section_name, url, content in iter_markdown_file(md_path):
+            sections_seen.append((section_name, url))
+            yield url, content
+
+    documents = []
+    metadatas = []
+    ids = []
+    seen_ids = set()
+    results = preprocess_sections(sections(), workers=workers, tokenizer_model=EMBEDDING_MODEL_NAME)
+    for index, (_, chunks) in enumerate(results):
+        section_name, url = sections_seen[index]
+        print(f"--- Section: {section_name} | URL: {url} | {len(chunks)} chunks ---")
+        if not chunks:
+            print("Content was empty after cleaning, skipping.")
+            continue
+        for chunk in chunks:
+            if chunk["id"] in seen_ids:
+                continue
+            seen_ids.add(chunk["id"])
+            documents.append(chunk["text"])
+            metadatas.append(chunk["metadata"])
+            ids.append(chunk["id"])
+    if not sections_seen:
+        raise RuntimeError("No sections found in the markdown knowledge base.")
+
+    print(f"Parsed {len(sections_seen)} sections from the markdown knowledge base.")
+    if not documents:
+        raise RuntimeError("No documents were parsed from the markdown knowledge base.")
+    return documents, metadatas, ids
+
+
+def build_index(
+    snapshot_dir: str = INDEX_SNAPSHOT_DIR,
+    md_path: str = KNOWLEDGE_BASE_PATH
+) -> IndexSnapshot:
+    """
+    Build the index offline and write it as a snapshot that RaysRAG can load
+    at startup without re-embedding the corpus.
+
+    Args:
+        snapshot_dir: Directory to write the snapshot to
+        md_path: Path of the markdown knowledge base
+
+    Returns:
+        IndexSnapshot: The snapshot that was written
+    """
+    from src.rag.embeddings.cache import uncached
+    from src.rag.embeddings.projection import corpus_projection
+
+    embedding_function = create_embedding_function()
+    # Offline batch ingest, so cleaning and chunking may use every core
+    documents, metadatas, ids = load_knowledge_base(md_path, workers=PREPROCESS_BATCH_WORKERS)
+    # The fingerprint must come from the model itself, never from the cache
+    probe_embedding = uncached(embedding_function)([FINGERPRINT_PROBE_TEXT])[0]
+
+    # Chunk IDs are content hashes, so vectors for unchanged chunks can be
+    # reused from the previous snapshot and only new chunks need embedding
+    previous = IndexSnapshot.load(
+        snapshot_dir,
+        model_name=EMBEDDING_MODEL_ID,
+        probe_embedding=probe_embedding,
+        mmap=False
+    )
+    previous_rows = {doc_id: row for row, doc_id in enumerate(previous.ids)} if previous else {}
+    missing = [i for i, doc_id in enumerate(ids) if doc_id not in previous_rows]
+    print(
+        f"{len(documents) - len(missing)} of {len(documents)} documents unchanged; "
+        f"embedding {len(missing)} with {EMBEDDING_MODEL_ID}..."
+    )
+
+    embeddings = np.zeros((len(ids), len(probe_embedding)), dtype=np.float32)
+    for i, doc_id in enumerate(ids):
+        if doc_id in previous_rows:
+            embeddings[i] = previous.embeddings[previous_rows[doc_id]]
+    missing_documents = [documents[i] for i in missing]
+    batches = iter_embedding_batches(embedding_function, missing_documents, EMBEDDING_BATCH_SIZE)
+    for indices, batch_embeddings, elapsed in batches:
+        embeddings[[missing[j] for j in indices]] = np.asarray(batch_embeddings, dtype=np.float32)
+        print(f"  Embedded {len(indices)} docs in {elapsed:.2f}s ({len(indices) / max(elapsed, 1e-9):.1f} docs/sec)")
+
+    # The snapshot keeps full-dimension vectors; the projection is stored next
+    # to them and applied when they are loaded into the index
+    projection = corpus_projection(embeddings, EMBEDDING_PROJECTION_DIM, EMBEDDING_PROJECTION_WHITEN)
+
+    return IndexSnapshot.write(
+        snapshot_dir,
+        ids=ids,
+        documents=documents,
+        metadatas=metadatas,
+        embeddings=embeddings,
+        model_name=EMBEDDING_MODEL_ID,
+        probe_embedding=probe_embedding,
+        source_sha256=file_sha256(md_path),
+        projection=projection
+    )
+
+
+def open_index(embedding_function: Any) -> Tuple[Any, Any, Optional[str]]:
+    """
+    Create the in-process vector store and fill it from the index snapshot,
+    or from the markdown knowledge base when there is no valid snapshot,
+    and build the BM25 keyword index over the same documents.
+
+    When EMBEDDING_PROJECTION_DIM is set, the corpus vectors are reduced with
+    the snapshot's projection (fitted on the corpus if it has none), and the
+    returned embedding function applies the same projection to queries.
+
+    Args:
+        embedding_function: Full-dimension embedding function
+
+    Returns:
+        Tuple of (HybridRetriever, the vector store's embedding function,
+        index version); the version is None when the store was built from markdown
+    """
+    from src.rag.embeddings.projection import ProjectedEmbeddingFunction, corpus_projection
+    from src.rag.retrieval import BM25Index, HybridRetriever
+    # Prefer the prebuilt snapshot; only re-embed the corpus when there is none
+    snapshot = load_snapshot(embedding_function)
+    if snapshot is not None:
+        ids, documents, metadatas = snapshot.ids, snapshot.documents, snapshot.metadatas
+        embeddings = snapshot.embeddings
+        existing = snapshot.load_projection()
+        index_version = snapshot.version
+    else:
+        documents, metadatas, ids = load_knowledge_base(KNOWLEDGE_BASE_PATH)
+        # Without a projection, the store embeds the documents itself
+        embeddings = embedding_function(documents) if EMBEDDING_PROJECTION_DIM else None
+        existing = None
+        index_version = None
+
+    projection = None
+    if embeddings is not None:
+        projection = corpus_projection(embeddings, EMBEDDING_PROJECTION_DIM, EMBEDDING_PROJECTION_WHITEN, existing)
+    if projection is not None:
+        embedding_function = ProjectedEmbeddingFunction(embedding_function, projection)
+        embeddings = projection.transform(embeddings)
+        if index_version is not None and projection is not existing:
+            index_version = f"{index_version}-pca{projection.output_dim}"
+
+    store = create_vector_store(embedding_function)
+    if embeddings is None:
+        store.add_documents(documents, metadatas, ids)
+    else:
+        store.add_embeddings(ids, embeddings, documents, metadatas)
+    if snapshot is not None:
+        print(f"Loaded index snapshot {snapshot.version} with {len(snapshot)} documents.")
+
+    # Exact terms such as "broom" or "Rays Rush" get a keyword match as well
+    lexical_index = BM25Index(ids, documents, metadatas, k1=BM25_K1, b=BM25_B) if HYBRID_RETRIEVAL_ENABLED else None
+    return HybridRetriever(store, lexical_index), embedding_function, index_version
+
+
+def create_vector_store(embedding_function: Any) -> Any:
+    """
+    Create the empty in-process vector store selected by VECTOR_STORE.
+
+    Args:
+        embedding_function: Embedding function of the store (possibly projected)
+
+    Returns:
+        NumpyVectorStore or QuantizedVectorStore
+    """
+    if VECTOR_STORE == "numpy":
+        from src.rag.storage.numpy_store import NumpyVectorStore
+
+        # The corpus is small enough for exact search in one matrix product; the
+        # store moves to a Chroma HNSW index by itself if it outgrows that
+        return NumpyVectorStore(COLLECTION_NAME, embedding_function)
+    if VECTOR_STORE == "int8":
+        from src.rag.storage.quantized import QuantizedVectorStore
+
+        # int8 codes in memory, full-precision vectors in a temporary file for rescoring
+        return QuantizedVectorStore(COLLECTION_NAME, embedding_function=embedding_function)
+    raise ValueError(f"Unknown VECTOR_STORE {VECTOR_STORE!r}; expected \"numpy\" or \"int8\"")
+
+
+def load_snapshot(embedding_function: Any) -> Optional[IndexSnapshot]:
+    """
+    Load the prebuilt index snapshot, if a valid one exists.
+
+    Args:
+        embedding_function: Full-dimension embedding function
+
+    Returns:
+        Optional[IndexSnapshot]: The snapshot, or None if there was none
+    """
+    from src.rag.embeddings.cache import uncached
+
+    # Embedding the probe text both fingerprints the model and warms it up
+    probe_embedding = uncached(embedding_function)([FINGERPRINT_PROBE_TEXT])[0]
+    return IndexSnapshot.load(
+        INDEX_SNAPSHOT_DIR,
+        model_name=EMBEDDING_MODEL_ID,
+        source_sha256=file_sha256(KNOWLEDGE_BASE_PATH),
+        probe_embedding=probe_embedding
+    )
+
+
+def create_llm():
+    """Create the chat model client used to answer questions."""
+    from langchain_anthropic import ChatAnthropic
+
+    return ChatAnthropic(
+        temperature=0.1,  # Low temperature for more focused answers
+        model="claude-3-5-sonnet-20240620"  # Using GPT-4 for better comprehension
+    )
+
 
 class RaysRAG:
     """
     RAG implementation for answering questions about Rays tickets and stadium information.
     """
     
-    def __init__(self):
-        """Initialize the RAG components."""
-        # Use in-memory ChromaDB client for Streamlit Cloud
-        self.client = chromadb.EphemeralClient()
-        
-        # Always use CPU for embeddings on Streamlit Cloud
-        self.embedding_function = embedding_functions.SentenceTransformerEmbeddingFunction(
-            model_name="BAAI/bge-large-en-v1.5",
-            device="cpu"
+    def __init__(self, registry: Optional[ResourceRegistry] = None):
+        """
+        Initialize the RAG components.
+
+        The embedding model, vector store, and LLM client come from `registry`,
+        so every RaysRAG in a process shares a single copy of each.
+
+        Args:
+            registry: Registry holding the shared resources; defaults to the
+                process-wide registry
+        """
+        from langchain_core.prompts import ChatPromptTemplate
+        from src.rag.embeddings.cache import uncached
+
+        registry = registry or shared_registry
+        # The index may use a projected version of the shared embedding function
+        self.retriever, self.embedding_function, self.index_version = registry.get(
+            "index",
+            lambda: open_index(registry.get("embedding_function", create_embedding_function))
         )
-        
-        try:
-            self.collection = self.client.get_collection(
-                name=COLLECTION_NAME,
-                embedding_function=self.embedding_function
+        # The on-disk embedding cache pays off for index builds; for queries its
+        # SQLite round trips cost more than they save, and repeats are caught
+        # by the in-memory query cache instead
+        self.query_embedding_function = uncached(self.embedding_function)
+        self.store = self.retriever.store
+        self.llm = registry.get("llm", create_llm)
+        # Answers are shared across sessions, like the model and index
+        self.answer_cache = registry.get("answer_cache", SemanticAnswerCache) if ANSWER_CACHE_ENABLED else None
+        if QUERY_CACHE_ENABLED:
+            # Normalized question -> query vector, then (vector, k, filters) -> retrieved chunks
+            self.query_embedding_cache = registry.get(
+                "query_embedding_cache",
+                lambda: LRUCache(QUERY_EMBEDDING_CACHE_SIZE, QUERY_CACHE_TTL_SECONDS)
             )
-        except chromadb.errors.NotFoundError:
-            self.collection = self.client.create_collection(
-                name=COLLECTION_NAME,
-                embedding_function=self.embedding_function
+            self.retrieval_cache = registry.get(
+                "retrieval_cache",
+                lambda: LRUCache(RETRIEVAL_CACHE_SIZE, QUERY_CACHE_TTL_SECONDS)
             )
-            # Parse markdown and populate collection
-            self._populate_collection_from_markdown()
-        
-        # Initialize LLM
-        self.llm = ChatAnthropic(
-            temperature=0.1,  # Low temperature for more focused answers
-            model="claude-3-5-sonnet-20240620"  # Using GPT-4 for better comprehension
+        else:
+            self.query_embedding_cache = self.retrieval_cache = None
+        self.metrics = registry.get("metrics", LatencyMetrics)
+        # Greetings, thanks, and questions about the bot get canned replies
+        self.intent_router = registry.get(
+            "intent_router",
+            # Centroids are only built when similarity routing is calibrated and on
+            lambda: IntentRouter(
+                embedding_function=self.query_embedding_function if INTENT_SIMILARITY_THRESHOLD else None
+            )
+        ) if INTENT_ROUTER_ENABLED else None
+        # With adaptive top-k, retrieve a larger pool and keep only the close matches
+        self.n_candidates = ADAPTIVE_K_MAX if ADAPTIVE_K_ENABLED else TOP_K
+        # Embedding and search are blocking, so the async API runs them here
+        self.executor = registry.get(
+            "executor",
+            lambda: ThreadPoolExecutor(max_workers=RETRIEVAL_WORKERS, thread_name_prefix="rays-rag")
         )
         
         # Create the RAG prompt
@@ -86,83 +405,319 @@ class RaysRAG:
         # Create the RAG chain
         self.setup_rag_chain()
     
-    def _populate_collection_from_markdown(self):
+    def warm_up(self) -> None:
+        """Run a dummy query so the embedding model and index are hot before the first real question."""
+        start = time.perf_counter()
+        query_embeddings = self.query_embedding_function([WARMUP_QUERY])
+        self.store.query(query_embeddings=query_embeddings, n_results=1)
+        print(f"Warmed up RAG in {time.perf_counter() - start:.2f}s")
+    
+    def embed_queries(self, questions: List[str]) -> List[Any]:
         """
-        Parse the markdown file and populate the ChromaDB collection with cleaned, chunked content.
+        Embed questions in one batch, reusing the vectors of identical earlier questions.
+
+        Args:
+            questions: Question texts
+
+        Returns:
+            List of query embeddings, in input order
         """
-        md_path = "crawl/content/rays_content_raw.md"
-        try:
-            with open(md_path, "r", encoding="utf-8") as f:
-                md_text = f.read()
-        except FileNotFoundError:
-            raise RuntimeError(f"Knowledge base markdown file not found at {md_path}")
-        if not md_text.strip():
-            raise RuntimeError(f"Knowledge base markdown file at {md_path} is empty.")
-
-        # Regex to extract sections: ## Section Name, **Source URL:**, then content until next ## or end
-        section_pattern = re.compile(
-            r"^##\s+(.*?)\s*\n+"
-            r"\*\*Source URL:\*\*\s*(.*?)\s*\n+"
-            r"(?:\*\*Crawled Length:\*\*.*?\n+)?"
-            r"### Content:\s*\n+"
-            r"([\s\S]*?)(?=^## |\Z)",
-            re.MULTILINE
-        )
-        matches = section_pattern.findall(md_text)
-        if not matches:
-            raise RuntimeError("No sections found in the markdown knowledge base.")
-
-        print(f"Found {len(matches)} sections in the markdown knowledge base.")
-
-        cleaner = ContentCleaner()
-        chunker = ContentChunker()
-        documents = []
-        metadatas = []
-        ids = []
-        for section_name, url, content in matches:
-            print(f"\n--- Section: {section_name} | URL: {url} ---")
-            print(f"Raw content (first 200 chars): {content[:200]}")
-            cleaned = cleaner.clean_content(content)
-            print(f"Cleaned content (first 200 chars): {cleaned[:200] if cleaned else 'None'}")
-            if not cleaned:
-                print("Content was empty after cleaning, skipping.")
+        if self.query_embedding_cache is None:
+            return list(self.query_embedding_function(questions))
+        keys = [normalize_query(question) for question in questions]
+        found: Dict[str, Any] = {}
+        missing: Dict[str, str] = {}
+        for key, question in zip(keys, questions):
+            if key in found or key in missing:
                 continue
-            chunks = chunker.process_content(cleaned, url)
-            print(f"Number of chunks: {len(chunks)}")
-            for i, chunk in enumerate(chunks):
-                documents.append(chunk["text"])
-                metadatas.append(chunk["metadata"])
-                ids.append(f"{url}_{i}")
-        if not documents:
-            raise RuntimeError("No documents were parsed from the markdown knowledge base.")
-        self.collection.add(
-            documents=documents,
-            metadatas=metadatas,
-            ids=ids
-        )
-    
+            query_embedding = self.query_embedding_cache.get(key, self.index_version)
+            if query_embedding is None:
+                missing[key] = question
+            else:
+                found[key] = query_embedding
+        if missing:
+            # One forward pass for every question not seen before
+            for key, query_embedding in zip(missing, self.query_embedding_function(list(missing.values()))):
+                self.query_embedding_cache.put(key, query_embedding, self.index_version)
+                found[key] = query_embedding
+        return [found[key] for key in keys]
+
+    def embed_query(self, question: str) -> Any:
+        """
+        Embed a question, reusing the vector of an identical earlier question.
+
+        Args:
+            question: Question text
+
+        Returns:
+            The query embedding
+        """
+        return self.embed_queries([question])[0]
+
+    def retrieve_many(
+        self,
+        questions: List[str],
+        query_embeddings: Optional[List[Any]] = None,
+        n_results: int = 4,
+        where: Optional[Dict] = None,
+        where_document: Optional[Dict] = None
+    ) -> List[Dict[str, List]]:
+        """
+        Retrieve the chunks for several questions with one multi-query search,
+        reusing results of identical earlier searches.
+
+        Args:
+            questions: Question texts
+            query_embeddings: Precomputed query embeddings; computed when omitted
+            n_results: Number of chunks to return per question
+            where: Optional filter conditions for metadata
+            where_document: Optional filter conditions for documents
+
+        Returns:
+            List of dicts with ids, documents, metadatas, and scores, in input order
+        """
+        if query_embeddings is None:
+            query_embeddings = self.embed_queries(questions)
+        if self.retrieval_cache is None:
+            return self.retriever.retrieve_many(
+                questions, n_results, where, where_document, query_embeddings=query_embeddings
+            )
+        # The keyword side of hybrid retrieval sees the text, so it is part of the key
+        keys = [
+            (normalize_query(question), retrieval_key(query_embedding, n_results, where, where_document))
+            for question, query_embedding in zip(questions, query_embeddings)
+        ]
+        found: Dict[Tuple[str, str], Dict[str, List]] = {}
+        missing: Dict[Tuple[str, str], int] = {}
+        for i, key in enumerate(keys):
+            if key in found or key in missing:
+                continue
+            results = self.retrieval_cache.get(key, self.index_version)
+            if results is None:
+                missing[key] = i
+            else:
+                found[key] = results
+        if missing:
+            searched = self.retriever.retrieve_many(
+                [questions[i] for i in missing.values()],
+                n_results,
+                where,
+                where_document,
+                query_embeddings=[query_embeddings[i] for i in missing.values()]
+            )
+            for key, results in zip(missing, searched):
+                self.retrieval_cache.put(key, results, self.index_version)
+                found[key] = results
+        return [found[key] for key in keys]
+
+    def retrieve(
+        self,
+        question: str,
+        query_embedding: Optional[Any] = None,
+        n_results: int = 4,
+        where: Optional[Dict] = None,
+        where_document: Optional[Dict] = None
+    ) -> Dict[str, List]:
+        """
+        Retrieve the chunks for a question, reusing results of an identical earlier search.
+
+        Args:
+            question: Question text
+            query_embedding: Precomputed query embedding; computed when omitted
+            n_results: Number of chunks to return
+            where: Optional filter conditions for metadata
+            where_document: Optional filter conditions for documents
+
+        Returns:
+            Dict with ids, documents, metadatas, and scores, best first
+        """
+        query_embeddings = None if query_embedding is None else [query_embedding]
+        return self.retrieve_many([question], query_embeddings, n_results, where, where_document)[0]
+
+    def build_context(self, results: Dict[str, List]) -> str:
+        """
+        Turn retrieval results into prompt context, keeping only the chunks
+        close enough to the best match when adaptive top-k is on.
+
+        Args:
+            results: Retrieval results with documents, metadatas, and distances
+
+        Returns:
+            str: Context text for the prompt
+        """
+        k = len(results['ids'])
+        if ADAPTIVE_K_ENABLED:
+            k = adaptive_k(results['distances'])
+            logger.info("Adaptive top-k kept %d of %d retrieved chunks", k, len(results['ids']))
+        return assemble_context(results['documents'][:k], results['metadatas'][:k])
+
     def setup_rag_chain(self):
         """Set up the RAG retrieval and generation chain."""
+        from operator import itemgetter
+
+        from langchain_core.output_parsers import StrOutputParser
+
         # Define the retrieval function
-        def retrieve_docs(query: str) -> List[str]:
-            results = self.collection.query(
-                query_texts=[query],
-                n_results=4,  # Retrieve top 4 most relevant chunks
-                include=['documents', 'metadatas', 'distances']
-            )
-            return results['documents'][0]  # Return list of document texts
+        def retrieve_docs(inputs: Dict[str, Any]) -> str:
+            # Dense and keyword results fused, most relevant chunks first
+            results = self.retrieve(inputs["question"], inputs.get("query_embedding"), n_results=self.n_candidates)
+            return self.build_context(results)
         
-        # Create the RAG chain
+        # Generation alone, for callers that retrieve separately; input is {"context": ..., "question": ...}
+        self.generation_chain = self.prompt | self.llm | StrOutputParser()
+        # Create the RAG chain; input is {"question": ..., "query_embedding": ...}
         self.chain = (
-            {"context": retrieve_docs, "question": RunnablePassthrough()}
-            | self.prompt
-            | self.llm
-            | StrOutputParser()
+            {"context": retrieve_docs, "question": itemgetter("question")}
+            | self.generation_chain
         )
     
+    def _cached_answer(self, query_embedding: Any) -> Optional[str]:
+        if self.answer_cache is None:
+            return None
+        return self.answer_cache.lookup(query_embedding, self.index_version)
+
+    def _intent(self, question: str, query_embedding: Optional[Any] = None) -> Optional[str]:
+        """Small-talk intent of a question, or None if it should go through retrieval."""
+        if self.intent_router is None:
+            return None
+        intent = self.intent_router.route(question, query_embedding)
+        if intent is not None:
+            logger.info("Routed question to the %s intent; skipping retrieval and the LLM", intent)
+        return intent
+
+    def _fallback(self, question: str, results: Dict[str, List]) -> Optional[str]:
+        """Templated reply when nothing retrieved is close enough to answer from, else None."""
+        if not FALLBACK_ENABLED or not is_low_confidence(
+            results['distances'], FALLBACK_DISTANCE_THRESHOLD, results.get('lexical_coverage')
+        ):
+            return None
+        logger.info(
+            "No chunk within distance %.2f and no strong keyword match; answering without the LLM",
+            FALLBACK_DISTANCE_THRESHOLD
+        )
+        return fallback_answer(question, results)
+
+    def _record_piece(self, pieces: List[str], piece: str, start: float) -> None:
+        if not pieces:
+            self.metrics.record("time_to_first_token", time.perf_counter() - start)
+        pieces.append(piece)
+
+    def _error_message(self, error: Exception, pieces: List[str]) -> str:
+        """Apology to yield after a failure; set apart from any text already streamed."""
+        logger.error("Answering failed after %d streamed pieces", len(pieces), exc_info=error)
+        if not pieces:
+            return f"Sorry, I encountered an error while processing your question: {str(error)}"
+        # The partial answer has already been shown, so the apology must not
+        # read as its continuation
+        return f"{STREAM_ERROR_SEPARATOR}Sorry, the answer above was cut off by an error. Please ask again."
+
+    def _finish_answer(self, question: str, query_embedding: Any, pieces: List[str], start: float) -> None:
+        self.metrics.record("answer", time.perf_counter() - start)
+        # Only complete answers are cached; an abandoned stream never reaches here
+        if self.answer_cache is not None:
+            self.answer_cache.store(query_embedding, question, "".join(pieces), self.index_version)
+
+    def stream(self, question: str) -> Iterator[str]:
+        """
+        Answer a question, yielding the text as the LLM generates it.
+
+        Time to first token and total answer time are recorded in `metrics`.
+
+        Args:
+            question (str): The question about Rays tickets or stadium information
+
+        Yields:
+            str: Successive pieces of the answer
+        """
+        start = time.perf_counter()
+        pieces: List[str] = []
+        try:
+            # Small talk matched by phrase skips even the embedding
+            intent = self._intent(question)
+            if intent is None:
+                # Embed once: the same vector serves routing, the answer cache, and retrieval
+                query_embedding = self.embed_query(question)
+                intent = self._intent(question, query_embedding)
+            reply = self.intent_router.reply(intent, question) if intent is not None else self._cached_answer(query_embedding)
+            if reply is not None:
+                self._record_piece(pieces, reply, start)
+                yield reply
+                self.metrics.record("answer", time.perf_counter() - start)
+                return
+
+            results = self.retrieve(question, query_embedding, n_results=self.n_candidates)
+            fallback = self._fallback(question, results)
+            if fallback is not None:
+                self._record_piece(pieces, fallback, start)
+                yield fallback
+                self.metrics.record("answer", time.perf_counter() - start)
+                return
+
+            context = self.build_context(results)
+            for piece in self.generation_chain.stream({"context": context, "question": question}):
+                if piece:
+                    self._record_piece(pieces, piece, start)
+                    yield piece
+            self._finish_answer(question, query_embedding, pieces, start)
+        except Exception as e:
+            yield self._error_message(e, pieces)
+
+    async def astream(self, question: str) -> AsyncIterator[str]:
+        """
+        Asynchronously answer a question, yielding the text as the LLM generates it.
+
+        Embedding and search run in the shared thread pool and the LLM is
+        awaited with its async client, so many questions can be in flight
+        without a blocked thread each.
+
+        Args:
+            question (str): The question about Rays tickets or stadium information
+
+        Yields:
+            str: Successive pieces of the answer
+        """
+        start = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        pieces: List[str] = []
+        try:
+            intent = self._intent(question)
+            if intent is None:
+                query_embedding = await loop.run_in_executor(self.executor, self.embed_query, question)
+                intent = self._intent(question, query_embedding)
+            reply = self.intent_router.reply(intent, question) if intent is not None else self._cached_answer(query_embedding)
+            if reply is not None:
+                self._record_piece(pieces, reply, start)
+                yield reply
+                self.metrics.record("answer", time.perf_counter() - start)
+                return
+
+            results = await loop.run_in_executor(
+                self.executor,
+                functools.partial(self.retrieve, question, query_embedding, n_results=self.n_candidates)
+            )
+            fallback = self._fallback(question, results)
+            if fallback is not None:
+                self._record_piece(pieces, fallback, start)
+                yield fallback
+                self.metrics.record("answer", time.perf_counter() - start)
+                return
+
+            context = self.build_context(results)
+            async for piece in self.generation_chain.astream({"context": context, "question": question}):
+                if piece:
+                    self._record_piece(pieces, piece, start)
+                    yield piece
+            self._finish_answer(question, query_embedding, pieces, start)
+        except Exception as e:
+            yield self._error_message(e, pieces)
+
     def ask(self, question: str) -> str:
         """
         Ask a question and get a response using the RAG system.
+
+        Small talk gets a canned reply, and questions that nothing in the
+        index is close to get a templated fallback with links to the closest
+        pages, both without an LLM call.
         
         Args:
             question (str): The question about Rays tickets or stadium information
@@ -170,14 +725,137 @@ class RaysRAG:
         Returns:
             str: The generated answer based on the retrieved context
         """
+        return "".join(self.stream(question))
+
+    async def aask(self, question: str) -> str:
+        """
+        Asynchronously ask a question and get a response using the RAG system.
+
+        Args:
+            question (str): The question about Rays tickets or stadium information
+
+        Returns:
+            str: The generated answer based on the retrieved context
+        """
+        return "".join([piece async for piece in self.astream(question)])
+
+    def ask_many(self, questions: List[str], max_concurrency: int = ANSWER_CONCURRENCY) -> List[str]:
+        """
+        Answer a batch of questions.
+
+        All questions are embedded in one forward pass and searched with one
+        multi-query search; LLM calls then run concurrently. A failing
+        question gets an error message without affecting the rest.
+
+        Args:
+            questions: Questions about Rays tickets or stadium information
+            max_concurrency: Maximum number of LLM calls in flight at once
+
+        Returns:
+            List[str]: One answer per question, in input order
+        """
+        answers: List[Optional[str]] = [None] * len(questions)
+        query_embeddings: List[Any] = [None] * len(questions)
+        # Small talk matched by phrase is answered before anything is embedded
+        to_embed = []
+        for i, question in enumerate(questions):
+            intent = self._intent(question)
+            if intent is None:
+                to_embed.append(i)
+            else:
+                answers[i] = self.intent_router.reply(intent, question)
         try:
-            response = self.chain.invoke(question)
-            return response
+            if to_embed:
+                for i, query_embedding in zip(to_embed, self.embed_queries([questions[i] for i in to_embed])):
+                    query_embeddings[i] = query_embedding
         except Exception as e:
-            return f"Sorry, I encountered an error while processing your question: {str(e)}"
+            error = f"Sorry, I encountered an error while processing your question: {str(e)}"
+            return [error if answer is None else answer for answer in answers]
+
+        for i in to_embed:
+            intent = self._intent(questions[i], query_embeddings[i])
+            answers[i] = self.intent_router.reply(intent, questions[i]) if intent is not None else self._cached_answer(query_embeddings[i])
+        # Each distinct uncached question is retrieved and generated once
+        pending: Dict[str, List[int]] = {}
+        for i, question in enumerate(questions):
+            if answers[i] is None:
+                pending.setdefault(normalize_query(question), []).append(i)
+        first = [positions[0] for positions in pending.values()]
+        if not first:
+            return answers
+
+        try:
+            retrieved = self.retrieve_many(
+                [questions[i] for i in first],
+                [query_embeddings[i] for i in first],
+                n_results=self.n_candidates
+            )
+        except Exception as e:
+            error = f"Sorry, I encountered an error while processing your question: {str(e)}"
+            return [error if answer is None else answer for answer in answers]
+
+        # Questions nothing in the index is close to get the fallback without an LLM call
+        generate = []
+        for positions, results in zip(pending.values(), retrieved):
+            fallback = self._fallback(questions[positions[0]], results)
+            if fallback is None:
+                generate.append((positions, results))
+            else:
+                for position in positions:
+                    answers[position] = fallback
+
+        generated = self.generation_chain.batch(
+            [
+                {"context": self.build_context(results), "question": questions[positions[0]]}
+                for positions, results in generate
+            ],
+            config={"max_concurrency": max_concurrency},
+            return_exceptions=True
+        )
+        for (positions, _), response in zip(generate, generated):
+            i = positions[0]
+            if isinstance(response, Exception):
+                response = f"Sorry, I encountered an error while processing your question: {str(response)}"
+            elif self.answer_cache is not None:
+                self.answer_cache.store(query_embeddings[i], questions[i], response, self.index_version)
+            for position in positions:
+                answers[position] = response
+        return answers
+
+def get_shared_rag() -> RaysRAG:
+    """
+    Get the process-wide RaysRAG, building and warming it up on first use.
+
+    Safe to call from many threads (e.g. Streamlit script runs); only the
+    first caller pays the startup cost.
+
+    Returns:
+        RaysRAG: The shared instance
+    """
+    def build() -> RaysRAG:
+        rag = RaysRAG(shared_registry)
+        rag.warm_up()
+        return rag
+
+    return shared_registry.get("rays_rag", build)
+
 
 def main():
-    """Main function to test the RAG implementation."""
+    """Main function to build the index or test the RAG implementation."""
+    parser = argparse.ArgumentParser(description="Rays RAG system")
+    parser.add_argument(
+        "--build-index",
+        action="store_true",
+        help=f"Embed the knowledge base and write the index snapshot to {INDEX_SNAPSHOT_DIR}/"
+    )
+    args = parser.parse_args()
+    # Show why questions were routed, fell back, or got fewer chunks
+    configure_logging()
+
+    if args.build_index:
+        build_index()
+        return
+
     # Initialize the RAG system
     rag = RaysRAG()
     
@@ -6,14 +6,28 @@ Provides functionality for crawling the Rays website, processing content,
 and creating a searchable knowledge base.
 """
 
+from typing import TYPE_CHECKING
+
+from src.rag.utils.lazy import lazy_exports
+
 __version__ = "0.1.0"
 
-# Import main components that should be available when importing the package
-from src.rag.crawl.crawler import RaysCrawler
-from src.rag.processing.cleaner import ContentCleaner
-from src.rag.processing.chunker import ContentChunker
-from src.rag.storage.vectorstore import RaysVectorStore
-from src.rag.utils.markdown_utils import MarkdownGenerator
+# Main components are imported on first use, so importing one submodule
+# does not load crawl4ai, chromadb, or torch through the others
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'RaysCrawler': 'src.rag.crawl.crawler',
+    'ContentCleaner': 'src.rag.processing.cleaner',
+    'ContentChunker': 'src.rag.processing.chunker',
+    'RaysVectorStore': 'src.rag.storage.vectorstore',
+    'MarkdownGenerator': 'src.rag.utils.markdown_utils',
+})
+
+if TYPE_CHECKING:
+    from src.rag.crawl.crawler import RaysCrawler
+    from src.rag.processing.cleaner import ContentCleaner
+    from src.rag.processing.chunker import ContentChunker
+    from src.rag.storage.vectorstore import RaysVectorStore
+    from src.rag.utils.markdown_utils import MarkdownGenerator
 
 # Define what gets imported with "from robo_ragmond import *"
 __all__ = [
@@ -22,4 +36,4 @@ __all__ = [
     'ContentChunker',
     'RaysVectorStore',
     'MarkdownGenerator',
-] 
\ No newline at end of file
+]
@@ -10,16 +10,92 @@ from .settings import (
     CONTENT_DIR,
     CHROMA_DB_DIR,
     RAW_CONTENT_FILE,
+    ensure_directories,
     
     # ChromaDB settings
     COLLECTION_NAME,
     EMBEDDING_MODEL_NAME,
     COLLECTION_METADATA,
+    EMBEDDING_BATCH_SIZE,
+    EMBEDDING_MODEL_REVISION,
+    EMBEDDING_BACKEND,
+    ONNX_MODEL_DIR,
+    
+    # Vector search settings
+    VECTOR_STORE,
+    EXACT_SEARCH_MAX_DOCUMENTS,
+    
+    # Hybrid retrieval settings
+    HYBRID_RETRIEVAL_ENABLED,
+    DENSE_CANDIDATES,
+    LEXICAL_CANDIDATES,
+    DENSE_WEIGHT,
+    LEXICAL_WEIGHT,
+    RRF_K,
+    BM25_K1,
+    BM25_B,
+    
+    # Adaptive top-k settings
+    ADAPTIVE_K_ENABLED,
+    ADAPTIVE_K_MIN,
+    ADAPTIVE_K_MAX,
+    ADAPTIVE_K_RELATIVE_MARGIN,
+    ADAPTIVE_K_ABSOLUTE_MARGIN,
+    
+    # Intent routing settings
+    INTENT_ROUTER_ENABLED,
+    INTENT_SIMILARITY_THRESHOLD,
+    INTENT_MAX_WORDS,
+    
+    # Low-confidence fallback settings
+    FALLBACK_ENABLED,
+    FALLBACK_DISTANCE_THRESHOLD,
+    FALLBACK_LEXICAL_COVERAGE,
+    FALLBACK_LINKS,
+    
+    # Context assembly settings
+    CONTEXT_TOKEN_BUDGET,
+    CONTEXT_DUPLICATE_THRESHOLD,
+    CONTEXT_CHARS_PER_TOKEN,
+    
+    # Answer cache settings
+    ANSWER_CACHE_ENABLED,
+    ANSWER_CACHE_SIMILARITY,
+    ANSWER_CACHE_MAX_ENTRIES,
+    ANSWER_CACHE_TTL_SECONDS,
+    
+    # Query cache settings
+    QUERY_CACHE_ENABLED,
+    QUERY_EMBEDDING_CACHE_SIZE,
+    RETRIEVAL_CACHE_SIZE,
+    QUERY_CACHE_TTL_SECONDS,
+    
+    # Serving settings
+    LATENCY_METRICS_WINDOW,
+    RETRIEVAL_WORKERS,
+    ANSWER_CONCURRENCY,
+    LOG_LEVEL,
+    
+    # Embedding cache settings
+    EMBEDDING_CACHE_ENABLED,
+    EMBEDDING_CACHE_PATH,
+    EMBEDDING_CACHE_MAX_BYTES,
+    EMBEDDING_CACHE_DTYPE,
+    
+    # Embedding projection settings
+    EMBEDDING_PROJECTION_DIM,
+    EMBEDDING_PROJECTION_WHITEN,
     
     # Content processing settings
     MAX_CHUNK_SIZE,
     MIN_CHUNK_SIZE,
     CHUNK_OVERLAP,
+    CHUNKING_MODE,
+    CHUNK_MAX_TOKENS,
+    CHUNK_OVERLAP_TOKENS,
+    PREPROCESS_WORKERS,
+    PREPROCESS_BATCH_WORKERS,
+    PREPROCESS_CHUNKSIZE,
     
     # Crawler settings
     URLS_TO_CRAWL,
@@ -39,16 +115,92 @@ __all__ = [
     'CONTENT_DIR',
     'CHROMA_DB_DIR',
     'RAW_CONTENT_FILE',
+    'ensure_directories',
     
     # ChromaDB settings
     'COLLECTION_NAME',
     'EMBEDDING_MODEL_NAME',
     'COLLECTION_METADATA',
+    'EMBEDDING_BATCH_SIZE',
+    'EMBEDDING_MODEL_REVISION',
+    'EMBEDDING_BACKEND',
+    'ONNX_MODEL_DIR',
+    
+    # Vector search settings
+    'VECTOR_STORE',
+    'EXACT_SEARCH_MAX_DOCUMENTS',
+    
+    # Hybrid retrieval settings
+    'HYBRID_RETRIEVAL_ENABLED',
+    'DENSE_CANDIDATES',
+    'LEXICAL_CANDIDATES',
+    'DENSE_WEIGHT',
+    'LEXICAL_WEIGHT',
+    'RRF_K',
+    'BM25_K1',
+    'BM25_B',
+    
+    # Adaptive top-k settings
+    'ADAPTIVE_K_ENABLED',
+    'ADAPTIVE_K_MIN',
+    'ADAPTIVE_K_MAX',
+    'ADAPTIVE_K_RELATIVE_MARGIN',
+    'ADAPTIVE_K_ABSOLUTE_MARGIN',
+    
+    # Intent routing settings
+    'INTENT_ROUTER_ENABLED',
+    'INTENT_SIMILARITY_THRESHOLD',
+    'INTENT_MAX_WORDS',
+    
+    # Low-confidence fallback settings
+    'FALLBACK_ENABLED',
+    'FALLBACK_DISTANCE_THRESHOLD',
+    'FALLBACK_LEXICAL_COVERAGE',
+    'FALLBACK_LINKS',
+    
+    # Context assembly settings
+    'CONTEXT_TOKEN_BUDGET',
+    'CONTEXT_DUPLICATE_THRESHOLD',
+    'CONTEXT_CHARS_PER_TOKEN',
+    
+    # Answer cache settings
+    'ANSWER_CACHE_ENABLED',
+    'ANSWER_CACHE_SIMILARITY',
+    'ANSWER_CACHE_MAX_ENTRIES',
+    'ANSWER_CACHE_TTL_SECONDS',
+    
+    # Query cache settings
+    'QUERY_CACHE_ENABLED',
+    'QUERY_EMBEDDING_CACHE_SIZE',
+    'RETRIEVAL_CACHE_SIZE',
+    'QUERY_CACHE_TTL_SECONDS',
+    
+    # Serving settings
+    'LATENCY_METRICS_WINDOW',
+    'RETRIEVAL_WORKERS',
+    'ANSWER_CONCURRENCY',
+    'LOG_LEVEL',
+    
+    # Embedding cache settings
+    'EMBEDDING_CACHE_ENABLED',
+    'EMBEDDING_CACHE_PATH',
+    'EMBEDDING_CACHE_MAX_BYTES',
+    'EMBEDDING_CACHE_DTYPE',
+    
+    # Embedding projection settings
+    'EMBEDDING_PROJECTION_DIM',
+    'EMBEDDING_PROJECTION_WHITEN',
     
     # Content processing settings
     'MAX_CHUNK_SIZE',
     'MIN_CHUNK_SIZE',
     'CHUNK_OVERLAP',
+    'CHUNKING_MODE',
+    'CHUNK_MAX_TOKENS',
+    'CHUNK_OVERLAP_TOKENS',
+    'PREPROCESS_WORKERS',
+    'PREPROCESS_BATCH_WORKERS',
+    'PREPROCESS_CHUNKSIZE',
     
     # Crawler settings
     'URLS_TO_CRAWL',
@@ -16,10 +16,12 @@ DATA_DIR = ROOT_DIR / "data"
 CONTENT_DIR = ROOT_DIR / "content"
 CHROMA_DB_DIR = ROOT_DIR / "chroma_db"
 
-# Ensure directories exist
-DATA_DIR.mkdir(exist_ok=True)
-CONTENT_DIR.mkdir(exist_ok=True)
-CHROMA_DB_DIR.mkdir(exist_ok=True)
+
+def ensure_directories() -> None:
+    """Create the data, content, and ChromaDB directories if they do not exist."""
+    for directory in (DATA_DIR, CONTENT_DIR, CHROMA_DB_DIR):
+        directory.mkdir(parents=True, exist_ok=True)
+
 
 # File Paths
 RAW_CONTENT_FILE = CONTENT_DIR / "rays_content_raw.md"
@@ -28,11 +30,86 @@ RAW_CONTENT_FILE = CONTENT_DIR / "rays_content_raw.md"
 COLLECTION_NAME = "rays_website_content"
 EMBEDDING_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
 COLLECTION_METADATA = {"hnsw:space": "cosine"}
+EMBEDDING_BATCH_SIZE = 32  # Documents per embedding forward pass
+EMBEDDING_MODEL_REVISION = os.getenv("RAYS_RAG_EMBEDDING_REVISION", "")  # Hub commit or tag to load; "" = latest, cached under its resolved commit hash
+EMBEDDING_BACKEND = os.getenv("RAYS_RAG_EMBEDDING_BACKEND", "torch")  # "torch", "onnx", or "onnx-int8"
+ONNX_MODEL_DIR = ROOT_DIR / "models" / "onnx"  # Exports from `python -m src.rag.embeddings.onnx_backend export`
+
+# Vector Search Settings
+VECTOR_STORE = "numpy"  # In-process store for serving: "numpy" (exact float32) or "int8" (quantized codes, float32 rescoring)
+EXACT_SEARCH_MAX_DOCUMENTS = 5000  # NumpyVectorStore moves to Chroma HNSW above this many documents; 0 = never
+
+# Hybrid Retrieval Settings
+HYBRID_RETRIEVAL_ENABLED = True  # Fuse BM25 keyword results with dense results
+DENSE_CANDIDATES = 20    # Dense results considered before fusion
+LEXICAL_CANDIDATES = 20  # BM25 results considered before fusion
+DENSE_WEIGHT = 1.0       # Weight of the dense ranking in reciprocal rank fusion
+LEXICAL_WEIGHT = 1.0     # Weight of the BM25 ranking in reciprocal rank fusion
+RRF_K = 60               # Reciprocal rank fusion damping constant
+BM25_K1 = 1.2            # BM25 term-frequency saturation
+BM25_B = 0.75            # BM25 document-length normalization
+
+# Adaptive Top-k Settings
+ADAPTIVE_K_ENABLED = True
+ADAPTIVE_K_MIN = 1                  # Chunks always sent to the LLM
+ADAPTIVE_K_MAX = 6                  # Candidate pool size and most chunks sent to the LLM
+ADAPTIVE_K_RELATIVE_MARGIN = 0.25   # Keep chunks within this fraction of the best cosine distance...
+ADAPTIVE_K_ABSOLUTE_MARGIN = 0.05   # ...or within this much of it, whichever is larger
+
+# Intent Routing Settings
+INTENT_ROUTER_ENABLED = True
+INTENT_SIMILARITY_THRESHOLD = 0.0   # Minimum cosine similarity to an intent centroid to give its canned reply; 0 = exact phrases only. Calibrate with benchmarks/calibrate_intents.py before enabling
+INTENT_MAX_WORDS = 6                # Longer messages are only routed on an exact phrase match
+
+# Low-Confidence Fallback Settings
+FALLBACK_ENABLED = False            # Off until FALLBACK_DISTANCE_THRESHOLD is calibrated on the serving index
+FALLBACK_DISTANCE_THRESHOLD = 0.40  # Best-match cosine distance above which the LLM is skipped; uncalibrated placeholder, run benchmarks/calibrate_fallback.py before enabling
+FALLBACK_LEXICAL_COVERAGE = 0.75    # A keyword match holding this share of the question's IDF weight is always answered
+FALLBACK_LINKS = 3                  # Closest pages linked in the fallback reply
+
+# Context Assembly Settings
+CONTEXT_TOKEN_BUDGET = 1500         # Maximum tokens of retrieved context in the prompt; 0 = unlimited
+CONTEXT_DUPLICATE_THRESHOLD = 0.8   # Share of repeated word 3-grams at which a chunk is dropped as a near-duplicate
+CONTEXT_CHARS_PER_TOKEN = 4         # Characters per LLM token assumed when estimating context size
+
+# Answer Cache Settings
+ANSWER_CACHE_ENABLED = True
+ANSWER_CACHE_SIMILARITY = 0.95      # Minimum question cosine similarity to reuse a cached answer
+ANSWER_CACHE_MAX_ENTRIES = 1000     # Least recently used answers are evicted beyond this
+ANSWER_CACHE_TTL_SECONDS = 24 * 3600  # Cached answers expire after this long; 0 = never
+
+# Query Cache Settings
+QUERY_CACHE_ENABLED = True
+QUERY_EMBEDDING_CACHE_SIZE = 1024   # Normalized questions whose query vectors are kept in memory
+RETRIEVAL_CACHE_SIZE = 1024         # Retrieval results kept in memory
+QUERY_CACHE_TTL_SECONDS = 3600      # Cached vectors and results expire after this long; 0 = never
+
+# Serving Settings
+LATENCY_METRICS_WINDOW = 1000       # Most recent latency samples kept per metric
+RETRIEVAL_WORKERS = 4               # Threads that embed and search for the async API
+ANSWER_CONCURRENCY = 8              # LLM calls in flight at once when answering a batch of questions
+LOG_LEVEL = os.getenv("RAYS_RAG_LOG_LEVEL", "INFO")  # Level of the routing, fallback, and top-k logs shown by the app and CLI
+
+# Embedding Cache Settings
+EMBEDDING_CACHE_ENABLED = True
+EMBEDDING_CACHE_PATH = DATA_DIR / "embedding_cache.sqlite3"
+EMBEDDING_CACHE_MAX_BYTES = 512 * 1024 * 1024  # Least recently used vectors are evicted beyond this
+EMBEDDING_CACHE_DTYPE = "float32"  # "float16" halves the size at a small precision cost
+
+# Embedding Projection Settings
+EMBEDDING_PROJECTION_DIM = 0          # PCA-reduce index vectors to this many dims (e.g. 256); 0 = full dimension
+EMBEDDING_PROJECTION_WHITEN = False   # Scale each kept axis to unit variance
 
 # Content Processing Settings
 MAX_CHUNK_SIZE = 512  # Maximum size for text chunks
 MIN_CHUNK_SIZE = 100  # Minimum size to avoid tiny chunks
 CHUNK_OVERLAP = 50    # Overlap between chunks
+CHUNKING_MODE = "characters"  # "characters" or "tokens" (sized by the embedding model's tokenizer)
+CHUNK_MAX_TOKENS = 0          # Model sequence limit for "tokens" mode; 0 = read it from the tokenizer
+CHUNK_OVERLAP_TOKENS = 32     # Overlap between chunks in "tokens" mode
+PREPROCESS_WORKERS = 1        # Processes for the clean+chunk stage when serving; 1 = serial, 0 = one per CPU core
+PREPROCESS_BATCH_WORKERS = 0  # Processes for batch ingest (--build-index, the crawl pipeline); 0 = one per CPU core
+PREPROCESS_CHUNKSIZE = 4   # Page sections sent to a worker per work unit
 
 # Crawler Settings
 URLS_TO_CRAWL = [
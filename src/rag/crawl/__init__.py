@@ -3,7 +3,18 @@ Crawling package for the RAG system.
 Provides functionality to crawl and extract content from websites.
 """
 
-from .crawler import RaysCrawler, get_rays_content_map
+from typing import TYPE_CHECKING
+
+from src.rag.utils.lazy import lazy_exports
+
+# crawl4ai is only imported once a crawler is actually used
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'RaysCrawler': '.crawler',
+    'get_rays_content_map': '.crawler',
+})
+
+if TYPE_CHECKING:
+    from .crawler import RaysCrawler, get_rays_content_map
 
 __all__ = [
     'RaysCrawler',
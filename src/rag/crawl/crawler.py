@@ -8,35 +8,13 @@ Saves the combined raw markdown content to the file specified in settings.py.
 import asyncio
 from typing import Optional, Dict, List
 from datetime import datetime
-from pathlib import Path
 
 from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig, CacheMode
 from crawl4ai.content_filter_strategy import PruningContentFilter
 from crawl4ai.markdown_generation_strategy import DefaultMarkdownGenerator
 
+from ..config.settings import URLS_TO_CRAWL, RAW_CONTENT_FILE
 
-# --- Import settings from settings.py (using relative import) ---
-try:
-    # These variables MUST be defined in settings.py
-    from .settings import URLS_TO_CRAWL, RAW_CONTENT_FILE # Note the leading dot
-    print("--- Successfully imported variables from .settings in crawler.py ---") # Optional: Confirmation
-except ImportError:
-    print("!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!")
-    print("!!! CRITICAL ERROR: Could not relatively import URLS_TO_CRAWL or RAW_CONTENT_FILE !!!")
-    print("!!! from .settings. Please ensure settings.py exists in the same directory    !!!")
-    print("!!! as crawler.py and defines these variables correctly.                      !!!")
-    print("!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!")
-    # Define empty fallbacks
-    URLS_TO_CRAWL = []
-    RAW_CONTENT_FILE = Path("error_settings_not_found.md")
-
-# print("--- Attempting to import from settings.py directly in crawler.py ---") # Remove this line
-
-# These prints will now use the correctly imported values or the fallbacks
-print(f"--- Crawler initialized. Will crawl {len(URLS_TO_CRAWL)} URLs. ---")
-print(f"--- Output will be written to: {RAW_CONTENT_FILE} ---")
-
-# ... rest of crawler.py ...
 class RaysCrawler:
     """Crawler class for Tampa Bay Rays website content."""
 
@@ -0,0 +1,42 @@
+"""
+Embeddings package for the RAG system.
+Provides embedding backends and wrappers such as the persistent embedding cache
+and the dimension-reducing PCA projection.
+"""
+
+from typing import TYPE_CHECKING
+
+from src.rag.utils.lazy import lazy_exports
+
+# chromadb and the inference runtimes are only imported once actually used
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'EmbeddingCache': '.cache',
+    'CachedEmbeddingFunction': '.cache',
+    'cached_embedding_function': '.cache',
+    'uncached': '.cache',
+    'create_embedding_backend': '.backends',
+    'embedding_model_id': '.backends',
+    'OnnxEmbeddingFunction': '.onnx_backend',
+    'PCAProjection': '.projection',
+    'ProjectedEmbeddingFunction': '.projection',
+    'corpus_projection': '.projection',
+})
+
+if TYPE_CHECKING:
+    from .cache import EmbeddingCache, CachedEmbeddingFunction, cached_embedding_function, uncached
+    from .backends import create_embedding_backend, embedding_model_id
+    from .onnx_backend import OnnxEmbeddingFunction
+    from .projection import PCAProjection, ProjectedEmbeddingFunction, corpus_projection
+
+__all__ = [
+    'EmbeddingCache',
+    'CachedEmbeddingFunction',
+    'cached_embedding_function',
+    'uncached',
+    'create_embedding_backend',
+    'embedding_model_id',
+    'OnnxEmbeddingFunction',
+    'PCAProjection',
+    'ProjectedEmbeddingFunction',
+    'corpus_projection',
+]
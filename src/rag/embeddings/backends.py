@@ -0,0 +1,114 @@
+"""
+Embedding backend module for the RAG system.
+Creates embedding functions for a model on the configured inference backend:
+PyTorch sentence-transformers, or an exported ONNX graph (fp32 or int8).
+"""
+
+from pathlib import Path
+from typing import Any, Optional
+
+from src.rag.config.settings import EMBEDDING_BACKEND, EMBEDDING_MODEL_REVISION, ONNX_MODEL_DIR
+
+EMBEDDING_BACKENDS = ("torch", "onnx", "onnx-int8")
+
+
+def onnx_model_dir(model_name: str) -> Path:
+    """
+    Get the directory an ONNX export of a model is written to and read from.
+
+    Args:
+        model_name: Hugging Face / sentence-transformers model name
+
+    Returns:
+        Path: Export directory under ONNX_MODEL_DIR
+    """
+    return Path(ONNX_MODEL_DIR) / model_name.replace("/", "__")
+
+
+def embedding_model_id(model_name: str, backend: Optional[str] = None) -> str:
+    """
+    Identify the vectors a model produces on a backend.
+
+    Quantized or re-exported graphs produce slightly different vectors, so
+    caches and index snapshots key on this instead of the bare model name.
+
+    Args:
+        model_name: Hugging Face / sentence-transformers model name
+        backend: Backend name; defaults to EMBEDDING_BACKEND
+
+    Returns:
+        str: `model_name` for the PyTorch backend, otherwise `model_name@backend`
+    """
+    backend = backend or EMBEDDING_BACKEND
+    return model_name if backend == "torch" else f"{model_name}@{backend}"
+
+
+def model_revision(embedding_function: Any) -> str:
+    """
+    Identify the exact model weights behind an embedding function.
+
+    Args:
+        embedding_function: Embedding function created by `create_embedding_backend`
+
+    Returns:
+        str: The Hub commit hash the model was loaded (or exported) from when
+        known, else EMBEDDING_MODEL_REVISION, else "unknown"
+    """
+    # ONNX exports record the commit they were exported from
+    export_config = getattr(embedding_function, "config", None)
+    if isinstance(export_config, dict) and export_config.get("revision"):
+        return str(export_config["revision"])
+    # sentence-transformers models keep the transformers config, which
+    # carries the resolved commit hash of a Hub download
+    model = getattr(embedding_function, "_model", None)
+    try:
+        commit_hash = model[0].auto_model.config._commit_hash
+    except (AttributeError, IndexError, KeyError, TypeError):
+        commit_hash = None
+    return commit_hash or EMBEDDING_MODEL_REVISION or "unknown"
+
+
+def create_embedding_backend(
+    model_name: str,
+    backend: Optional[str] = None,
+    device: str = "cpu",
+    revision: Optional[str] = None
+) -> Any:
+    """
+    Create a Chroma-compatible embedding function for a model.
+
+    Args:
+        model_name: Hugging Face / sentence-transformers model name
+        backend: "torch", "onnx", or "onnx-int8"; defaults to EMBEDDING_BACKEND
+        device: Device for the PyTorch backend
+        revision: Hub commit or tag to load the PyTorch model at; defaults to
+            EMBEDDING_MODEL_REVISION ("" = latest). ONNX exports are pinned
+            when exported.
+
+    Returns:
+        The embedding function
+    """
+    backend = backend or EMBEDDING_BACKEND
+    revision = EMBEDDING_MODEL_REVISION if revision is None else revision
+    if backend not in EMBEDDING_BACKENDS:
+        raise ValueError(f"Unknown embedding backend {backend!r}; expected one of {EMBEDDING_BACKENDS}")
+
+    if backend == "torch":
+        from chromadb.utils import embedding_functions
+
+        kwargs = {"revision": revision} if revision else {}
+        return embedding_functions.SentenceTransformerEmbeddingFunction(
+            model_name=model_name,
+            device=device,
+            **kwargs
+        )
+
+    model_dir = onnx_model_dir(model_name)
+    if not model_dir.is_dir():
+        raise RuntimeError(
+            f"No ONNX export of {model_name} at {model_dir}. Create it with: "
+            f"python -m src.rag.embeddings.onnx_backend export --model {model_name}"
+        )
+    from .onnx_backend import OnnxEmbeddingFunction
+
+    return OnnxEmbeddingFunction(model_dir, quantized=backend == "onnx-int8")
@@ -0,0 +1,350 @@
+"""
+Embedding cache module for the RAG system.
+Provides a persistent on-disk cache that sits in front of embedding functions
+so unchanged text is never embedded twice.
+"""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from chromadb import Documents, EmbeddingFunction, Embeddings
+
+from src.rag.config.settings import (
+    EMBEDDING_CACHE_DTYPE,
+    EMBEDDING_CACHE_ENABLED,
+    EMBEDDING_CACHE_MAX_BYTES,
+    EMBEDDING_CACHE_PATH,
+)
+from src.rag.utils.hashing import text_hash
+from .backends import model_revision
+
+SUPPORTED_DTYPES = ("float32", "float16")
+
+# After eviction the cache is trimmed to this fraction of its byte budget,
+# so eviction does not run again on the very next write
+EVICTION_TARGET_RATIO = 0.9
+
+
+class EmbeddingCache:
+    """SQLite-backed embedding store keyed by (model, revision, normalized text hash)."""
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        max_bytes: int = 512 * 1024 * 1024,
+        dtype: str = "float32"
+    ):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            path: SQLite database file
+            max_bytes: Size budget for stored vectors; least recently used
+                entries are evicted beyond it
+            dtype: Storage precision for vectors, "float32" or "float16"
+        """
+        if dtype not in SUPPORTED_DTYPES:
+            raise ValueError(f"Unsupported cache dtype {dtype!r}; expected one of {SUPPORTED_DTYPES}")
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.dtype = dtype
+        self.hits = 0
+        self.misses = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                model TEXT NOT NULL,
+                revision TEXT NOT NULL,
+                text_hash TEXT NOT NULL,
+                dtype TEXT NOT NULL,
+                dim INTEGER NOT NULL,
+                vector BLOB NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (model, revision, text_hash)
+            ) WITHOUT ROWID
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings(last_used)")
+        self._conn.commit()
+        self._size_bytes = self._conn.execute(
+            "SELECT COALESCE(SUM(LENGTH(vector)), 0) FROM embeddings"
+        ).fetchone()[0]
+
+    def get_many(self, model: str, revision: str, hashes: Sequence[str]) -> Dict[str, np.ndarray]:
+        """
+        Look up cached vectors.
+
+        Args:
+            model: Embedding model name
+            revision: Embedding model revision
+            hashes: Normalized text hashes to look up
+
+        Returns:
+            Dict[str, np.ndarray]: float32 vectors for the hashes that were found
+        """
+        unique = list(dict.fromkeys(hashes))
+        found: Dict[str, np.ndarray] = {}
+        with self._lock:
+            # Stay well below SQLite's bound-parameter limit
+            for start in range(0, len(unique), 500):
+                batch = unique[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT text_hash, dtype, vector FROM embeddings "
+                    f"WHERE model = ? AND revision = ? AND text_hash IN ({placeholders})",
+                    (model, revision, *batch)
+                ).fetchall()
+                for key, dtype, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=dtype).astype(np.float32)
+
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE model = ? AND revision = ? AND text_hash = ?",
+                    [(now, model, revision, key) for key in found]
+                )
+                self._conn.commit()
+            self.hits += len(found)
+            self.misses += len(unique) - len(found)
+        return found
+
+    def put_many(self, model: str, revision: str, items: Sequence[Tuple[str, Any]]) -> None:
+        """
+        Store vectors, evicting least recently used entries if over budget.
+
+        Args:
+            model: Embedding model name
+            revision: Embedding model revision
+            items: (text hash, vector) pairs
+        """
+        if not items:
+            return
+        now = time.time()
+        rows = []
+        for key, vector in items:
+            array = np.asarray(vector, dtype=self.dtype)
+            rows.append((model, revision, key, self.dtype, int(array.shape[-1]), array.tobytes(), now))
+
+        with self._lock:
+            # Keep the running size exact when an entry is overwritten
+            replaced = 0
+            for start in range(0, len(rows), 500):
+                batch = [row[2] for row in rows[start:start + 500]]
+                placeholders = ",".join("?" * len(batch))
+                replaced += self._conn.execute(
+                    f"SELECT COALESCE(SUM(LENGTH(vector)), 0) FROM embeddings "
+                    f"WHERE model = ? AND revision = ? AND text_hash IN ({placeholders})",
+                    (model, revision, *batch)
+                ).fetchone()[0]
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings "
+                "(model, revision, text_hash, dtype, dim, vector, last_used) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            self._size_bytes += sum(len(row[5]) for row in rows) - replaced
+            if self._size_bytes > self.max_bytes:
+                self._evict_locked(int(self.max_bytes * EVICTION_TARGET_RATIO))
+            self._conn.commit()
+
+    def _evict_locked(self, target_bytes: int) -> int:
+        """
+        Delete least recently used entries until the cache fits in `target_bytes`.
+        Caller must hold the lock.
+
+        Returns:
+            int: Number of entries evicted
+        """
+        evicted = 0
+        cursor = self._conn.execute(
+            "SELECT model, revision, text_hash, LENGTH(vector) FROM embeddings ORDER BY last_used ASC"
+        )
+        doomed = []
+        for model, revision, key, size in cursor:
+            if self._size_bytes <= target_bytes:
+                break
+            doomed.append((model, revision, key))
+            self._size_bytes -= size
+            evicted += 1
+        cursor.close()
+        self._conn.executemany(
+            "DELETE FROM embeddings WHERE model = ? AND revision = ? AND text_hash = ?",
+            doomed
+        )
+        return evicted
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dict containing entry count, stored bytes, and hit/miss counters
+        """
+        with self._lock:
+            count = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        return {
+            "path": str(self.path),
+            "entries": count,
+            "size_bytes": self._size_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+class CachedEmbeddingFunction(EmbeddingFunction[Documents]):
+    """Chroma embedding function that consults an EmbeddingCache before embedding."""
+
+    def __init__(
+        self,
+        embedding_function: Any,
+        cache: EmbeddingCache,
+        model_name: str,
+        revision: Optional[str] = None
+    ):
+        """
+        Wrap an embedding function with a cache.
+
+        Args:
+            embedding_function: Chroma-compatible embedding function to wrap
+            cache: Cache to read from and write to
+            model_name: Model name used in cache keys
+            revision: Model revision used in cache keys; defaults to the
+                revision the wrapped model was loaded from (see `model_revision`)
+        """
+        self.base_function = embedding_function
+        self.cache = cache
+        self.model_name = model_name
+        self.revision = revision or model_revision(embedding_function)
+
+    def __call__(self, input: Documents) -> Embeddings:
+        """
+        Embed documents, computing only those not already cached.
+
+        Args:
+            input: Documents to embed
+
+        Returns:
+            Embeddings: One float32 vector per document, in input order
+        """
+        hashes = [text_hash(text) for text in input]
+        found = self.cache.get_many(self.model_name, self.revision, hashes)
+
+        missing: Dict[str, str] = {}
+        for key, text in zip(hashes, input):
+            if key not in found and key not in missing:
+                missing[key] = text
+        if missing:
+            computed = self.base_function(list(missing.values()))
+            new_items: List[Tuple[str, Any]] = list(zip(missing.keys(), computed))
+            self.cache.put_many(self.model_name, self.revision, new_items)
+            for key, vector in new_items:
+                found[key] = np.asarray(vector, dtype=np.float32)
+
+        return [found[key] for key in hashes]
+
+    # Delegate identity to the wrapped function so Chroma treats collections
+    # built with and without the cache as using the same embedding function
+    def name(self) -> str:  # type: ignore[override]
+        base_name = getattr(self.base_function, "name", None)
+        return base_name() if callable(base_name) else "cached"
+
+    def get_config(self) -> Dict[str, Any]:  # type: ignore[override]
+        get_config = getattr(self.base_function, "get_config", None)
+        return get_config() if callable(get_config) else {}
+
+    def default_space(self):  # type: ignore[override]
+        default_space = getattr(self.base_function, "default_space", None)
+        return default_space() if callable(default_space) else "l2"
+
+    def supported_spaces(self):  # type: ignore[override]
+        supported_spaces = getattr(self.base_function, "supported_spaces", None)
+        return supported_spaces() if callable(supported_spaces) else ["cosine", "l2", "ip"]
+
+
+_shared_caches: Dict[str, EmbeddingCache] = {}
+_shared_caches_lock = threading.Lock()
+
+
+def get_embedding_cache(path: Union[str, Path], max_bytes: int, dtype: str) -> EmbeddingCache:
+    """
+    Get the process-wide cache for a database file, opening it on first use.
+
+    Args:
+        path: SQLite database file
+        max_bytes: Size budget for stored vectors
+        dtype: Storage precision for vectors
+
+    Returns:
+        EmbeddingCache: Shared cache instance
+    """
+    key = str(Path(path).resolve())
+    with _shared_caches_lock:
+        if key not in _shared_caches:
+            _shared_caches[key] = EmbeddingCache(path, max_bytes=max_bytes, dtype=dtype)
+        return _shared_caches[key]
+
+
+def cached_embedding_function(
+    embedding_function: Any,
+    model_name: str,
+    revision: Optional[str] = None,
+    cache_path: Optional[Union[str, Path]] = None
+) -> Any:
+    """
+    Put the configured on-disk cache in front of an embedding function.
+
+    The cache is meant for index builds, where the same chunks are embedded
+    again on every rebuild; query paths should embed through `uncached`.
+
+    Args:
+        embedding_function: Chroma-compatible embedding function to wrap
+        model_name: Model name used in cache keys
+        revision: Model revision used in cache keys; defaults to the
+            revision the wrapped model was loaded from
+        cache_path: Override for the cache database file
+
+    Returns:
+        The wrapped embedding function, or the original one if caching is disabled
+    """
+    if not EMBEDDING_CACHE_ENABLED:
+        return embedding_function
+    cache = get_embedding_cache(
+        cache_path or EMBEDDING_CACHE_PATH,
+        max_bytes=EMBEDDING_CACHE_MAX_BYTES,
+        dtype=EMBEDDING_CACHE_DTYPE
+    )
+    return CachedEmbeddingFunction(embedding_function, cache, model_name, revision)
+
+
+def uncached(embedding_function: Any) -> Any:
+    """
+    Get the underlying embedding function, bypassing any cache wrapper.
+
+    Wrappers that transform vectors (such as a projection) keep their
+    transform and drop the cache beneath it via `without_cache`.
+
+    Args:
+        embedding_function: Possibly-wrapped embedding function
+
+    Returns:
+        The unwrapped embedding function
+    """
+    without_cache = getattr(embedding_function, "without_cache", None)
+    if callable(without_cache):
+        return without_cache()
+    return getattr(embedding_function, "base_function", embedding_function)
@@ -0,0 +1,365 @@
+"""
+ONNX embedding backend module for the RAG system.
+Exports sentence-transformers models to ONNX (optionally int8-quantized),
+runs them on CPU with onnxruntime, and verifies exports against PyTorch.
+onnxruntime and tokenizers are installed with chromadb; exporting also
+needs the `onnx` package.
+
+Export and verify from the project root:
+    python -m src.rag.embeddings.onnx_backend export --model BAAI/bge-large-en-v1.5
+    python -m src.rag.embeddings.onnx_backend verify --model BAAI/bge-large-en-v1.5
+"""
+
+import argparse
+import json
+import statistics
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+from chromadb import Documents, EmbeddingFunction, Embeddings
+
+from src.rag.config.settings import EMBEDDING_BATCH_SIZE, EMBEDDING_MODEL_REVISION, TEST_QUERIES
+from src.rag.storage.batching import length_sorted_batches
+from .backends import onnx_model_dir
+
+FP32_MODEL_FILE = "model.onnx"
+INT8_MODEL_FILE = "model_int8.onnx"
+TOKENIZER_FILE = "tokenizer.json"
+EXPORT_CONFIG_FILE = "onnx_config.json"
+
+SUPPORTED_POOLING = ("cls", "mean")
+
+
+def pool_embeddings(
+    hidden_states: np.ndarray,
+    attention_mask: np.ndarray,
+    pooling: str,
+    normalize: bool
+) -> np.ndarray:
+    """
+    Reduce token embeddings to one vector per text, as sentence-transformers does.
+
+    Args:
+        hidden_states: (batch, sequence, dim) token embeddings
+        attention_mask: (batch, sequence) mask of real tokens
+        pooling: "cls" (first token) or "mean" (mask-weighted mean)
+        normalize: Scale each vector to unit length
+
+    Returns:
+        np.ndarray: (batch, dim) float32 embeddings
+    """
+    if pooling == "cls":
+        pooled = hidden_states[:, 0]
+    elif pooling == "mean":
+        mask = attention_mask[..., None].astype(hidden_states.dtype)
+        pooled = (hidden_states * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+    else:
+        raise ValueError(f"Unsupported pooling {pooling!r}; expected one of {SUPPORTED_POOLING}")
+
+    pooled = pooled.astype(np.float32)
+    if normalize:
+        pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+    return pooled
+
+
+class OnnxEmbeddingFunction(EmbeddingFunction[Documents]):
+    """Chroma embedding function that runs an exported ONNX graph on CPU."""
+
+    def __init__(
+        self,
+        model_dir: Union[str, Path],
+        quantized: bool = True,
+        batch_size: int = EMBEDDING_BATCH_SIZE,
+        num_threads: Optional[int] = None
+    ):
+        """
+        Load an export written by `export_onnx`.
+
+        Args:
+            model_dir: Export directory
+            quantized: Use the int8 graph instead of the fp32 one
+            batch_size: Texts per inference call
+            num_threads: onnxruntime intra-op threads; defaults to all cores
+        """
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        self.model_dir = Path(model_dir)
+        self.quantized = quantized
+        self.batch_size = batch_size
+        with open(self.model_dir / EXPORT_CONFIG_FILE, "r", encoding="utf-8") as f:
+            self.config: Dict[str, Any] = json.load(f)
+
+        self.tokenizer = Tokenizer.from_file(str(self.model_dir / TOKENIZER_FILE))
+        self.tokenizer.enable_truncation(max_length=self.config["max_length"])
+        self.tokenizer.enable_padding(
+            pad_id=self.config["pad_token_id"],
+            pad_token=self.config["pad_token"]
+        )
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        model_file = INT8_MODEL_FILE if quantized else FP32_MODEL_FILE
+        self.session = ort.InferenceSession(
+            str(self.model_dir / model_file),
+            sess_options=options,
+            providers=["CPUExecutionProvider"]
+        )
+        self.input_names = {node.name for node in self.session.get_inputs()}
+
+    def __call__(self, input: Documents) -> Embeddings:
+        """
+        Embed documents.
+
+        Args:
+            input: Documents to embed
+
+        Returns:
+            Embeddings: One float32 vector per document, in input order
+        """
+        texts = list(input)
+        vectors: List[Optional[np.ndarray]] = [None] * len(texts)
+        # Similar-length batches keep padding, and wasted compute, small
+        for batch in length_sorted_batches(texts, self.batch_size):
+            encodings = self.tokenizer.encode_batch([texts[i] for i in batch])
+            attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+            feed = {
+                "input_ids": np.array([e.ids for e in encodings], dtype=np.int64),
+                "attention_mask": attention_mask,
+            }
+            if "token_type_ids" in self.input_names:
+                feed["token_type_ids"] = np.array([e.type_ids for e in encodings], dtype=np.int64)
+            hidden_states = self.session.run(None, feed)[0]
+            pooled = pool_embeddings(hidden_states, attention_mask, self.config["pooling"], self.config["normalize"])
+            for row, index in enumerate(batch):
+                vectors[index] = pooled[row]
+        return vectors
+
+    @staticmethod
+    def name() -> str:
+        return "rays-onnx"
+
+    def get_config(self) -> Dict[str, Any]:
+        return {"model_dir": str(self.model_dir), "quantized": self.quantized, "batch_size": self.batch_size}
+
+    @staticmethod
+    def build_from_config(config: Dict[str, Any]) -> "OnnxEmbeddingFunction":
+        return OnnxEmbeddingFunction(config["model_dir"], config["quantized"], config["batch_size"])
+
+
+def export_onnx(
+    model_name: str,
+    output_dir: Optional[Union[str, Path]] = None,
+    quantize: bool = True,
+    opset: int = 17,
+    revision: Optional[str] = None
+) -> Path:
+    """
+    Export a sentence-transformers model's transformer to ONNX, with an
+    optional dynamically int8-quantized copy.
+
+    Pooling and normalization are read from the sentence-transformers
+    pipeline and recorded in the export config, so the ONNX backend
+    reproduces the model's vectors.
+
+    Args:
+        model_name: sentence-transformers model name
+        output_dir: Export directory; defaults to onnx_model_dir(model_name)
+        quantize: Also write the int8 graph
+        opset: ONNX opset version
+        revision: Hub commit or tag to export; defaults to
+            EMBEDDING_MODEL_REVISION ("" = latest). The resolved commit hash
+            is recorded in the export config.
+
+    Returns:
+        Path: The export directory
+    """
+    import torch
+    from sentence_transformers import SentenceTransformer
+    from sentence_transformers.models import Normalize, Pooling
+
+    output_dir = Path(output_dir or onnx_model_dir(model_name))
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    revision = EMBEDDING_MODEL_REVISION if revision is None else revision
+    model = SentenceTransformer(model_name, device="cpu", revision=revision or None)
+    transformer = model[0].auto_model.eval()
+    transformer.config.return_dict = False
+    tokenizer = model.tokenizer
+    pooling_modules = [module for module in model if isinstance(module, Pooling)]
+    pooling = pooling_modules[0].get_pooling_mode_str() if pooling_modules else "mean"
+    if pooling not in SUPPORTED_POOLING:
+        raise ValueError(f"{model_name} uses {pooling!r} pooling; only {SUPPORTED_POOLING} are supported")
+
+    dummy = tokenizer(["Where can I park at the Trop?"], return_tensors="pt")
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in dummy]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+
+    print(f"Exporting {model_name} to {output_dir / FP32_MODEL_FILE}...")
+    with torch.no_grad():
+        torch.onnx.export(
+            transformer,
+            tuple(dummy[name] for name in input_names),
+            str(output_dir / FP32_MODEL_FILE),
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes,
+            opset_version=opset,
+            do_constant_folding=True
+        )
+    tokenizer.save_pretrained(str(output_dir))
+
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        print(f"Quantizing weights to int8 in {output_dir / INT8_MODEL_FILE}...")
+        quantize_dynamic(
+            str(output_dir / FP32_MODEL_FILE),
+            str(output_dir / INT8_MODEL_FILE),
+            weight_type=QuantType.QInt8
+        )
+
+    config = {
+        "model_name": model_name,
+        "revision": getattr(transformer.config, "_commit_hash", None) or revision or None,
+        "pooling": pooling,
+        "normalize": any(isinstance(module, Normalize) for module in model),
+        "max_length": model.max_seq_length,
+        "pad_token": tokenizer.pad_token,
+        "pad_token_id": tokenizer.pad_token_id,
+        "quantized": quantize,
+        "opset": opset,
+    }
+    with open(output_dir / EXPORT_CONFIG_FILE, "w", encoding="utf-8") as f:
+        json.dump(config, f, indent=2)
+    print(f"Export complete ({pooling} pooling, normalize={config['normalize']}).")
+    return output_dir
+
+
+def _sample_texts(source: Union[str, Path], limit: int) -> List[str]:
+    """Chunk texts from the knowledge base, as the index would embed them."""
+    from src.rag.processing.pipeline import preprocess_sections
+    from src.rag.utils.markdown_utils import iter_markdown_file
+
+    sections = ((url, content) for _, url, content in iter_markdown_file(source))
+    texts = [chunk["text"] for _, chunks in preprocess_sections(sections, workers=1) for chunk in chunks]
+    return texts[:limit]
+
+
+def _measure(embed: Any, texts: List[str], queries: List[str], runs: int) -> Dict[str, Any]:
+    """Embed `texts` once for throughput and each query `runs` times for latency."""
+    embed(queries[:1])  # Warm-up
+    start = time.perf_counter()
+    vectors = np.asarray(embed(texts), dtype=np.float32)
+    elapsed = time.perf_counter() - start
+
+    latencies = []
+    for i in range(runs):
+        query = queries[i % len(queries)]
+        start = time.perf_counter()
+        embed([query])
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    return {
+        "vectors": vectors,
+        "docs_per_sec": len(texts) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1e3,
+        "p95_ms": latencies[int(0.95 * (len(latencies) - 1))] * 1e3,
+    }
+
+
+def verify_onnx(
+    model_name: str,
+    model_dir: Optional[Union[str, Path]] = None,
+    source: Union[str, Path] = "crawl/content/rays_content_raw.md",
+    limit: int = 256,
+    runs: int = 50
+) -> Dict[str, Dict[str, float]]:
+    """
+    Compare an ONNX export with the PyTorch model and print a report.
+
+    Reports, for each graph, the cosine agreement of its vectors with the
+    fp32 PyTorch vectors on knowledge-base chunks, single-query latency,
+    and batch throughput.
+
+    Args:
+        model_name: sentence-transformers model name
+        model_dir: Export directory; defaults to onnx_model_dir(model_name)
+        source: Markdown knowledge base to sample chunks from
+        limit: Maximum chunks to embed
+        runs: Single-query latency samples per backend
+
+    Returns:
+        Dict of backend name -> metrics
+    """
+    from chromadb.utils import embedding_functions
+
+    model_dir = Path(model_dir or onnx_model_dir(model_name))
+    texts = _sample_texts(source, limit)
+    queries = list(TEST_QUERIES)
+
+    backends = {
+        "torch-fp32": embedding_functions.SentenceTransformerEmbeddingFunction(model_name=model_name, device="cpu"),
+        "onnx-fp32": OnnxEmbeddingFunction(model_dir, quantized=False),
+    }
+    if (model_dir / INT8_MODEL_FILE).is_file():
+        backends["onnx-int8"] = OnnxEmbeddingFunction(model_dir, quantized=True)
+
+    results = {name: _measure(embed, texts, queries, runs) for name, embed in backends.items()}
+    reference = results["torch-fp32"]
+    ref_unit = reference["vectors"] / np.linalg.norm(reference["vectors"], axis=1, keepdims=True)
+
+    print(f"\n{model_name}: {len(texts)} knowledge-base chunks, {runs} single-query runs")
+    print(f"{'backend':<12}{'cos mean':>10}{'cos min':>10}{'p50 ms':>10}{'p95 ms':>10}{'docs/s':>10}{'speedup':>10}")
+    report = {}
+    for name, result in results.items():
+        unit = result["vectors"] / np.linalg.norm(result["vectors"], axis=1, keepdims=True)
+        cosines = np.sum(unit * ref_unit, axis=1)
+        report[name] = {
+            "cosine_mean": float(cosines.mean()),
+            "cosine_min": float(cosines.min()),
+            "p50_ms": result["p50_ms"],
+            "p95_ms": result["p95_ms"],
+            "docs_per_sec": result["docs_per_sec"],
+        }
+        print(
+            f"{name:<12}{cosines.mean():>10.4f}{cosines.min():>10.4f}{result['p50_ms']:>10.1f}"
+            f"{result['p95_ms']:>10.1f}{result['docs_per_sec']:>10.1f}"
+            f"{reference['p50_ms'] / result['p50_ms']:>9.2f}x"
+        )
+    return report
+
+
+def main():
+    """Export or verify an ONNX embedding backend."""
+    parser = argparse.ArgumentParser(description="ONNX embedding backend tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = subparsers.add_parser("export", help="Export a model to ONNX (fp32 and int8)")
+    export_parser.add_argument("--model", required=True, help="sentence-transformers model name")
+    export_parser.add_argument("--output", help="Export directory (default: under ONNX_MODEL_DIR)")
+    export_parser.add_argument("--no-quantize", action="store_true", help="Skip the int8 graph")
+    export_parser.add_argument("--opset", type=int, default=17, help="ONNX opset version")
+    export_parser.add_argument("--revision", help="Hub commit or tag to export (default: EMBEDDING_MODEL_REVISION)")
+
+    verify_parser = subparsers.add_parser("verify", help="Compare an export with the PyTorch model")
+    verify_parser.add_argument("--model", required=True, help="sentence-transformers model name")
+    verify_parser.add_argument("--model-dir", help="Export directory (default: under ONNX_MODEL_DIR)")
+    verify_parser.add_argument("--source", default="crawl/content/rays_content_raw.md", help="Markdown to sample chunks from")
+    verify_parser.add_argument("--limit", type=int, default=256, help="Maximum chunks to embed")
+    verify_parser.add_argument("--runs", type=int, default=50, help="Single-query latency samples")
+
+    args = parser.parse_args()
+    if args.command == "export":
+        export_onnx(args.model, args.output, quantize=not args.no_quantize, opset=args.opset, revision=args.revision)
+    else:
+        verify_onnx(args.model, args.model_dir, args.source, args.limit, args.runs)
+
+
+if __name__ == "__main__":
+    main()
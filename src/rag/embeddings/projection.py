@@ -0,0 +1,350 @@
+"""
+Embedding projection module for the RAG system.
+Provides a PCA (optionally whitened) projection fitted on corpus embeddings
+that reduces vector dimension for smaller indexes and faster scans, an
+embedding function wrapper that applies it, and a recall@k report.
+
+Report from the project root (after `python rays_rag.py --build-index`):
+    python -m src.rag.embeddings.projection --snapshot index_snapshot --dims 128 256 384
+"""
+
+import argparse
+import hashlib
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+from chromadb import Documents, EmbeddingFunction, Embeddings
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """Scale each row to unit length."""
+    return matrix / np.clip(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12, None)
+
+
+class PCAProjection:
+    """Linear projection onto the top principal components of a corpus."""
+
+    def __init__(
+        self,
+        mean: np.ndarray,
+        components: np.ndarray,
+        explained_variance: np.ndarray,
+        total_variance: float,
+        whiten: bool = False
+    ):
+        """
+        Initialize from fitted parameters. Use `PCAProjection.fit` or
+        `PCAProjection.load` rather than calling this directly.
+
+        Args:
+            mean: (input_dim,) corpus mean
+            components: (output_dim, input_dim) principal axes, one per row
+            explained_variance: (output_dim,) variance along each axis
+            total_variance: Total variance of the corpus
+            whiten: Scale each axis to unit variance
+        """
+        self.mean = np.asarray(mean, dtype=np.float32)
+        self.components = np.asarray(components, dtype=np.float32)
+        self.explained_variance = np.asarray(explained_variance, dtype=np.float32)
+        self.total_variance = float(total_variance)
+        self.whiten = whiten
+
+        # Fold whitening into the projection matrix once
+        weights = self.components.T
+        if whiten:
+            weights = weights / np.sqrt(np.clip(self.explained_variance, 1e-12, None))
+        self._weights = np.ascontiguousarray(weights, dtype=np.float32)
+
+    @property
+    def input_dim(self) -> int:
+        return self.components.shape[1]
+
+    @property
+    def output_dim(self) -> int:
+        return self.components.shape[0]
+
+    @property
+    def explained_variance_ratio(self) -> float:
+        """Fraction of the corpus variance the kept axes retain."""
+        return float(self.explained_variance.sum() / self.total_variance) if self.total_variance else 0.0
+
+    @property
+    def version(self) -> str:
+        """Content-derived identifier of the fitted projection."""
+        digest = hashlib.sha256(self._weights.tobytes())
+        digest.update(self.mean.tobytes())
+        return digest.hexdigest()[:16]
+
+    @classmethod
+    def fit(cls, embeddings: Any, output_dim: int, whiten: bool = False) -> "PCAProjection":
+        """
+        Fit the projection on corpus embeddings.
+
+        Args:
+            embeddings: (n, input_dim) corpus embeddings
+            output_dim: Number of dimensions to keep
+            whiten: Scale each kept axis to unit variance
+
+        Returns:
+            PCAProjection: The fitted projection
+        """
+        matrix = np.asarray(embeddings, dtype=np.float64)
+        if matrix.ndim != 2:
+            raise ValueError("Embeddings must be a 2-D matrix")
+        max_dim = min(matrix.shape)
+        if not 0 < output_dim <= max_dim:
+            raise ValueError(f"output_dim must be between 1 and {max_dim} for {matrix.shape[0]} x {matrix.shape[1]} embeddings")
+
+        mean = matrix.mean(axis=0)
+        centered = matrix - mean
+        # Right singular vectors are the principal axes, largest variance first
+        _, singular_values, vt = np.linalg.svd(centered, full_matrices=False)
+        variance = singular_values ** 2 / max(len(matrix) - 1, 1)
+        return cls(mean, vt[:output_dim], variance[:output_dim], variance.sum(), whiten)
+
+    def transform(self, embeddings: Any) -> np.ndarray:
+        """
+        Project embeddings and re-normalize them for cosine search.
+
+        Args:
+            embeddings: (n, input_dim) embeddings, or a single vector
+
+        Returns:
+            np.ndarray: (n, output_dim) float32 unit vectors
+        """
+        matrix = np.atleast_2d(np.asarray(embeddings, dtype=np.float32))
+        if matrix.shape[1] != self.input_dim:
+            raise ValueError(f"Expected {self.input_dim}-dim embeddings, got {matrix.shape[1]}")
+        return _normalize_rows((matrix - self.mean) @ self._weights)
+
+    def save(self, path: Union[str, Path]) -> None:
+        """
+        Save the projection as a .npz file.
+
+        Args:
+            path: Destination file
+        """
+        with open(path, "wb") as f:
+            np.savez(
+                f,
+                mean=self.mean,
+                components=self.components,
+                explained_variance=self.explained_variance,
+                total_variance=np.float64(self.total_variance),
+                whiten=np.bool_(self.whiten)
+            )
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> Optional["PCAProjection"]:
+        """
+        Load a projection saved with `save`.
+
+        Args:
+            path: Projection file
+
+        Returns:
+            Optional[PCAProjection]: The projection, or None if the file does not exist
+        """
+        path = Path(path)
+        if not path.is_file():
+            return None
+        with np.load(path) as data:
+            return cls(
+                data["mean"],
+                data["components"],
+                data["explained_variance"],
+                float(data["total_variance"]),
+                bool(data["whiten"])
+            )
+
+
+def corpus_projection(
+    embeddings: Any,
+    output_dim: int,
+    whiten: bool = False,
+    existing: Optional[PCAProjection] = None
+) -> Optional[PCAProjection]:
+    """
+    Get the projection to index a corpus with, reusing `existing` when it
+    already has the requested shape.
+
+    Args:
+        embeddings: (n, input_dim) full-dimension corpus embeddings
+        output_dim: Dimensions to keep; 0 disables the projection
+        whiten: Whiten the projection
+        existing: Previously fitted projection, e.g. from an index snapshot
+
+    Returns:
+        Optional[PCAProjection]: The projection, or None when disabled or the
+        corpus is too small to fit one
+    """
+    if output_dim <= 0:
+        return None
+    matrix = np.asarray(embeddings, dtype=np.float32)
+    if (
+        existing is not None
+        and existing.input_dim == matrix.shape[1]
+        and existing.output_dim == output_dim
+        and existing.whiten == whiten
+    ):
+        return existing
+    if output_dim > min(matrix.shape):
+        print(f"Warning: Cannot fit a {output_dim}-dim projection on {matrix.shape[0]} x {matrix.shape[1]} embeddings; using full dimension")
+        return None
+    projection = PCAProjection.fit(matrix, output_dim, whiten=whiten)
+    print(
+        f"Fitted {matrix.shape[1]} -> {output_dim} dim projection"
+        f"{' with whitening' if whiten else ''} ({projection.explained_variance_ratio:.1%} of variance kept)"
+    )
+    return projection
+
+
+class ProjectedEmbeddingFunction(EmbeddingFunction[Documents]):
+    """Chroma embedding function that projects another function's vectors."""
+
+    def __init__(self, embedding_function: Any, projection: PCAProjection):
+        """
+        Wrap an embedding function with a projection.
+
+        Args:
+            embedding_function: Full-dimension embedding function, usually cached
+            projection: Projection to apply to its output
+        """
+        self.embedding_function = embedding_function
+        self.projection = projection
+
+    def __call__(self, input: Documents) -> Embeddings:
+        """
+        Embed documents and project them.
+
+        Args:
+            input: Documents to embed
+
+        Returns:
+            Embeddings: One projected float32 unit vector per document
+        """
+        if not input:
+            return []
+        return list(self.projection.transform(self.embedding_function(input)))
+
+    def without_cache(self) -> "ProjectedEmbeddingFunction":
+        """Same projection over the uncached embedding function (see embeddings.cache.uncached)."""
+        from .cache import uncached
+
+        return ProjectedEmbeddingFunction(uncached(self.embedding_function), self.projection)
+
+    # A different vector space, so Chroma must not treat it as the base function
+    def name(self) -> str:  # type: ignore[override]
+        base_name = getattr(self.embedding_function, "name", None)
+        base = base_name() if callable(base_name) else "embedding"
+        return f"{base}-pca{self.projection.output_dim}"
+
+    def get_config(self) -> Dict[str, Any]:  # type: ignore[override]
+        return {"output_dim": self.projection.output_dim, "version": self.projection.version}
+
+    def default_space(self):  # type: ignore[override]
+        return "cosine"
+
+    def supported_spaces(self):  # type: ignore[override]
+        return ["cosine", "ip", "l2"]
+
+
+def recall_report(
+    embeddings: Any,
+    dims: Sequence[int],
+    ks: Sequence[int] = (1, 4, 10),
+    num_queries: int = 200,
+    whiten: bool = False,
+    seed: int = 0
+) -> List[Dict[str, Any]]:
+    """
+    Measure how well projected search reproduces full-dimension search.
+
+    Corpus vectors serve as queries: each query's exact top-k neighbours
+    (excluding itself) at full dimension are compared with its top-k after
+    projection.
+
+    Args:
+        embeddings: (n, dim) corpus embeddings at full dimension
+        dims: Projection sizes to evaluate
+        ks: Cut-offs for recall@k
+        num_queries: Corpus vectors to use as queries
+        whiten: Whiten the projections
+        seed: Random seed for choosing queries
+
+    Returns:
+        List of per-dimension rows with recall@k, size, and scan time
+    """
+    full = _normalize_rows(np.asarray(embeddings, dtype=np.float32))
+    rng = np.random.default_rng(seed)
+    queries = rng.choice(len(full), size=min(num_queries, len(full)), replace=False)
+    max_k = min(max(ks), len(full) - 1)
+
+    def top_k(matrix: np.ndarray) -> np.ndarray:
+        scores = matrix[queries] @ matrix.T
+        scores[np.arange(len(queries)), queries] = -np.inf
+        return np.argsort(-scores, axis=1)[:, :max_k]
+
+    def scan_ms(matrix: np.ndarray) -> float:
+        start = time.perf_counter()
+        for query in queries:
+            matrix @ matrix[query]
+        return (time.perf_counter() - start) / len(queries) * 1e3
+
+    exact = top_k(full)
+    rows = [{
+        "dim": full.shape[1],
+        "bytes_per_vector": full.shape[1] * 4,
+        "explained_variance": 1.0,
+        "scan_ms": scan_ms(full),
+        **{f"recall@{k}": 1.0 for k in ks},
+    }]
+    for dim in dims:
+        projection = PCAProjection.fit(full, dim, whiten=whiten)
+        projected = projection.transform(full)
+        approx = top_k(projected)
+        row = {
+            "dim": dim,
+            "bytes_per_vector": dim * 4,
+            "explained_variance": projection.explained_variance_ratio,
+            "scan_ms": scan_ms(projected),
+        }
+        for k in ks:
+            k = min(k, max_k)
+            hits = [len(set(exact[i, :k]) & set(approx[i, :k])) for i in range(len(queries))]
+            row[f"recall@{k}"] = float(np.mean(hits) / k)
+        rows.append(row)
+    return rows
+
+
+def main():
+    """Print a recall@k report for projections of an index snapshot."""
+    from src.rag.storage.snapshot import IndexSnapshot
+
+    parser = argparse.ArgumentParser(description="Recall of PCA-projected search against full-dimension search")
+    parser.add_argument("--snapshot", default="index_snapshot", help="Index snapshot directory")
+    parser.add_argument("--dims", type=int, nargs="+", default=[128, 256, 384], help="Projection sizes")
+    parser.add_argument("--k", type=int, nargs="+", default=[1, 4, 10], help="Recall cut-offs")
+    parser.add_argument("--queries", type=int, default=200, help="Corpus vectors used as queries")
+    parser.add_argument("--whiten", action="store_true", help="Whiten the projections")
+    args = parser.parse_args()
+
+    snapshot = IndexSnapshot.load(args.snapshot)
+    if snapshot is None:
+        raise SystemExit(f"No index snapshot at {args.snapshot}; run `python rays_rag.py --build-index` first")
+
+    rows = recall_report(snapshot.embeddings, args.dims, args.k, args.queries, args.whiten)
+    recall_columns = [key for key in rows[0] if key.startswith("recall@")]
+    print(f"\n{len(snapshot)} vectors from {snapshot.model_name}")
+    print(f"{'dim':>6}{'bytes':>8}{'variance':>10}{'scan ms':>10}" + "".join(f"{c:>11}" for c in recall_columns))
+    for row in rows:
+        print(
+            f"{row['dim']:>6}{row['bytes_per_vector']:>8}{row['explained_variance']:>10.3f}{row['scan_ms']:>10.3f}"
+            + "".join(f"{row.get(c, float('nan')):>11.3f}" for c in recall_columns)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -6,9 +6,11 @@ Orchestrates the crawling, processing, and storage of content.
 import asyncio
 from typing import Dict, List
 
+from src.rag.config import PREPROCESS_BATCH_WORKERS, ensure_directories
 from src.rag.crawl import RaysCrawler
-from src.rag.processing import ContentCleaner, ContentChunker
+from src.rag.processing import preprocess_sections
 from src.rag.storage import RaysVectorStore
+from src.rag.storage.vectorstore import DEFAULT_EMBEDDING_MODEL
 from src.rag.utils import MarkdownGenerator
 
 # Configuration
@@ -47,11 +49,10 @@ SIMILARITY_TEST_PAIRS = [
 async def main():
     """Main execution function."""
     print("\n=== Starting Rays Content Collection System ===\n")
+    ensure_directories()
     
     # Initialize components
     crawler = RaysCrawler()
-    cleaner = ContentCleaner()
-    chunker = ContentChunker()
     vector_store = RaysVectorStore(
         persist_dir=CHROMA_DB_DIR,
         collection_name=COLLECTION_NAME
@@ -76,23 +77,25 @@ async def main():
     
     # Step 3: Process and store content
     print("\nProcessing and storing content...")
-    for url, content in url_content_map.items():
-        # Clean content
-        cleaned_content = cleaner.clean_content(content)
-        if not cleaned_content:
+    # Clean and chunk every page in parallel; results arrive in crawl order.
+    # In "tokens" chunking mode chunks are sized with the vector store model's tokenizer.
+    for url, chunks in preprocess_sections(
+        url_content_map.items(),
+        workers=PREPROCESS_BATCH_WORKERS,
+        tokenizer_model=f"sentence-transformers/{DEFAULT_EMBEDDING_MODEL}"
+    ):
+        if not chunks:
             print(f"Warning: Cleaning failed for {url}")
             continue
         
-        # Create chunks with metadata
-        chunks = chunker.process_content(cleaned_content, url)
-        
         # Prepare data for vector store
         texts = [chunk["text"] for chunk in chunks]
         metadatas = [chunk["metadata"] for chunk in chunks]
-        ids = [f"{url}_{i}" for i in range(len(chunks))]
+        ids = [chunk["id"] for chunk in chunks]
         
-        # Store in vector database
-        vector_store.add_documents(
+        # Incrementally update the vector database; only changed chunks are embedded.
+        # Sources whose crawl failed are left untouched rather than pruned.
+        vector_store.sync_documents(
             documents=texts,
             metadatas=metadatas,
             ids=ids
@@ -4,9 +4,13 @@ Provides functionality to clean and chunk content for vector storage.
 """
 
 from .cleaner import ContentCleaner
-from .chunker import ContentChunker
+from .chunker import ContentChunker, TokenAwareChunker, create_chunker
+from .pipeline import preprocess_sections
 
 __all__ = [
     'ContentCleaner',
     'ContentChunker',
+    'TokenAwareChunker',
+    'create_chunker',
+    'preprocess_sections',
 ]
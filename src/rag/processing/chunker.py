@@ -3,10 +3,20 @@ Content chunking module for the RAG system.
 Provides functionality to split content into semantic chunks for vector storage.
 """
 
+import logging
 import re
-from typing import List, Dict
+from typing import Any, List, Dict, Optional, Tuple
 from datetime import datetime
 
+from src.rag.utils.hashing import chunk_id
+
+logger = logging.getLogger(__name__)
+
+# Sequence limit assumed when a tokenizer does not report a usable one
+DEFAULT_MODEL_MAX_TOKENS = 512
+
+_SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+')
+
 class ContentChunker:
     """Chunker class for splitting content into semantic chunks."""
     
@@ -55,54 +65,78 @@ class ContentChunker:
         """
         Create chunks from content with overlap.
         
+        The current chunk is tracked as a range of paragraph indices plus the
+        overlap carried over from the previous chunk, and each chunk string is
+        built once, when it is emitted.
+        
         Args:
             content: Text content to chunk
             
         Returns:
             List[str]: List of content chunks
         """
+        paragraphs = [p for p in content.split('\n\n') if p and not p.isspace()]
+        logger.debug("create_chunks: %d paragraphs in %d characters", len(paragraphs), len(content))
+        
         chunks = []
-        current_chunk = ""
-        
-        # First split by headers
-        sections = [content]
-        print(f"split_by_headers produced {len(sections)} sections")
-        for idx, sec in enumerate(sections):
-            print(f"Section {idx} (first 100 chars): {sec[:100]}")
-        
-        for section in sections:
-            # Split section into paragraphs
-            paragraphs = section.split('\n\n')
-            print(f"Section {idx} has {len(paragraphs)} paragraphs")
-            for pidx, para in enumerate(paragraphs):
-                print(f"Paragraph {pidx} (len {len(para)}): {para[:100]}")
-            
-            for paragraph in paragraphs:
-                if not paragraph.strip():
-                    continue
+        # Current chunk: overlap prefix, then paragraphs[first:end], joined with blank lines
+        prefix = ""
+        first = end = 0
+        length = 0
+        
+        for index, paragraph in enumerate(paragraphs):
+            # If adding this paragraph would exceed max size
+            if length + len(paragraph) > self.max_chunk_size:
+                if length >= self.min_chunk_size:
+                    chunks.append(self._join_chunk(prefix, paragraphs[first:end]).strip())
                 
-                # If adding this paragraph would exceed max size
-                if len(current_chunk) + len(paragraph) > self.max_chunk_size:
-                    if len(current_chunk) >= self.min_chunk_size:
-                        chunks.append(current_chunk.strip())
-                    
-                    # Start new chunk with overlap from previous chunk
-                    if len(current_chunk) > self.overlap_size:
-                        current_chunk = current_chunk[-self.overlap_size:] + "\n\n" + paragraph
-                    else:
-                        current_chunk = paragraph
+                # Start new chunk with overlap from previous chunk
+                if self.overlap_size and length > self.overlap_size:
+                    prefix = self._chunk_tail(prefix, paragraphs[first:end], self.overlap_size)
+                    length = len(prefix) + 2 + len(paragraph)
                 else:
-                    if current_chunk:
-                        current_chunk += "\n\n" + paragraph
-                    else:
-                        current_chunk = paragraph
+                    prefix = ""
+                    length = len(paragraph)
+                first = index
+            else:
+                length += len(paragraph) + 2 if length else len(paragraph)
+            end = index + 1
         
         # Add the last chunk if it meets minimum size
-        if current_chunk and len(current_chunk) >= self.min_chunk_size:
-            chunks.append(current_chunk.strip())
+        if length and length >= self.min_chunk_size:
+            chunks.append(self._join_chunk(prefix, paragraphs[first:end]).strip())
         
+        if logger.isEnabledFor(logging.DEBUG):
+            for index, chunk in enumerate(chunks):
+                logger.debug("Chunk %d (len %d): %s", index, len(chunk), chunk[:100])
         return chunks
     
+    @staticmethod
+    def _join_chunk(prefix: str, paragraphs: List[str]) -> str:
+        """Materialize a chunk from its overlap prefix and paragraphs."""
+        if prefix:
+            return prefix + '\n\n' + '\n\n'.join(paragraphs)
+        return '\n\n'.join(paragraphs)
+    
+    @staticmethod
+    def _chunk_tail(prefix: str, paragraphs: List[str], size: int) -> str:
+        """Last `size` characters of a chunk, without materializing the whole chunk."""
+        parts: List[str] = []
+        remaining = size
+        for index in range(len(paragraphs) - 1, -1, -1):
+            paragraph = paragraphs[index]
+            parts.append(paragraph[-remaining:])
+            remaining -= len(parts[-1])
+            if remaining <= 0 or (index == 0 and not prefix):
+                break
+            parts.append('\n\n'[-remaining:])
+            remaining -= len(parts[-1])
+            if remaining <= 0:
+                break
+        if remaining > 0 and prefix:
+            parts.append(prefix[-remaining:])
+        return ''.join(reversed(parts))
+    
     def process_content(self, content: str, url: str) -> List[Dict]:
         """
         Process content into chunks with metadata.
@@ -112,9 +146,32 @@ class ContentChunker:
             url: Source URL of the content
             
         Returns:
-            List[Dict]: List of chunks with metadata
+            List[Dict]: List of chunks with a content-hash ID and metadata
+        """
+        return self._build_records(self.create_chunks(content), url)
+    
+    def _build_records(self, chunks: List[str], url: str) -> List[Dict]:
+        """
+        Attach content-hash IDs and metadata to chunk texts.
+        
+        Args:
+            chunks: Chunk texts in document order
+            url: Source URL of the content
+            
+        Returns:
+            List[Dict]: List of chunks with a content-hash ID and metadata
         """
-        chunks = self.create_chunks(content)
+        # Content-addressed IDs; identical chunks within a page are indexed once
+        ids = []
+        unique_chunks = []
+        seen = set()
+        for chunk in chunks:
+            cid = chunk_id(url, chunk)
+            if cid not in seen:
+                seen.add(cid)
+                ids.append(cid)
+                unique_chunks.append(chunk)
+        chunks = unique_chunks
         
         processed_chunks = []
         for i, chunk in enumerate(chunks):
@@ -123,6 +180,7 @@ class ContentChunker:
             words = len(chunk.split())
             
             processed_chunks.append({
+                "id": ids[i],
                 "text": chunk,
                 "metadata": {
                     "source_url": url,
@@ -138,3 +196,247 @@ class ContentChunker:
             })
         
         return processed_chunks
+
+
+class TokenAwareChunker(ContentChunker):
+    """Chunker that packs paragraphs and sentences up to an embedding model's token limit."""
+    
+    def __init__(
+        self,
+        model_name: Optional[str] = None,
+        tokenizer: Optional[Any] = None,
+        max_tokens: Optional[int] = None,
+        overlap_tokens: int = 32,
+        min_tokens: int = 1
+    ):
+        """
+        Initialize chunker with a tokenizer and token budget.
+        
+        Args:
+            model_name: Hugging Face model whose tokenizer is loaded on first use
+            tokenizer: Already-loaded tokenizer; takes precedence over `model_name`
+            max_tokens: Model sequence limit including special tokens; defaults
+                to the tokenizer's `model_max_length`
+            overlap_tokens: Maximum tokens of trailing sentences repeated at the
+                start of the next chunk
+            min_tokens: Minimum tokens to avoid tiny chunks
+        """
+        super().__init__(min_chunk_size=0, overlap_size=0)
+        if tokenizer is None and model_name is None:
+            raise ValueError("TokenAwareChunker needs either a tokenizer or a model_name")
+        self.model_name = model_name
+        self.max_tokens = max_tokens
+        self.overlap_tokens = overlap_tokens
+        self.min_tokens = min_tokens
+        self._tokenizer = tokenizer
+        self._token_budget: Optional[int] = None
+    
+    @property
+    def tokenizer(self) -> Any:
+        """Tokenizer used for counting, loaded lazily from `model_name`."""
+        if self._tokenizer is None:
+            from transformers import AutoTokenizer
+            self._tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+        return self._tokenizer
+    
+    @property
+    def token_budget(self) -> int:
+        """Tokens available for chunk text once the model's special tokens are added."""
+        if self._token_budget is None:
+            limit = self.max_tokens or getattr(self.tokenizer, "model_max_length", None)
+            # Tokenizers without a known limit report a huge sentinel value
+            if not limit or limit > 100_000:
+                limit = DEFAULT_MODEL_MAX_TOKENS
+            special = 0
+            if hasattr(self.tokenizer, "num_special_tokens_to_add"):
+                special = self.tokenizer.num_special_tokens_to_add(pair=False)
+            self._token_budget = max(1, limit - special)
+        return self._token_budget
+    
+    def count_tokens(self, texts: List[str]) -> List[int]:
+        """
+        Count tokens for many texts in a single tokenizer call.
+        
+        Args:
+            texts: Texts to count
+            
+        Returns:
+            List[int]: Token count of each text, excluding special tokens
+        """
+        if not texts:
+            return []
+        encoded = self.tokenizer(
+            texts,
+            add_special_tokens=False,
+            return_attention_mask=False,
+            return_token_type_ids=False
+        )
+        return [len(ids) for ids in encoded["input_ids"]]
+    
+    def create_chunks(self, content: str) -> List[str]:
+        """
+        Create chunks from content that each fit the token budget.
+        
+        Args:
+            content: Text content to chunk
+            
+        Returns:
+            List[str]: List of content chunks
+        """
+        return [text for text, _ in self.create_chunks_with_token_counts(content)]
+    
+    def create_chunks_with_token_counts(self, content: str) -> List[Tuple[str, int]]:
+        """
+        Pack paragraphs, and the sentences of paragraphs that are too long,
+        into chunks of at most `token_budget` tokens.
+        
+        A paragraph that fits the budget is never split. Sentences longer than
+        the budget are hard-split on word boundaries. Each new chunk starts with
+        up to `overlap_tokens` tokens of whole trailing sentences from the
+        previous chunk.
+        
+        Args:
+            content: Text content to chunk
+            
+        Returns:
+            List[Tuple[str, int]]: (chunk text, token count) pairs
+        """
+        budget = self.token_budget
+        paragraphs = [p.strip() for p in content.split('\n\n') if p.strip()]
+        sentences = [_SENTENCE_BOUNDARY.split(p) for p in paragraphs]
+        counts = iter(self.count_tokens([s for group in sentences for s in group]))
+        
+        # Units are (text, tokens, starts_paragraph)
+        chunks: List[List[Tuple[str, int, bool]]] = []
+        current: List[Tuple[str, int, bool]] = []
+        current_tokens = 0
+        for paragraph_sentences in sentences:
+            units = []
+            for sentence in paragraph_sentences:
+                tokens = next(counts)
+                pieces = self._split_oversized(sentence) if tokens > budget else [(sentence, tokens)]
+                for text, piece_tokens in pieces:
+                    units.append((text, piece_tokens, not units))
+            
+            paragraph_tokens = sum(unit[1] for unit in units)
+            groups = [units] if paragraph_tokens <= budget else [[unit] for unit in units]
+            for group in groups:
+                group_tokens = sum(unit[1] for unit in group)
+                if current and current_tokens + group_tokens > budget:
+                    chunks.append(current)
+                    current = self._overlap_tail(current, budget - group_tokens)
+                    current_tokens = sum(unit[1] for unit in current)
+                current = current + group
+                current_tokens += group_tokens
+        if current:
+            chunks.append(current)
+        
+        # Recount the joined texts so the reported counts are exact
+        texts = [self._join_units(units) for units in chunks]
+        result = []
+        for text, tokens in zip(texts, self.count_tokens(texts)):
+            if tokens > budget:
+                result.extend(self._split_oversized(text))
+            elif tokens >= self.min_tokens:
+                result.append((text, tokens))
+        return result
+    
+    def _overlap_tail(self, units: List[Tuple[str, int, bool]], room: int) -> List[Tuple[str, int, bool]]:
+        """Trailing units of a finished chunk to repeat at the start of the next one."""
+        limit = min(self.overlap_tokens, room)
+        tail: List[Tuple[str, int, bool]] = []
+        total = 0
+        # Never carry over the whole chunk
+        for unit in reversed(units[1:]):
+            if total + unit[1] > limit:
+                break
+            tail.insert(0, unit)
+            total += unit[1]
+        return tail
+    
+    @staticmethod
+    def _join_units(units: List[Tuple[str, int, bool]]) -> str:
+        """Join units, separating paragraphs with a blank line and sentences with a space."""
+        parts = []
+        for index, (text, _, starts_paragraph) in enumerate(units):
+            if index:
+                parts.append("\n\n" if starts_paragraph else " ")
+            parts.append(text)
+        return "".join(parts)
+    
+    def _split_oversized(self, text: str) -> List[Tuple[str, int]]:
+        """
+        Hard-split text that exceeds the token budget on word boundaries.
+        
+        Args:
+            text: Text longer than the token budget
+            
+        Returns:
+            List[Tuple[str, int]]: (piece text, token count) pairs
+        """
+        budget = self.token_budget
+        words = text.split()
+        pieces: List[Tuple[str, int]] = []
+        current: List[str] = []
+        current_tokens = 0
+        for word, tokens in zip(words, self.count_tokens(words)):
+            if current and current_tokens + tokens > budget:
+                pieces.append((" ".join(current), current_tokens))
+                current, current_tokens = [], 0
+            if tokens > budget:
+                pieces.extend(self._split_word(word))
+                continue
+            current.append(word)
+            current_tokens += tokens
+        if current:
+            pieces.append((" ".join(current), current_tokens))
+        return pieces
+    
+    def _split_word(self, word: str) -> List[Tuple[str, int]]:
+        """Split a single word that exceeds the token budget by halving it."""
+        tokens = self.count_tokens([word])[0]
+        if tokens <= self.token_budget or len(word) <= 1:
+            return [(word, tokens)]
+        middle = len(word) // 2
+        return self._split_word(word[:middle]) + self._split_word(word[middle:])
+    
+    def process_content(self, content: str, url: str) -> List[Dict]:
+        """
+        Process content into token-bounded chunks with metadata.
+        
+        Args:
+            content: Text content to process
+            url: Source URL of the content
+            
+        Returns:
+            List[Dict]: List of chunks with a content-hash ID and metadata,
+            including each chunk's `token_count`
+        """
+        pairs = self.create_chunks_with_token_counts(content)
+        records = self._build_records([text for text, _ in pairs], url)
+        token_counts = dict(pairs)
+        for record in records:
+            record["metadata"]["token_count"] = token_counts[record["text"]]
+        return records
+
+
+CHUNKERS = {
+    "characters": ContentChunker,
+    "tokens": TokenAwareChunker,
+}
+
+
+def create_chunker(mode: str = "characters", **options: Any) -> ContentChunker:
+    """
+    Create a chunker for a chunking mode.
+    
+    Args:
+        mode: "characters" for ContentChunker or "tokens" for TokenAwareChunker
+        **options: Keyword arguments for the chunker
+        
+    Returns:
+        ContentChunker: The configured chunker
+    """
+    if mode not in CHUNKERS:
+        raise ValueError(f"Unknown chunking mode {mode!r}; expected one of {sorted(CHUNKERS)}")
+    return CHUNKERS[mode](**options)
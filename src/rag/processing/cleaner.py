@@ -6,6 +6,31 @@ Provides functionality to clean and normalize crawled content.
 import re
 from typing import Optional
 
+# Precompiled patterns shared by the individual cleaning steps and the engine
+_HTML_TAG = re.compile(r'<[^>]+>')
+_HTML_ENTITY = re.compile(r'&[a-zA-Z]+;')
+_BLANK_LINES = re.compile(r'\n\s*\n')
+_WHITESPACE = re.compile(r'\s+')
+_MARKDOWN_LINK = re.compile(r'\[([^\]]+)\]\([^\)]+\)')
+_PLAIN_URL = re.compile(r'http[s]?://\S+')
+_REPEATED_PUNCTUATION = re.compile(r'([!?.]){2,}')
+_REPEATED_DASHES = re.compile(r'[-_]{2,}')
+_SPACE_BEFORE_PUNCTUATION = re.compile(r'\s+([.,!?])')
+_MISSING_SPACE_AFTER_PUNCTUATION = re.compile(r'([.,!?])([^\s])')
+
+# Engine-only variants. A leading character class (rather than a repeated
+# group or an alternation) lets the regex engine skip ahead to candidate
+# positions, which is markedly faster in CPython's `re`.
+_PUNCTUATION_RUN = re.compile(r'[!?.][!?.]+')
+_DASH_RUN = re.compile(r'[-_][-_]+')
+_PUNCTUATION_AFTER_SPACE = (' .', ' ,', ' !', ' ?')
+
+
+def _last_character(match: re.Match) -> str:
+    """Replacement for _PUNCTUATION_RUN; `([!?.]){2,}` -> r'\1' keeps the last character."""
+    return match.group()[-1]
+
+
 class ContentCleaner:
     """Cleaner class for processing raw content."""
     
@@ -21,9 +46,9 @@ class ContentCleaner:
             str: Content with HTML removed
         """
         # Remove HTML tags
-        content = re.sub(r'<[^>]+>', '', content)
+        content = _HTML_TAG.sub('', content)
         # Replace HTML entities with space
-        content = re.sub(r'&[a-zA-Z]+;', ' ', content)
+        content = _HTML_ENTITY.sub(' ', content)
         return content
     
     @staticmethod
@@ -40,9 +65,9 @@ class ContentCleaner:
         # Replace various newlines with standard newline
         content = content.replace('\r\n', '\n').replace('\r', '\n')
         # Remove multiple consecutive newlines but preserve paragraph structure
-        content = re.sub(r'\n\s*\n', '\n\n', content)
+        content = _BLANK_LINES.sub('\n\n', content)
         # Normalize other whitespace
-        content = re.sub(r'\s+', ' ', content)
+        content = _WHITESPACE.sub(' ', content)
         return content
     
     @staticmethod
@@ -57,9 +82,9 @@ class ContentCleaner:
             str: Cleaned content
         """
         # Extract text from markdown links
-        content = re.sub(r'\[([^\]]+)\]\([^\)]+\)', r'\1', content)
+        content = _MARKDOWN_LINK.sub(r'\1', content)
         # Remove plain URLs
-        content = re.sub(r'http[s]?://\S+', '', content)
+        content = _PLAIN_URL.sub('', content)
         return content
     
     @staticmethod
@@ -77,9 +102,9 @@ class ContentCleaner:
         content = content.replace('"', '"').replace('"', '"')
         content = content.replace("'", "'").replace("'", "'")
         # Convert multiple punctuation to single
-        content = re.sub(r'([!?.]){2,}', r'\1', content)
+        content = _REPEATED_PUNCTUATION.sub(r'\1', content)
         # Convert multiple dashes to em-dash
-        content = re.sub(r'[-_]{2,}', '—', content)
+        content = _REPEATED_DASHES.sub('—', content)
         return content
     
     @staticmethod
@@ -94,17 +119,55 @@ class ContentCleaner:
             str: Content with corrected spacing
         """
         # Remove space before punctuation
-        content = re.sub(r'\s+([.,!?])', r'\1', content)
+        content = _SPACE_BEFORE_PUNCTUATION.sub(r'\1', content)
         # Add space after punctuation if missing
-        content = re.sub(r'([.,!?])([^\s])', r'\1 \2', content)
+        content = _MISSING_SPACE_AFTER_PUNCTUATION.sub(r'\1 \2', content)
         # Replace non-breaking spaces
         content = content.replace('\xa0', ' ')
         return content
     
+    @staticmethod
+    def clean_content_stepwise(content: str) -> str:
+        """
+        Apply the individual cleaning steps one after another.
+        
+        This is the reference pipeline that `clean_content` must match byte
+        for byte; it is kept for testing and benchmarking.
+        
+        Args:
+            content: Raw content to clean
+            
+        Returns:
+            str: Cleaned content (possibly empty)
+        """
+        content = ContentCleaner.clean_html(content)
+        content = ContentCleaner.normalize_whitespace(content)
+        content = ContentCleaner.clean_markdown_and_urls(content)
+        content = ContentCleaner.normalize_punctuation(content)
+        content = ContentCleaner.fix_spacing(content)
+        
+        # Trim whitespace from lines and entire text
+        content = '\n'.join(line.strip() for line in content.split('\n'))
+        return content.strip()
+    
     def clean_content(self, content: str) -> Optional[str]:
         """
         Apply all cleaning steps to content.
         
+        Produces exactly the output of `clean_content_stepwise` with far
+        fewer passes over the text:
+        
+        - Whitespace is collapsed once with str.split/join. That also covers
+          line-ending fixes, blank-line folding and non-breaking spaces, and
+          leaves no newlines, so the per-line strip needs no pass. The quote
+          replacements are identities and are dropped.
+        - Tag, entity, link and URL passes only run when their marker occurs.
+        - Once whitespace is collapsed the only whitespace left is plain
+          spaces, so spaces before punctuation are removed with str.replace.
+        
+        Tags are still removed before entities, since removing a tag can
+        join the two halves of an entity.
+        
         Args:
             content: Raw content to clean
             
@@ -113,16 +176,23 @@ class ContentCleaner:
         """
         if not content or not isinstance(content, str):
             return None
-            
-        # Apply cleaning steps in sequence
-        content = self.clean_html(content)
-        content = self.normalize_whitespace(content)
-        content = self.clean_markdown_and_urls(content)
-        content = self.normalize_punctuation(content)
-        content = self.fix_spacing(content)
         
-        # Trim whitespace from lines and entire text
-        content = '\n'.join(line.strip() for line in content.split('\n'))
+        if '<' in content:
+            content = _HTML_TAG.sub('', content)
+        if '&' in content:
+            content = _HTML_ENTITY.sub(' ', content)
+        content = ' '.join(content.split())
+        if '](' in content:
+            content = _MARKDOWN_LINK.sub(r'\1', content)
+        if '://' in content:
+            content = _PLAIN_URL.sub('', content)
+        content = _PUNCTUATION_RUN.sub(_last_character, content)
+        content = _DASH_RUN.sub('—', content)
+        # Repeat so runs of several spaces before punctuation all go, like `\s+([.,!?])`
+        while any(pair in content for pair in _PUNCTUATION_AFTER_SPACE):
+            for pair in _PUNCTUATION_AFTER_SPACE:
+                content = content.replace(pair, pair[1])
+        content = _MISSING_SPACE_AFTER_PUNCTUATION.sub(r'\1 \2', content)
         content = content.strip()
         
         return content if content else None
@@ -0,0 +1,130 @@
+"""
+Preprocessing pipeline module for the RAG system.
+Provides a parallel clean-and-chunk stage that fans page sections out to a
+process pool and gathers the results in input order.
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.rag.config.settings import (
+    CHUNK_MAX_TOKENS,
+    CHUNK_OVERLAP_TOKENS,
+    CHUNKING_MODE,
+    PREPROCESS_CHUNKSIZE,
+    PREPROCESS_WORKERS,
+)
+from .cleaner import ContentCleaner
+from .chunker import ContentChunker, create_chunker
+
+# Per-process cleaner and chunker, created once by the pool initializer
+_worker_cleaner: Optional[ContentCleaner] = None
+_worker_chunker: Optional[ContentChunker] = None
+
+
+def _init_worker(chunking_mode: str, chunker_options: Dict[str, Any]) -> None:
+    """Create the cleaner and chunker used by this process."""
+    global _worker_cleaner, _worker_chunker
+    _worker_cleaner = ContentCleaner()
+    _worker_chunker = create_chunker(chunking_mode, **chunker_options)
+
+
+def _resolve_chunker_options(
+    chunking_mode: str,
+    chunker_options: Optional[Dict[str, Any]],
+    tokenizer_model: Optional[str]
+) -> Dict[str, Any]:
+    """Fill in configured defaults for the chunking mode."""
+    options = dict(chunker_options or {})
+    if chunking_mode == "tokens":
+        if tokenizer_model and "tokenizer" not in options:
+            options.setdefault("model_name", tokenizer_model)
+        options.setdefault("max_tokens", CHUNK_MAX_TOKENS or None)
+        options.setdefault("overlap_tokens", CHUNK_OVERLAP_TOKENS)
+    return options
+
+
+def _process_section(section: Tuple[str, str]) -> Tuple[str, List[Dict]]:
+    """
+    Clean and chunk one page section.
+
+    Args:
+        section: (source URL, raw content) pair
+
+    Returns:
+        Tuple of (source URL, chunks); chunks is empty if nothing survived cleaning
+    """
+    url, content = section
+    cleaned = _worker_cleaner.clean_content(content)
+    if not cleaned:
+        return url, []
+    return url, _worker_chunker.process_content(cleaned, url)
+
+
+def resolve_workers(workers: Optional[int] = None) -> int:
+    """
+    Resolve a worker count setting to a concrete number of processes.
+
+    Args:
+        workers: Requested workers; None means PREPROCESS_WORKERS, 0 means
+            one per CPU core
+
+    Returns:
+        int: Number of worker processes to use
+    """
+    if workers is None:
+        workers = PREPROCESS_WORKERS
+    if not workers:
+        workers = os.cpu_count() or 1
+    return max(1, workers)
+
+
+def preprocess_sections(
+    sections: Iterable[Tuple[str, str]],
+    workers: Optional[int] = None,
+    chunksize: int = PREPROCESS_CHUNKSIZE,
+    chunker_options: Optional[Dict[str, Any]] = None,
+    chunking_mode: Optional[str] = None,
+    tokenizer_model: Optional[str] = None
+) -> Iterator[Tuple[str, List[Dict]]]:
+    """
+    Clean and chunk page sections, in parallel when more than one worker is configured.
+
+    Sections are submitted to the pool as they are read from `sections`, in
+    work units of `chunksize` sections, and results are yielded in input order
+    so the output is identical to a serial run.
+
+    Args:
+        sections: Iterable of (source URL, raw content) pairs
+        workers: Number of worker processes; defaults to PREPROCESS_WORKERS.
+            Batch ingest passes PREPROCESS_BATCH_WORKERS.
+        chunksize: Sections per work unit sent to a worker
+        chunker_options: Keyword arguments for each worker's chunker
+        chunking_mode: "characters" or "tokens"; defaults to CHUNKING_MODE
+        tokenizer_model: Hugging Face model whose tokenizer sizes chunks in
+            "tokens" mode; normally the embedding model
+
+    Yields:
+        Tuple of (source URL, chunks) for each input section
+    """
+    chunking_mode = chunking_mode or CHUNKING_MODE
+    chunker_options = _resolve_chunker_options(chunking_mode, chunker_options, tokenizer_model)
+    workers = resolve_workers(workers)
+
+    if workers == 1:
+        _init_worker(chunking_mode, chunker_options)
+        for section in sections:
+            yield _process_section(section)
+        return
+
+    # Spawned workers start from a clean interpreter; forking a process that
+    # has already loaded torch or started threads (e.g. inside Streamlit) can deadlock
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(chunking_mode, chunker_options)
+    ) as executor:
+        yield from executor.map(_process_section, sections, chunksize=max(1, chunksize))
@@ -0,0 +1,21 @@
+"""
+Retrieval package for the RAG system.
+Provides keyword (BM25) search, hybrid dense + keyword retrieval, adaptive
+top-k selection, and assembly of retrieved chunks into prompt context.
+"""
+
+from .bm25 import BM25Index, tokenize
+from .hybrid import HybridRetriever, reciprocal_rank_fusion
+from .context import assemble_context, estimate_tokens, merge_overlapping
+from .adaptive import adaptive_k
+
+__all__ = [
+    'BM25Index',
+    'tokenize',
+    'HybridRetriever',
+    'reciprocal_rank_fusion',
+    'assemble_context',
+    'estimate_tokens',
+    'merge_overlapping',
+    'adaptive_k',
+]
@@ -0,0 +1,56 @@
+"""
+Adaptive top-k module for the RAG system.
+Decides how many retrieved chunks to keep from how far each one is from the
+best match, so single-fact questions send one or two chunks instead of a fixed k.
+"""
+
+from typing import Optional, Sequence
+
+from src.rag.config.settings import (
+    ADAPTIVE_K_ABSOLUTE_MARGIN,
+    ADAPTIVE_K_MAX,
+    ADAPTIVE_K_MIN,
+    ADAPTIVE_K_RELATIVE_MARGIN,
+)
+
+
+def adaptive_k(
+    distances: Sequence[Optional[float]],
+    min_k: int = ADAPTIVE_K_MIN,
+    max_k: int = ADAPTIVE_K_MAX,
+    relative_margin: float = ADAPTIVE_K_RELATIVE_MARGIN,
+    absolute_margin: float = ADAPTIVE_K_ABSOLUTE_MARGIN
+) -> int:
+    """
+    Count how many ranked results to keep.
+
+    The first `min_k` results are always kept. After that, results are kept
+    in rank order while their distance stays within
+    best + max(absolute_margin, relative_margin * best), where best is the
+    smallest distance among the first `max_k`; the first result beyond the
+    margin (or without a distance) ends the list.
+
+    Args:
+        distances: Distance of each result in ranked order; None when unknown
+            (e.g. a keyword-only match)
+        min_k: Minimum number of results to keep
+        max_k: Maximum number of results to keep
+        relative_margin: Allowed distance above the best, as a fraction of it
+        absolute_margin: Allowed distance above the best, in distance units
+
+    Returns:
+        int: Number of leading results to keep
+    """
+    limit_k = min(len(distances), max_k)
+    keep = min(min_k, limit_k)
+    known = [distance for distance in distances[:limit_k] if distance is not None]
+    if not known:
+        # Nothing to judge by; keep the whole pool
+        return limit_k
+    best = min(known)
+    threshold = best + max(absolute_margin, relative_margin * best)
+    for distance in distances[keep:limit_k]:
+        if distance is None or distance > threshold:
+            break
+        keep += 1
+    return keep
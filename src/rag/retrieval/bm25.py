@@ -0,0 +1,186 @@
+"""
+BM25 module for the RAG system.
+Provides a compact in-memory BM25 inverted index: CSR-style postings with the
+per-posting BM25 weights precomputed at build time, scored with NumPy.
+"""
+
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Function words that questions are full of but that carry no topic
+STOPWORDS = frozenset("""
+a about an and are as at be but by can do does for from has have how i if in
+into is it its me my of on or our so than that the their them there these they
+this to was we what when where which who why will with you your
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase alphanumeric terms, dropping stopwords and
+    trailing plural "s".
+
+    Args:
+        text: Text to tokenize
+
+    Returns:
+        List[str]: Terms, e.g. "Are brooms allowed?" -> ["broom", "allowed"]
+    """
+    terms = []
+    for token in _TOKEN_PATTERN.findall(text.lower()):
+        if token in STOPWORDS:
+            continue
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        terms.append(token)
+    return terms
+
+
+class BM25Index:
+    """Okapi BM25 over a fixed set of documents."""
+
+    def __init__(
+        self,
+        ids: Sequence[str],
+        documents: Sequence[str],
+        metadatas: Sequence[Dict],
+        k1: float = 1.2,
+        b: float = 0.75
+    ):
+        """
+        Build the index.
+
+        Args:
+            ids: Document IDs
+            documents: Document texts
+            metadatas: Document metadata dictionaries
+            k1: Term-frequency saturation
+            b: Document-length normalization
+        """
+        if len(documents) != len(ids) or len(metadatas) != len(ids):
+            raise ValueError("Length mismatch between documents, metadatas, and ids")
+        self.ids = list(ids)
+        self.documents = list(documents)
+        self.metadatas = list(metadatas)
+        self.k1 = k1
+        self.b = b
+
+        # (term id, doc, tf) triples, sorted by term into CSR postings
+        self.vocabulary: Dict[str, int] = {}
+        term_ids: List[int] = []
+        doc_ids: List[int] = []
+        term_freqs: List[int] = []
+        doc_lengths = np.zeros(len(self.documents), dtype=np.float32)
+        for doc, text in enumerate(self.documents):
+            counts: Dict[int, int] = {}
+            terms = tokenize(text)
+            for term in terms:
+                term_id = self.vocabulary.setdefault(term, len(self.vocabulary))
+                counts[term_id] = counts.get(term_id, 0) + 1
+            doc_lengths[doc] = len(terms)
+            term_ids.extend(counts)
+            doc_ids.extend([doc] * len(counts))
+            term_freqs.extend(counts.values())
+
+        term_ids_array = np.asarray(term_ids, dtype=np.int32)
+        order = np.argsort(term_ids_array, kind="stable")
+        self.postings = np.asarray(doc_ids, dtype=np.int32)[order]
+        document_frequency = np.bincount(term_ids_array, minlength=len(self.vocabulary))
+        self.indptr = np.zeros(len(self.vocabulary) + 1, dtype=np.int64)
+        np.cumsum(document_frequency, out=self.indptr[1:])
+
+        num_docs = len(self.documents)
+        self.idf = np.log1p((num_docs - document_frequency + 0.5) / (document_frequency + 0.5)).astype(np.float32)
+        average_length = float(doc_lengths.mean()) if num_docs else 0.0
+        tf = np.asarray(term_freqs, dtype=np.float32)[order]
+        norm = k1 * (1.0 - b + b * doc_lengths[self.postings] / max(average_length, 1e-9))
+        term_of_posting = term_ids_array[order]
+        self.weights = (self.idf[term_of_posting] * tf * (k1 + 1.0) / (tf + norm)).astype(np.float32)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def scores(self, query: str) -> np.ndarray:
+        """
+        BM25 score of every document for a query.
+
+        Args:
+            query: Query text
+
+        Returns:
+            np.ndarray: (num_documents,) float32 scores
+        """
+        return self._scores_and_coverage(query)[0]
+
+    def _scores_and_coverage(self, query: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        BM25 scores of every document, and the share of the query's IDF
+        weight each document contains; terms missing from the corpus count
+        with the highest possible IDF.
+        """
+        scores = np.zeros(len(self.ids), dtype=np.float32)
+        matched_idf = np.zeros(len(self.ids), dtype=np.float32)
+        num_docs = len(self.documents)
+        unseen_idf = float(np.log1p((num_docs + 0.5) / 0.5))
+        total_idf = 0.0
+        for term in set(tokenize(query)):
+            term_id = self.vocabulary.get(term)
+            if term_id is None:
+                total_idf += unseen_idf
+                continue
+            total_idf += float(self.idf[term_id])
+            start, end = self.indptr[term_id], self.indptr[term_id + 1]
+            # A term has at most one posting per document, so indices are unique
+            scores[self.postings[start:end]] += self.weights[start:end]
+            matched_idf[self.postings[start:end]] += self.idf[term_id]
+        return scores, matched_idf / max(total_idf, 1e-9)
+
+    def search(self, query: str, n_results: int = 10, mask: Optional[np.ndarray] = None) -> Dict[str, List]:
+        """
+        Rank documents for a query.
+
+        Args:
+            query: Query text
+            n_results: Maximum number of results
+            mask: Optional boolean mask of documents allowed in the results
+
+        Returns:
+            Dict with ids, documents, metadatas, scores, and query coverage
+            (share of the query's IDF weight found in the document) of the
+            matching documents (those sharing at least one term with the
+            query), best first
+        """
+        scores, coverage = self._scores_and_coverage(query)
+        if mask is not None:
+            scores[~mask] = 0.0
+        matching = np.flatnonzero(scores > 0)
+        if n_results <= 0:
+            matching = matching[:0]
+        elif len(matching) > n_results:
+            matching = matching[np.argpartition(-scores[matching], n_results - 1)[:n_results]]
+        top = matching[np.argsort(-scores[matching], kind="stable")]
+        return {
+            "ids": [self.ids[i] for i in top],
+            "documents": [self.documents[i] for i in top],
+            "metadatas": [self.metadatas[i] for i in top],
+            "scores": scores[top].tolist(),
+            "coverage": coverage[top].tolist(),
+        }
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get statistics about the index.
+
+        Returns:
+            Dict containing document, vocabulary, and posting counts and sizes
+        """
+        return {
+            "documents": len(self.ids),
+            "vocabulary": len(self.vocabulary),
+            "postings": int(len(self.postings)),
+            "postings_bytes": int(self.postings.nbytes + self.weights.nbytes + self.indptr.nbytes),
+        }
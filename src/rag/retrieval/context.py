@@ -0,0 +1,156 @@
+"""
+Context assembly module for the RAG system.
+Turns retrieved chunks into the prompt context: adjacent chunks of a page are
+merged without their overlap, near-duplicates are dropped, and the result is
+packed into a token budget with each source URL given once per page.
+"""
+
+import math
+import re
+from typing import Callable, Dict, List, Optional, Sequence, Set
+
+from src.rag.config.settings import (
+    CONTEXT_CHARS_PER_TOKEN,
+    CONTEXT_DUPLICATE_THRESHOLD,
+    CONTEXT_TOKEN_BUDGET,
+)
+
+# Overlaps shorter than this are treated as coincidence, not chunk overlap
+MIN_OVERLAP_CHARS = 16
+
+_WORD_PATTERN = re.compile(r"\w+")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the LLM token count of a text without a tokenizer.
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        int: Approximate token count
+    """
+    return math.ceil(len(text) / CONTEXT_CHARS_PER_TOKEN)
+
+
+def merge_overlapping(first: str, second: str) -> Optional[str]:
+    """
+    Join two consecutive chunks, keeping their shared text once.
+
+    Args:
+        first: Earlier chunk
+        second: Chunk that may start with the end of `first`
+
+    Returns:
+        Optional[str]: The merged text, or None if the chunks do not overlap
+    """
+    if second in first:
+        return first
+    for size in range(min(len(first), len(second)), MIN_OVERLAP_CHARS - 1, -1):
+        if first.endswith(second[:size]):
+            return first + second[size:]
+    return None
+
+
+def _shingles(text: str, size: int = 3) -> Set[tuple]:
+    words = _WORD_PATTERN.findall(text.lower())
+    if len(words) < size:
+        return {tuple(words)}
+    return {tuple(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def _is_near_duplicate(shingles: Set[tuple], kept: List[Set[tuple]], threshold: float) -> bool:
+    for other in kept:
+        overlap = len(shingles & other)
+        # Containment in either direction counts, so a chunk repeated inside a
+        # longer merged span is caught as well as an exact repeat
+        if overlap and overlap / min(len(shingles), len(other)) >= threshold:
+            return True
+    return False
+
+
+def assemble_context(
+    documents: Sequence[str],
+    metadatas: Sequence[Dict],
+    token_budget: int = CONTEXT_TOKEN_BUDGET,
+    duplicate_threshold: float = CONTEXT_DUPLICATE_THRESHOLD,
+    count_tokens: Callable[[str], int] = estimate_tokens
+) -> str:
+    """
+    Build the prompt context from retrieved chunks.
+
+    Chunks are merged into spans of consecutive `chunk_index` per
+    `source_url`, spans that mostly repeat an already chosen span are
+    dropped, and spans are taken in retrieval order until the budget is
+    spent. The chosen spans are then grouped by page under a single
+    "Source:" line.
+
+    Args:
+        documents: Chunk texts, most relevant first
+        metadatas: Chunk metadata with source_url and chunk_index
+        token_budget: Maximum tokens of context; 0 = unlimited
+        duplicate_threshold: Fraction of shared word 3-grams above which a
+            span is considered a near-duplicate
+        count_tokens: Token counter for the budget
+
+    Returns:
+        str: Context text for the prompt
+    """
+    # Runs of consecutive chunks per page; a run ranks as its best chunk
+    spans: List[Dict] = []
+    pages: Dict[str, List[Dict]] = {}
+    for rank, (document, metadata) in enumerate(zip(documents, metadatas)):
+        metadata = metadata or {}
+        source = metadata.get("source_url", "")
+        pages.setdefault(source, []).append({
+            "rank": rank,
+            "index": metadata.get("chunk_index", rank),
+            "text": document.strip(),
+        })
+    for source, chunks in pages.items():
+        chunks.sort(key=lambda chunk: chunk["index"])
+        span = None
+        for chunk in chunks:
+            merged = None
+            if span is not None and chunk["index"] <= span["last_index"] + 1:
+                merged = merge_overlapping(span["text"], chunk["text"])
+                if merged is None and chunk["index"] == span["last_index"] + 1:
+                    merged = span["text"] + " " + chunk["text"]
+            if merged is not None:
+                span["text"] = merged
+                span["last_index"] = chunk["index"]
+                span["rank"] = min(span["rank"], chunk["rank"])
+            else:
+                span = {"source": source, "rank": chunk["rank"], "last_index": chunk["index"], "text": chunk["text"]}
+                spans.append(span)
+
+    chosen: List[Dict] = []
+    kept_shingles: List[Set[tuple]] = []
+    used = 0
+    sources: Set[str] = set()
+    for span in sorted(spans, key=lambda span: span["rank"]):
+        shingles = _shingles(span["text"])
+        if _is_near_duplicate(shingles, kept_shingles, duplicate_threshold):
+            continue
+        cost = count_tokens(span["text"])
+        if span["source"] and span["source"] not in sources:
+            cost += count_tokens(f"Source: {span['source']}\n")
+        if token_budget and used + cost > token_budget:
+            continue
+        sources.add(span["source"])
+        chosen.append(span)
+        kept_shingles.append(shingles)
+        used += cost
+
+    # Pages in order of their best span; spans within a page in reading order
+    page_order: List[str] = []
+    for span in chosen:
+        if span["source"] not in page_order:
+            page_order.append(span["source"])
+    sections = []
+    for source in page_order:
+        texts = [span["text"] for span in sorted(chosen, key=lambda span: span["last_index"]) if span["source"] == source]
+        body = "\n...\n".join(texts)
+        sections.append(f"Source: {source}\n{body}" if source else body)
+    return "\n\n".join(sections)
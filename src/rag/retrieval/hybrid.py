@@ -0,0 +1,183 @@
+"""
+Hybrid retrieval module for the RAG system.
+Combines dense vector search with BM25 keyword search using weighted
+reciprocal rank fusion.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from src.rag.config.settings import (
+    DENSE_CANDIDATES,
+    DENSE_WEIGHT,
+    LEXICAL_CANDIDATES,
+    LEXICAL_WEIGHT,
+    RRF_K,
+)
+from src.rag.storage.filters import filter_mask
+from .bm25 import BM25Index
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[str]],
+    weights: Sequence[float],
+    k: int = RRF_K
+) -> List[Tuple[str, float]]:
+    """
+    Fuse ranked ID lists with weighted reciprocal rank fusion.
+
+    Each list contributes weight / (k + rank) to every ID it contains, so
+    documents ranked highly by several retrievers rise to the top.
+
+    Args:
+        rankings: Ranked ID lists, best first
+        weights: Weight of each ranking
+        k: Damping constant; larger values flatten the contribution of top ranks
+
+    Returns:
+        List of (id, fused score), best first; ties keep first-seen order
+    """
+    fused: Dict[str, float] = {}
+    for ranking, weight in zip(rankings, weights):
+        if not weight:
+            continue
+        for rank, doc_id in enumerate(ranking, start=1):
+            fused[doc_id] = fused.get(doc_id, 0.0) + weight / (k + rank)
+    return sorted(fused.items(), key=lambda item: -item[1])
+
+
+class HybridRetriever:
+    """Dense vector search fused with BM25 keyword search."""
+
+    def __init__(
+        self,
+        store: Any,
+        lexical_index: Optional[BM25Index] = None,
+        dense_k: int = DENSE_CANDIDATES,
+        lexical_k: int = LEXICAL_CANDIDATES,
+        dense_weight: float = DENSE_WEIGHT,
+        lexical_weight: float = LEXICAL_WEIGHT,
+        rrf_k: int = RRF_K
+    ):
+        """
+        Initialize the retriever.
+
+        Args:
+            store: Vector store with a RaysVectorStore-style query()
+            lexical_index: BM25 index over the same documents; dense-only when omitted
+            dense_k: Candidates taken from the vector store before fusion
+            lexical_k: Candidates taken from the BM25 index before fusion
+            dense_weight: Weight of the dense ranking in the fusion
+            lexical_weight: Weight of the BM25 ranking in the fusion
+            rrf_k: Reciprocal rank fusion damping constant
+        """
+        self.store = store
+        self.lexical_index = lexical_index
+        self.dense_k = dense_k
+        self.lexical_k = lexical_k
+        self.dense_weight = dense_weight
+        self.lexical_weight = lexical_weight
+        self.rrf_k = rrf_k
+
+    def retrieve_many(
+        self,
+        queries: List[str],
+        n_results: int = 4,
+        where: Optional[Dict] = None,
+        where_document: Optional[Dict] = None,
+        query_embeddings: Optional[Sequence[Sequence[float]]] = None
+    ) -> List[Dict[str, List]]:
+        """
+        Retrieve the documents that best match each of several queries,
+        with a single multi-query vector search.
+
+        Args:
+            queries: Query texts
+            n_results: Number of documents to return per query
+            where: Optional filter conditions for metadata
+            where_document: Optional filter conditions for documents
+            query_embeddings: Precomputed embeddings of the queries, so callers
+                that already embedded them avoid a second embedding call
+
+        Returns:
+            List of dicts with ids, documents, metadatas, fused scores, dense
+            distances (None for keyword-only matches), and BM25 query
+            coverage (None for dense-only matches), best first, in query order
+        """
+        if not queries:
+            return []
+        use_lexical = self.lexical_index is not None and self.lexical_weight > 0
+        dense_k = max(self.dense_k, n_results) if use_lexical else n_results
+        if query_embeddings is None:
+            dense = self.store.query(
+                query_texts=list(queries),
+                n_results=dense_k,
+                where=where,
+                where_document=where_document
+            )
+        else:
+            dense = self.store.query(
+                query_embeddings=list(query_embeddings),
+                n_results=dense_k,
+                where=where,
+                where_document=where_document
+            )
+        mask = None
+        if use_lexical:
+            mask = filter_mask(self.lexical_index.metadatas, self.lexical_index.documents, where, where_document)
+
+        results = []
+        for row, query in enumerate(queries):
+            records: Dict[str, Tuple[str, Dict]] = {
+                doc_id: (document, metadata)
+                for doc_id, document, metadata in zip(dense["ids"][row], dense["documents"][row], dense["metadatas"][row])
+            }
+            distances = dict(zip(dense["ids"][row], dense["distances"][row]))
+            coverage: Dict[str, float] = {}
+            rankings = [dense["ids"][row]]
+            weights = [self.dense_weight]
+
+            if use_lexical:
+                lexical = self.lexical_index.search(query, max(self.lexical_k, n_results), mask)
+                for doc_id, document, metadata in zip(lexical["ids"], lexical["documents"], lexical["metadatas"]):
+                    records.setdefault(doc_id, (document, metadata))
+                coverage = dict(zip(lexical["ids"], lexical["coverage"]))
+                rankings.append(lexical["ids"])
+                weights.append(self.lexical_weight)
+
+            fused = reciprocal_rank_fusion(rankings, weights, self.rrf_k)[:n_results]
+            results.append({
+                "ids": [doc_id for doc_id, _ in fused],
+                "documents": [records[doc_id][0] for doc_id, _ in fused],
+                "metadatas": [records[doc_id][1] for doc_id, _ in fused],
+                "scores": [score for _, score in fused],
+                "distances": [distances.get(doc_id) for doc_id, _ in fused],
+                "lexical_coverage": [coverage.get(doc_id) for doc_id, _ in fused],
+            })
+        return results
+
+    def retrieve(
+        self,
+        query: str,
+        n_results: int = 4,
+        where: Optional[Dict] = None,
+        where_document: Optional[Dict] = None,
+        query_embedding: Optional[Sequence[float]] = None
+    ) -> Dict[str, List]:
+        """
+        Retrieve the documents that best match a query.
+
+        Args:
+            query: Query text
+            n_results: Number of documents to return
+            where: Optional filter conditions for metadata
+            where_document: Optional filter conditions for documents
+            query_embedding: Precomputed embedding of the query, so callers that
+                already embedded it avoid a second embedding call
+
+        Returns:
+            Dict with ids, documents, metadatas, fused scores, dense distances
+            (None for keyword-only matches), and BM25 query coverage (None
+            for dense-only matches), best first
+        """
+        query_embeddings = None if query_embedding is None else [query_embedding]
+        return self.retrieve_many([query], n_results, where, where_document, query_embeddings)[0]
@@ -0,0 +1,29 @@
+"""
+Serving package for the RAG system.
+Provides process-wide shared resources for serving many concurrent sessions,
+the semantic answer cache, the query embedding and retrieval caches, latency
+metrics, the low-confidence fallback, and small-talk intent routing.
+"""
+
+from .registry import ResourceRegistry, shared_registry
+from .answer_cache import SemanticAnswerCache
+from .query_cache import LRUCache, normalize_query, retrieval_key
+from .metrics import LatencyMetrics
+from .fallback import calibrate_threshold, detect_language, fallback_answer, is_low_confidence
+from .intents import DEFAULT_INTENTS, IntentRouter
+
+__all__ = [
+    'ResourceRegistry',
+    'shared_registry',
+    'SemanticAnswerCache',
+    'LRUCache',
+    'normalize_query',
+    'retrieval_key',
+    'LatencyMetrics',
+    'calibrate_threshold',
+    'detect_language',
+    'fallback_answer',
+    'is_low_confidence',
+    'DEFAULT_INTENTS',
+    'IntentRouter',
+]
@@ -0,0 +1,165 @@
+"""
+Semantic answer cache module for the RAG system.
+Provides a thread-safe cache of generated answers keyed by question embedding,
+so paraphrases of an already-answered question skip retrieval and the LLM.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from src.rag.config.settings import (
+    ANSWER_CACHE_MAX_ENTRIES,
+    ANSWER_CACHE_SIMILARITY,
+    ANSWER_CACHE_TTL_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticAnswerCache:
+    """LRU + TTL cache of answers, looked up by cosine similarity of question embeddings."""
+
+    def __init__(
+        self,
+        similarity_threshold: float = ANSWER_CACHE_SIMILARITY,
+        max_entries: int = ANSWER_CACHE_MAX_ENTRIES,
+        ttl_seconds: float = ANSWER_CACHE_TTL_SECONDS
+    ):
+        """
+        Initialize an empty cache.
+
+        Args:
+            similarity_threshold: Minimum cosine similarity between a new
+                question and a cached one for the cached answer to be reused
+            max_entries: Maximum number of cached answers; the least recently
+                used entry is evicted beyond it
+            ttl_seconds: Age after which a cached answer is no longer served; 0 = never expires
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.similarity_threshold = similarity_threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.index_version: Optional[str] = None
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        # One embedding row per slot, allocated on first store
+        self._embeddings: Optional[np.ndarray] = None
+        self._occupied = np.zeros(max_entries, dtype=bool)
+        self._free_slots = list(range(max_entries - 1, -1, -1))
+        # slot -> (question, answer, created at), least recently used first
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _check_version_locked(self, index_version: Optional[str]) -> None:
+        """Drop every entry if the index has changed since they were cached."""
+        if index_version != self.index_version:
+            if self._entries:
+                logger.info("Index version changed (%s -> %s); clearing answer cache", self.index_version, index_version)
+            self._clear_locked()
+            self.index_version = index_version
+
+    def _clear_locked(self) -> None:
+        self._entries.clear()
+        self._occupied[:] = False
+        self._free_slots = list(range(self.max_entries - 1, -1, -1))
+
+    def _remove_locked(self, slot: int) -> None:
+        del self._entries[slot]
+        self._occupied[slot] = False
+        self._free_slots.append(slot)
+
+    @staticmethod
+    def _normalize(embedding: Any) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32).ravel()
+        return vector / max(float(np.linalg.norm(vector)), 1e-12)
+
+    def lookup(self, embedding: Any, index_version: Optional[str] = None) -> Optional[str]:
+        """
+        Find a cached answer for a question.
+
+        Args:
+            embedding: Embedding of the question
+            index_version: Version of the index the answer must come from
+
+        Returns:
+            Optional[str]: The cached answer of the most similar question
+            above the threshold, or None
+        """
+        query = self._normalize(embedding)
+        with self._lock:
+            self._check_version_locked(index_version)
+            if not self._entries or self._embeddings.shape[1] != len(query):
+                self.misses += 1
+                return None
+
+            scores = self._embeddings @ query
+            scores[~self._occupied] = -np.inf
+            slot = int(np.argmax(scores))
+            if scores[slot] < self.similarity_threshold:
+                self.misses += 1
+                return None
+            _, answer, created_at = self._entries[slot]
+            if self.ttl_seconds and time.time() - created_at > self.ttl_seconds:
+                self._remove_locked(slot)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(slot)
+            self.hits += 1
+            return answer
+
+    def store(self, embedding: Any, question: str, answer: str, index_version: Optional[str] = None) -> None:
+        """
+        Cache the answer to a question.
+
+        Args:
+            embedding: Embedding of the question
+            question: Question text, kept for inspection
+            answer: Generated answer
+            index_version: Version of the index the answer was generated from
+        """
+        vector = self._normalize(embedding)
+        with self._lock:
+            self._check_version_locked(index_version)
+            if self._embeddings is None or self._embeddings.shape[1] != len(vector):
+                self._embeddings = np.zeros((self.max_entries, len(vector)), dtype=np.float32)
+                self._clear_locked()
+
+            if not self._free_slots:
+                self._remove_locked(next(iter(self._entries)))
+            slot = self._free_slots.pop()
+            self._embeddings[slot] = vector
+            self._occupied[slot] = True
+            self._entries[slot] = (question, answer, time.time())
+
+    def clear(self) -> None:
+        """Remove every cached answer."""
+        with self._lock:
+            self._clear_locked()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dict containing entry count, limits, and hit/miss counters
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "similarity_threshold": self.similarity_threshold,
+                "ttl_seconds": self.ttl_seconds,
+                "index_version": self.index_version,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
@@ -0,0 +1,175 @@
+"""
+Low-confidence fallback module for the RAG system.
+Decides from retrieval distances when nothing in the index answers a question,
+builds a templated reply in the question's language with links to the closest
+pages, and calibrates the distance threshold from labelled questions.
+"""
+
+import re
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from src.rag.config.settings import FALLBACK_LEXICAL_COVERAGE, FALLBACK_LINKS
+
+_WORD_PATTERN = re.compile(r"\w+")
+
+# Common function words per language, enough to tell short questions apart
+LANGUAGE_MARKERS: Dict[str, frozenset] = {
+    "en": frozenset("the is are what where when how can i do does you to a an for of and in my there".split()),
+    "es": frozenset("el la los las es son qué que dónde donde cuándo cómo puedo hay un una para en y mi del al".split()),
+    "pt": frozenset("o os as é são onde quando como posso há tem um uma para em e meu do da dos das".split()),
+    "fr": frozenset("le les est sont quel quelle où quand comment je peux puis un une pour et mon des du il y".split()),
+    "de": frozenset("der die das ist sind wo wann wie kann ich ein eine und für mein gibt es im zum".split()),
+}
+
+FALLBACK_TEMPLATES: Dict[str, Dict[str, str]] = {
+    "en": {
+        "answer": "Sorry, I don't have information about that. I can help with Rays tickets, the ballpark, and game day experiences.",
+        "links": "These pages might help:",
+    },
+    "es": {
+        "answer": "Lo siento, no tengo información sobre eso. Puedo ayudarte con boletos de los Rays, el estadio y los días de juego.",
+        "links": "Estas páginas podrían ayudarte:",
+    },
+    "pt": {
+        "answer": "Desculpe, não tenho informações sobre isso. Posso ajudar com ingressos dos Rays, o estádio e os dias de jogo.",
+        "links": "Estas páginas podem ajudar:",
+    },
+    "fr": {
+        "answer": "Désolé, je n'ai pas d'information à ce sujet. Je peux vous aider avec les billets des Rays, le stade et les jours de match.",
+        "links": "Ces pages pourraient vous aider :",
+    },
+    "de": {
+        "answer": "Entschuldigung, dazu habe ich keine Informationen. Ich kann bei Rays-Tickets, dem Stadion und Spieltagen helfen.",
+        "links": "Diese Seiten könnten helfen:",
+    },
+}
+
+
+def detect_language(text: str) -> str:
+    """
+    Guess the language of a short question from its function words.
+
+    Args:
+        text: Question text
+
+    Returns:
+        str: Language code from LANGUAGE_MARKERS; "en" when nothing matches
+    """
+    words = _WORD_PATTERN.findall(text.lower())
+    best, best_hits = "en", 0
+    for language, markers in LANGUAGE_MARKERS.items():
+        hits = sum(word in markers for word in words)
+        if hits > best_hits:
+            best, best_hits = language, hits
+    return best
+
+
+def best_distance(distances: Sequence[Optional[float]]) -> Optional[float]:
+    """
+    Get the distance of the closest dense match.
+
+    Args:
+        distances: Distances of the retrieved results; None for keyword-only matches
+
+    Returns:
+        Optional[float]: Smallest known distance, or None if there is none
+    """
+    known = [distance for distance in distances if distance is not None]
+    return min(known) if known else None
+
+
+def is_low_confidence(
+    distances: Sequence[Optional[float]],
+    threshold: float,
+    lexical_coverage: Optional[Sequence[Optional[float]]] = None,
+    min_lexical_coverage: float = FALLBACK_LEXICAL_COVERAGE
+) -> bool:
+    """
+    Decide whether retrieval found nothing close enough to answer from.
+
+    Args:
+        distances: Distances of the retrieved results; None for keyword-only matches
+        threshold: Largest best-match distance that is still answered by the LLM
+        lexical_coverage: Share of the question's BM25 IDF weight found in
+            each result; None for results without a keyword match
+        min_lexical_coverage: Coverage of a keyword match strong enough to
+            answer from whatever the dense distance
+
+    Returns:
+        bool: True if nothing was retrieved, or no result is a strong
+        keyword match and the best dense match is beyond the threshold;
+        keyword-only results are trusted
+    """
+    if not distances:
+        return True
+    # Exact terms such as "Rays Rush" are what hybrid retrieval is for, even
+    # when the embedding model places the question far from the page
+    if any(coverage is not None and coverage >= min_lexical_coverage for coverage in lexical_coverage or []):
+        return False
+    best = best_distance(distances)
+    return best is not None and best > threshold
+
+
+def fallback_answer(question: str, results: Dict[str, List], max_links: int = FALLBACK_LINKS) -> str:
+    """
+    Build the reply for a question the index cannot answer.
+
+    Args:
+        question: Question text, used to pick the reply language
+        results: Retrieval results with metadatas and distances
+        max_links: Maximum number of page links to include
+
+    Returns:
+        str: Templated reply with links to the closest pages
+    """
+    template = FALLBACK_TEMPLATES[detect_language(question)]
+    distances = results.get("distances") or [None] * len(results["metadatas"])
+    # Closest first; keyword-only matches after every dense match
+    order = sorted(range(len(distances)), key=lambda i: (distances[i] is None, distances[i] or 0.0))
+    links: List[str] = []
+    for i in order:
+        url = (results["metadatas"][i] or {}).get("source_url")
+        if url and url not in links:
+            links.append(url)
+        if len(links) >= max_links:
+            break
+    if not links:
+        return template["answer"]
+    return template["answer"] + "\n\n" + template["links"] + "\n" + "\n".join(f"- {url}" for url in links)
+
+
+def calibrate_threshold(
+    answerable: Sequence[float],
+    unanswerable: Sequence[float],
+    max_false_fallback_rate: float = 0.02
+) -> Dict[str, float]:
+    """
+    Pick the fallback distance threshold from labelled questions.
+
+    The threshold is the smallest one that sends at most
+    `max_false_fallback_rate` of the answerable questions to the fallback,
+    which catches as many unanswerable questions as that allows.
+
+    Args:
+        answerable: Best-match distances of questions the index can answer
+        unanswerable: Best-match distances of off-topic or unanswerable questions
+        max_false_fallback_rate: Tolerated share of answerable questions that
+            get the fallback instead of an answer
+
+    Returns:
+        Dict with the threshold, the resulting false fallback rate on the
+        answerable questions, and the share of unanswerable questions caught
+    """
+    if not len(answerable):
+        raise ValueError("Calibration needs at least one answerable question")
+    answerable_sorted = np.sort(np.asarray(answerable, dtype=np.float64))[::-1]
+    allowed = int(np.floor(max_false_fallback_rate * len(answerable_sorted)))
+    threshold = float(answerable_sorted[min(allowed, len(answerable_sorted) - 1)])
+    unanswerable_array = np.asarray(unanswerable, dtype=np.float64)
+    return {
+        "threshold": threshold,
+        "false_fallback_rate": float(np.mean(answerable_sorted > threshold)),
+        "fallback_recall": float(np.mean(unanswerable_array > threshold)) if len(unanswerable_array) else 0.0,
+    }
@@ -0,0 +1,275 @@
+"""
+Intent routing module for the RAG system.
+Recognizes greetings, thanks, and questions about the assistant itself, so
+they get a canned reply in the user's language without retrieval or an LLM
+call, and calibrates the similarity threshold from labelled messages.
+"""
+
+import re
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.rag.config.settings import INTENT_MAX_WORDS, INTENT_SIMILARITY_THRESHOLD
+from .fallback import detect_language
+from .query_cache import normalize_query
+
+_WORD_PATTERN = re.compile(r"\w+")
+
+# Language of examples and replies given as a plain list or string
+DEFAULT_LANGUAGE = "en"
+
+# Intent name -> example messages and the reply given for it, per language
+DEFAULT_INTENTS: Dict[str, Dict[str, Any]] = {
+    "greeting": {
+        "examples": {
+            "en": [
+                "hi", "hello", "hey", "hey there", "hi there", "hello there", "howdy",
+                "good morning", "good afternoon", "good evening",
+            ],
+            "es": ["hola", "buenos dias", "buenos días", "buenas tardes", "buenas noches"],
+        },
+        "reply": {
+            "en": "Hi! I'm Robo Raymond. Ask me anything about Rays tickets, the ballpark, or game day.",
+            "es": "¡Hola! Soy Robo Raymond. Pregúntame lo que quieras sobre boletos de los Rays, el estadio o los días de juego.",
+        },
+    },
+    "thanks": {
+        "examples": {
+            "en": [
+                "thanks", "thank you", "thanks a lot", "thank you so much", "thx", "ty",
+                "appreciate it", "great thanks", "perfect thank you",
+            ],
+            "es": ["gracias", "muchas gracias", "mil gracias"],
+        },
+        "reply": {
+            "en": "You're welcome! Let me know if you have any other questions about the Rays.",
+            "es": "¡De nada! Avísame si tienes otras preguntas sobre los Rays.",
+        },
+    },
+    "goodbye": {
+        "examples": {
+            "en": ["bye", "goodbye", "see you", "see ya", "that's all", "have a good day"],
+            "es": ["adios", "adiós", "hasta luego", "chao"],
+        },
+        "reply": {
+            "en": "Thanks for chatting. Go Rays!",
+            "es": "Gracias por escribir. ¡Vamos Rays!",
+        },
+    },
+    "identity": {
+        "examples": {
+            "en": [
+                "who are you", "what are you", "what is your name", "what's your name",
+                "are you a bot", "are you human", "are you a real person", "who made you",
+            ],
+            "es": ["quién eres", "quien eres", "cómo te llamas", "como te llamas", "eres un bot"],
+        },
+        "reply": {
+            "en": (
+                "I'm Robo Raymond, a virtual assistant for the Tampa Bay Rays. "
+                "I answer questions using information from official Rays web pages."
+            ),
+            "es": (
+                "Soy Robo Raymond, un asistente virtual de los Tampa Bay Rays. "
+                "Respondo preguntas con información de las páginas oficiales de los Rays."
+            ),
+        },
+    },
+    "capabilities": {
+        "examples": {
+            "en": [
+                "help", "what can you do", "what can i ask you", "what can you help with",
+                "how does this work", "what do you know",
+            ],
+            "es": ["ayuda", "qué puedes hacer", "que puedes hacer", "en qué me puedes ayudar"],
+        },
+        "reply": {
+            "en": (
+                "I can help with ticket information and specials, stadium facilities and services, "
+                "parking, food, and game day experiences. What would you like to know?"
+            ),
+            "es": (
+                "Puedo ayudarte con boletos y ofertas, instalaciones y servicios del estadio, "
+                "estacionamiento, comida y los días de juego. ¿Qué te gustaría saber?"
+            ),
+        },
+    },
+}
+
+
+def _phrase_key(text: str) -> str:
+    return " ".join(_WORD_PATTERN.findall(normalize_query(text)))
+
+
+def _by_language(value: Any) -> Dict[str, Any]:
+    """Read a per-language dict, treating a plain list or string as DEFAULT_LANGUAGE."""
+    return value if isinstance(value, dict) else {DEFAULT_LANGUAGE: value}
+
+
+class IntentRouter:
+    """Routes small talk to canned replies by exact phrase, then optionally by nearest intent centroid."""
+
+    def __init__(
+        self,
+        intents: Optional[Dict[str, Dict[str, Any]]] = None,
+        embedding_function: Optional[Any] = None,
+        similarity_threshold: float = INTENT_SIMILARITY_THRESHOLD,
+        max_words: int = INTENT_MAX_WORDS
+    ):
+        """
+        Build the router.
+
+        Args:
+            intents: Intent name -> {"examples": ..., "reply": ...}, each either
+                per language ({"en": ..., "es": ...}) or plain English;
+                defaults to DEFAULT_INTENTS
+            embedding_function: Function that embeds queries for retrieval; when
+                given, each intent gets a centroid of its embedded examples
+            similarity_threshold: Minimum cosine similarity between a message
+                and an intent centroid to route it there; 0 = exact phrases only
+            max_words: Messages longer than this are never routed by similarity
+        """
+        self.intents = intents if intents is not None else DEFAULT_INTENTS
+        self.similarity_threshold = similarity_threshold
+        self.max_words = max_words
+
+        # Exact matches on the normalized message need no embedding at all, and
+        # tell the language to reply in
+        self.phrases: Dict[str, Tuple[str, str]] = {}
+        examples: Dict[str, List[str]] = {}
+        for name, intent in self.intents.items():
+            for language, texts in _by_language(intent["examples"]).items():
+                for example in texts:
+                    self.phrases[_phrase_key(example)] = (name, language)
+                examples.setdefault(name, []).extend(texts)
+
+        self.names: List[str] = list(self.intents)
+        self.centroids: Optional[np.ndarray] = None
+        if embedding_function is not None and self.names:
+            vectors = np.asarray(
+                embedding_function([text for name in self.names for text in examples[name]]),
+                dtype=np.float32
+            )
+            vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+            centroids = []
+            start = 0
+            for name in self.names:
+                count = len(examples[name])
+                centroids.append(vectors[start:start + count].mean(axis=0))
+                start += count
+            self.centroids = np.stack(centroids)
+            self.centroids /= np.maximum(np.linalg.norm(self.centroids, axis=1, keepdims=True), 1e-12)
+
+    def match_phrase(self, message: str) -> Optional[str]:
+        """
+        Find the intent of a message that is one of the examples.
+
+        Args:
+            message: User message
+
+        Returns:
+            Optional[str]: Intent name, or None if the message is not an example
+        """
+        match = self.phrases.get(_phrase_key(message))
+        return match[0] if match is not None else None
+
+    def nearest(self, message: str, query_embedding: Any) -> Optional[Tuple[str, float]]:
+        """
+        Find the intent centroid closest to a message, whatever the threshold.
+
+        Args:
+            message: User message
+            query_embedding: Embedding of the message
+
+        Returns:
+            Optional[Tuple[str, float]]: Intent name and cosine similarity, or
+            None if the message is too long or there are no centroids
+        """
+        if self.centroids is None or len(_phrase_key(message).split()) > self.max_words:
+            return None
+        query = np.asarray(query_embedding, dtype=np.float32).ravel()
+        if len(query) != self.centroids.shape[1]:
+            return None
+        similarities = self.centroids @ (query / max(float(np.linalg.norm(query)), 1e-12))
+        best = int(np.argmax(similarities))
+        return self.names[best], float(similarities[best])
+
+    def route(self, message: str, query_embedding: Optional[Any] = None) -> Optional[str]:
+        """
+        Find the intent of a message.
+
+        Args:
+            message: User message
+            query_embedding: Embedding of the message; without it, or with a
+                similarity threshold of 0, only exact phrases are matched
+
+        Returns:
+            Optional[str]: Intent name, or None if the message should go
+            through retrieval
+        """
+        intent = self.match_phrase(message)
+        if intent is not None or query_embedding is None or not self.similarity_threshold:
+            return intent
+        nearest = self.nearest(message, query_embedding)
+        if nearest is None or nearest[1] < self.similarity_threshold:
+            return None
+        return nearest[0]
+
+    def reply(self, intent: str, message: Optional[str] = None) -> str:
+        """
+        Get the canned reply of an intent.
+
+        Args:
+            intent: Intent name returned by `route`
+            message: The routed message; the reply is in its language when
+                the intent has one, else in DEFAULT_LANGUAGE
+
+        Returns:
+            str: Reply text
+        """
+        replies = _by_language(self.intents[intent]["reply"])
+        language = DEFAULT_LANGUAGE
+        if message is not None:
+            match = self.phrases.get(_phrase_key(message))
+            language = match[1] if match is not None else detect_language(message)
+        if language in replies:
+            return replies[language]
+        return replies.get(DEFAULT_LANGUAGE, next(iter(replies.values())))
+
+
+def calibrate_similarity_threshold(
+    small_talk: Sequence[float],
+    questions: Sequence[float],
+    max_false_route_rate: float = 0.0
+) -> Dict[str, float]:
+    """
+    Pick the centroid similarity threshold from labelled messages.
+
+    The threshold is the smallest one that routes at most
+    `max_false_route_rate` of the real questions to a canned reply, which
+    routes as much small talk as that allows.
+
+    Args:
+        small_talk: Best centroid similarities of small-talk messages
+        questions: Best centroid similarities of real questions
+        max_false_route_rate: Tolerated share of real questions that get a
+            canned reply instead of an answer
+
+    Returns:
+        Dict with the threshold, the resulting false route rate on the real
+        questions, and the share of small talk routed
+    """
+    if not len(questions):
+        raise ValueError("Calibration needs at least one real question")
+    questions_sorted = np.sort(np.asarray(questions, dtype=np.float64))[::-1]
+    allowed = int(np.floor(max_false_route_rate * len(questions_sorted)))
+    # Messages at the threshold are routed, so it must sit just above the
+    # most similar question that has to go through retrieval
+    threshold = float(np.nextafter(questions_sorted[min(allowed, len(questions_sorted) - 1)], np.inf))
+    small_talk_array = np.asarray(small_talk, dtype=np.float64)
+    return {
+        "threshold": threshold,
+        "false_route_rate": float(np.mean(questions_sorted >= threshold)),
+        "route_recall": float(np.mean(small_talk_array >= threshold)) if len(small_talk_array) else 0.0,
+    }
@@ -0,0 +1,62 @@
+"""
+Serving metrics module for the RAG system.
+Provides a thread-safe recorder of recent request latencies, such as time to
+first token, summarized as percentiles.
+"""
+
+import threading
+from collections import deque
+from typing import Deque, Dict
+
+import numpy as np
+
+from src.rag.config.settings import LATENCY_METRICS_WINDOW
+
+
+class LatencyMetrics:
+    """Rolling window of latency samples per metric name."""
+
+    def __init__(self, window: int = LATENCY_METRICS_WINDOW):
+        """
+        Initialize an empty recorder.
+
+        Args:
+            window: Number of most recent samples kept per metric
+        """
+        self.window = window
+        self._lock = threading.Lock()
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def record(self, name: str, seconds: float) -> None:
+        """
+        Record one latency sample.
+
+        Args:
+            name: Metric name, e.g. "time_to_first_token"
+            seconds: Measured latency in seconds
+        """
+        with self._lock:
+            samples = self._samples.setdefault(name, deque(maxlen=self.window))
+            samples.append(seconds)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Summarize the recorded latencies.
+
+        Returns:
+            Dict mapping each metric name to its sample count and last, mean,
+            p50, and p95 latency in milliseconds
+        """
+        with self._lock:
+            snapshot = {name: np.asarray(samples) * 1e3 for name, samples in self._samples.items()}
+        return {
+            name: {
+                "count": int(len(samples)),
+                "last_ms": float(samples[-1]),
+                "mean_ms": float(samples.mean()),
+                "p50_ms": float(np.percentile(samples, 50)),
+                "p95_ms": float(np.percentile(samples, 95)),
+            }
+            for name, samples in snapshot.items()
+            if len(samples)
+        }
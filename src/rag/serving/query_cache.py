@@ -0,0 +1,150 @@
+"""
+Query cache module for the RAG system.
+Provides size-bounded, index-versioned LRU caches for query embeddings and
+retrieval results, so repeated questions skip the embedding model and search.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+import numpy as np
+
+from src.rag.utils.hashing import normalize_text
+
+_TRAILING_PUNCTUATION = " ?!.,;:"
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize a query so trivially different phrasings share cache entries.
+
+    Args:
+        query: Query text
+
+    Returns:
+        str: Case-folded query with whitespace collapsed and trailing
+        punctuation removed, e.g. "  Where do I PARK?? " -> "where do i park"
+    """
+    return normalize_text(query).casefold().rstrip(_TRAILING_PUNCTUATION)
+
+
+def retrieval_key(
+    query_embedding: Any,
+    n_results: int,
+    where: Optional[Dict] = None,
+    where_document: Optional[Dict] = None
+) -> str:
+    """
+    Build the cache key of a retrieval request.
+
+    Args:
+        query_embedding: Query vector
+        n_results: Number of results requested
+        where: Metadata filter
+        where_document: Document filter
+
+    Returns:
+        str: Hex digest of the float32 vector bytes, k, and the canonical filters
+    """
+    digest = hashlib.blake2b(np.asarray(query_embedding, dtype=np.float32).tobytes(), digest_size=16)
+    digest.update(json.dumps([n_results, where, where_document], sort_keys=True, default=str).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class LRUCache:
+    """Thread-safe LRU cache with optional TTL, flushed when the index version changes."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float = 0):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_entries: Maximum number of entries; the least recently used is
+                evicted beyond it
+            ttl_seconds: Age after which an entry is no longer served; 0 = never expires
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.index_version: Optional[str] = None
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        # key -> (value, created at), least recently used first
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _check_version_locked(self, index_version: Optional[str]) -> None:
+        if index_version != self.index_version:
+            self._entries.clear()
+            self.index_version = index_version
+
+    def get(self, key: Hashable, index_version: Optional[str] = None) -> Optional[Any]:
+        """
+        Look up an entry.
+
+        Args:
+            key: Cache key
+            index_version: Version of the index the entry must come from
+
+        Returns:
+            The cached value, or None if absent or expired
+        """
+        with self._lock:
+            self._check_version_locked(index_version)
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl_seconds and time.time() - entry[1] > self.ttl_seconds:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any, index_version: Optional[str] = None) -> None:
+        """
+        Store an entry, evicting the least recently used one if full.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+            index_version: Version of the index the value was computed from
+        """
+        with self._lock:
+            self._check_version_locked(index_version)
+            self._entries[key] = (value, time.time())
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dict containing entry count, limits, and hit/miss counters
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "index_version": self.index_version,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
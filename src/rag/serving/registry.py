@@ -0,0 +1,85 @@
+"""
+Shared resource registry module for the RAG system.
+Provides a thread-safe, process-wide registry so expensive resources such as
+embedding models, vector collections, and LLM clients are built once and
+shared by every session in a server process.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, List, TypeVar
+
+T = TypeVar("T")
+
+
+class ResourceRegistry:
+    """Thread-safe registry of named, lazily built, process-wide resources."""
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._resources: Dict[str, Any] = {}
+        self._build_seconds: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+
+    def get(self, name: str, factory: Callable[[], T]) -> T:
+        """
+        Get a resource, building it with `factory` on first use.
+
+        Concurrent callers asking for the same resource wait for a single
+        build instead of each building their own copy. Builds of different
+        resources do not block each other.
+
+        Args:
+            name: Resource name
+            factory: Zero-argument callable that builds the resource
+
+        Returns:
+            The shared resource
+        """
+        # Fast path once the resource exists; dict reads are atomic
+        if name in self._resources:
+            return self._resources[name]
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(name, threading.Lock())
+        with key_lock:
+            if name not in self._resources:
+                start = time.perf_counter()
+                resource = factory()
+                self._build_seconds[name] = time.perf_counter() - start
+                self._resources[name] = resource
+                print(f"Built shared resource '{name}' in {self._build_seconds[name]:.2f}s")
+        return self._resources[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._resources
+
+    def names(self) -> List[str]:
+        """
+        Get the names of the resources built so far.
+
+        Returns:
+            List[str]: Resource names
+        """
+        return list(self._resources)
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Get how long each resource took to build.
+
+        Returns:
+            Dict[str, float]: Build time in seconds per resource
+        """
+        return dict(self._build_seconds)
+
+    def clear(self) -> None:
+        """Drop every resource so the next `get` rebuilds it."""
+        with self._lock:
+            self._resources.clear()
+            self._build_seconds.clear()
+            self._key_locks.clear()
+
+
+# The registry shared by everything in this process
+shared_registry = ResourceRegistry()
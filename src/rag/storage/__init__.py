@@ -3,8 +3,27 @@ Storage package for the RAG system.
 Provides functionality to store and retrieve content using vector databases.
 """
 
-from .vectorstore import RaysVectorStore
+from typing import TYPE_CHECKING
+
+from src.rag.utils.lazy import lazy_exports
+
+# chromadb is only imported once a vector store is actually used
+__getattr__, __dir__ = lazy_exports(__name__, {
+    'RaysVectorStore': '.vectorstore',
+    'IndexSnapshot': '.snapshot',
+    'QuantizedVectorStore': '.quantized',
+    'NumpyVectorStore': '.numpy_store',
+})
+
+if TYPE_CHECKING:
+    from .vectorstore import RaysVectorStore
+    from .snapshot import IndexSnapshot
+    from .quantized import QuantizedVectorStore
+    from .numpy_store import NumpyVectorStore
 
 __all__ = [
     'RaysVectorStore',
+    'IndexSnapshot',
+    'QuantizedVectorStore',
+    'NumpyVectorStore',
 ]
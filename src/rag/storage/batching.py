@@ -0,0 +1,64 @@
+"""
+Batching utilities module for the RAG system.
+Provides throughput-oriented helpers for embedding and writing documents in batches.
+"""
+
+import time
+from typing import Any, Iterator, List, Sequence, Tuple
+
+
+def length_sorted_batches(documents: Sequence[str], batch_size: int) -> List[List[int]]:
+    """
+    Group document indices into batches of similar length.
+
+    Transformer batches are padded to their longest member, so sorting by
+    length before batching keeps padding (and wasted compute) to a minimum.
+
+    Args:
+        documents: Documents to batch
+        batch_size: Maximum number of documents per batch
+
+    Returns:
+        List[List[int]]: Batches of indices into `documents`, longest first
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+    order = sorted(range(len(documents)), key=lambda i: len(documents[i]), reverse=True)
+    return [order[start:start + batch_size] for start in range(0, len(order), batch_size)]
+
+
+def iter_embedding_batches(
+    embedding_function: Any,
+    documents: Sequence[str],
+    batch_size: int
+) -> Iterator[Tuple[List[int], List[Any], float]]:
+    """
+    Embed documents in length-sorted batches.
+
+    Args:
+        embedding_function: Chroma-compatible embedding function
+        documents: Documents to embed
+        batch_size: Maximum number of documents per forward pass
+
+    Yields:
+        Tuple of (indices into `documents`, their embeddings, seconds taken)
+    """
+    for indices in length_sorted_batches(documents, batch_size):
+        start = time.perf_counter()
+        embeddings = embedding_function([documents[i] for i in indices])
+        yield indices, list(embeddings), time.perf_counter() - start
+
+
+def split_batches(items: Sequence[Any], max_size: int) -> Iterator[Sequence[Any]]:
+    """
+    Split a sequence into consecutive slices of at most `max_size` items.
+
+    Args:
+        items: Sequence to split
+        max_size: Maximum slice length
+
+    Yields:
+        Sequence slices in order
+    """
+    for start in range(0, len(items), max_size):
+        yield items[start:start + max_size]
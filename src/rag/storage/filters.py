@@ -0,0 +1,114 @@
+"""
+Metadata filter module for the RAG system.
+Evaluates Chroma-style `where` and `where_document` filters in process, for
+vector stores that search their own arrays instead of a Chroma collection.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+_COMPARISONS = {
+    "$eq": lambda value, target: value == target,
+    "$ne": lambda value, target: value != target,
+    "$gt": lambda value, target: value is not None and value > target,
+    "$gte": lambda value, target: value is not None and value >= target,
+    "$lt": lambda value, target: value is not None and value < target,
+    "$lte": lambda value, target: value is not None and value <= target,
+    "$in": lambda value, target: value in target,
+    "$nin": lambda value, target: value not in target,
+}
+
+
+def matches_where(metadata: Optional[Dict[str, Any]], where: Dict[str, Any]) -> bool:
+    """
+    Check a metadata dictionary against a Chroma `where` filter.
+
+    Supports field equality, the comparison operators ($eq, $ne, $gt, $gte,
+    $lt, $lte, $in, $nin), and $and / $or.
+
+    Args:
+        metadata: Document metadata
+        where: Filter, e.g. {"source_url": url} or {"$and": [...]}
+
+    Returns:
+        bool: True if the document passes the filter
+    """
+    metadata = metadata or {}
+    for key, condition in where.items():
+        if key == "$and":
+            if not all(matches_where(metadata, clause) for clause in condition):
+                return False
+        elif key == "$or":
+            if not any(matches_where(metadata, clause) for clause in condition):
+                return False
+        elif isinstance(condition, dict):
+            value = metadata.get(key)
+            for operator, target in condition.items():
+                if operator not in _COMPARISONS:
+                    raise ValueError(f"Unsupported where operator {operator!r}")
+                if not _COMPARISONS[operator](value, target):
+                    return False
+        elif metadata.get(key) != condition:
+            return False
+    return True
+
+
+def matches_where_document(document: str, where_document: Dict[str, Any]) -> bool:
+    """
+    Check a document's text against a Chroma `where_document` filter.
+
+    Supports $contains, $not_contains, $and and $or.
+
+    Args:
+        document: Document text
+        where_document: Filter, e.g. {"$contains": "parking"}
+
+    Returns:
+        bool: True if the document passes the filter
+    """
+    for operator, target in where_document.items():
+        if operator == "$contains":
+            if target not in document:
+                return False
+        elif operator == "$not_contains":
+            if target in document:
+                return False
+        elif operator == "$and":
+            if not all(matches_where_document(document, clause) for clause in target):
+                return False
+        elif operator == "$or":
+            if not any(matches_where_document(document, clause) for clause in target):
+                return False
+        else:
+            raise ValueError(f"Unsupported where_document operator {operator!r}")
+    return True
+
+
+def filter_mask(
+    metadatas: Sequence[Optional[Dict[str, Any]]],
+    documents: Sequence[str],
+    where: Optional[Dict[str, Any]] = None,
+    where_document: Optional[Dict[str, Any]] = None
+) -> Optional[np.ndarray]:
+    """
+    Evaluate filters over a whole store.
+
+    Args:
+        metadatas: Metadata of every stored document
+        documents: Text of every stored document
+        where: Optional metadata filter
+        where_document: Optional document text filter
+
+    Returns:
+        Optional[np.ndarray]: Boolean mask of passing rows, or None when there is no filter
+    """
+    if not where and not where_document:
+        return None
+    keep: List[bool] = []
+    for metadata, document in zip(metadatas, documents):
+        keep.append(
+            (not where or matches_where(metadata, where))
+            and (not where_document or matches_where_document(document, where_document))
+        )
+    return np.asarray(keep, dtype=bool)
@@ -0,0 +1,280 @@
+"""
+Exact in-process vector store module for the RAG system.
+Provides a brute-force store that keeps normalized embeddings in one
+contiguous NumPy matrix, and moves to a Chroma HNSW collection once the
+corpus grows past a size threshold.
+"""
+
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from src.rag.config.settings import EMBEDDING_BATCH_SIZE, EXACT_SEARCH_MAX_DOCUMENTS
+from .batching import iter_embedding_batches, split_batches
+from .filters import filter_mask
+
+
+class NumpyVectorStore:
+    """Exact cosine search over a contiguous embedding matrix."""
+
+    def __init__(
+        self,
+        collection_name: str,
+        embedding_function: Any,
+        embedding_batch_size: int = EMBEDDING_BATCH_SIZE,
+        max_exact_documents: int = EXACT_SEARCH_MAX_DOCUMENTS
+    ):
+        """
+        Initialize the vector store.
+
+        Args:
+            collection_name: Name of the collection, also used for the HNSW collection
+            embedding_function: Chroma embedding function for documents and query texts
+            embedding_batch_size: Documents per embedding forward pass in add_documents
+            max_exact_documents: Above this many documents the store moves its
+                vectors into a Chroma HNSW collection; 0 never switches
+        """
+        self.collection_name = collection_name
+        self.embedding_function = embedding_function
+        self.embedding_batch_size = embedding_batch_size
+        self.max_exact_documents = max_exact_documents
+
+        self.ids: List[str] = []
+        self.documents: List[str] = []
+        self.metadatas: List[Dict] = []
+        self._matrix = np.empty((0, 0), dtype=np.float32)
+        self._id_set = set()
+        self._client = None
+        self.hnsw_collection = None
+
+    @property
+    def uses_hnsw(self) -> bool:
+        """Whether queries are served by the Chroma HNSW collection."""
+        return self.hnsw_collection is not None
+
+    @property
+    def embeddings(self) -> np.ndarray:
+        """(count, dim) view of the stored unit vectors."""
+        return self._matrix[:len(self.ids)]
+
+    def count(self) -> int:
+        """Number of stored documents."""
+        return self.hnsw_collection.count() if self.uses_hnsw else len(self.ids)
+
+    def add_documents(
+        self,
+        documents: List[str],
+        metadatas: Optional[List[Dict]] = None,
+        ids: Optional[List[str]] = None,
+        batch_size: Optional[int] = None
+    ) -> None:
+        """
+        Embed documents and add them to the store.
+
+        Args:
+            documents: List of text documents to add
+            metadatas: Optional list of metadata dictionaries
+            ids: Optional list of document IDs
+            batch_size: Documents per embedding forward pass; defaults to
+                the store's embedding_batch_size
+        """
+        if not documents:
+            return
+        if not ids:
+            ids = [f"doc_{self.count() + i}" for i in range(len(documents))]
+        if not metadatas:
+            metadatas = [{} for _ in documents]
+        if len(documents) != len(metadatas) or len(documents) != len(ids):
+            raise ValueError("Length mismatch between documents, metadatas, and ids")
+
+        start = time.perf_counter()
+        embeddings: List[Any] = [None] * len(documents)
+        batches = iter_embedding_batches(self.embedding_function, documents, batch_size or self.embedding_batch_size)
+        for indices, batch_embeddings, _ in batches:
+            for index, embedding in zip(indices, batch_embeddings):
+                embeddings[index] = embedding
+        self.add_embeddings(ids, embeddings, documents, metadatas)
+        total = time.perf_counter() - start
+        print(
+            f"Added {len(documents)} documents to vector store for {self.collection_name} "
+            f"in {total:.2f}s ({len(documents) / max(total, 1e-9):.1f} docs/sec)"
+        )
+
+    def add_embeddings(
+        self,
+        ids: Sequence[str],
+        embeddings: Any,
+        documents: Sequence[str],
+        metadatas: Sequence[Dict]
+    ) -> int:
+        """
+        Add precomputed embeddings, e.g. from an index snapshot.
+
+        Vectors are normalized for cosine search. IDs already in the store,
+        and repeats of an ID within `ids`, are skipped.
+
+        Args:
+            ids: Document IDs
+            embeddings: (n, dim) embeddings
+            documents: Document texts
+            metadatas: Document metadata dictionaries
+
+        Returns:
+            int: Number of documents added
+        """
+        keep = []
+        batch_ids = set()
+        for i, doc_id in enumerate(ids):
+            # The first occurrence of a repeated ID wins
+            if doc_id not in self._id_set and doc_id not in batch_ids:
+                batch_ids.add(doc_id)
+                keep.append(i)
+        if not keep:
+            return 0
+        vectors = np.asarray(embeddings, dtype=np.float32)[keep]
+        vectors /= np.clip(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12, None)
+        new_ids = [ids[i] for i in keep]
+        new_documents = [documents[i] for i in keep]
+        new_metadatas = [metadatas[i] for i in keep]
+        self._id_set.update(new_ids)
+
+        if self.uses_hnsw:
+            self._add_to_hnsw(new_ids, vectors, new_documents, new_metadatas)
+            return len(keep)
+
+        count = len(self.ids)
+        if self._matrix.shape[1] not in (0, vectors.shape[1]):
+            raise ValueError(f"Expected {self._matrix.shape[1]}-dim embeddings, got {vectors.shape[1]}")
+        if count + len(vectors) > len(self._matrix):
+            # Grow geometrically so repeated adds stay amortized O(n)
+            grown = np.empty((max(count + len(vectors), 2 * len(self._matrix)), vectors.shape[1]), dtype=np.float32)
+            if count:
+                grown[:count] = self._matrix[:count]
+            self._matrix = grown
+        self._matrix[count:count + len(vectors)] = vectors
+        self.ids.extend(new_ids)
+        self.documents.extend(new_documents)
+        self.metadatas.extend(new_metadatas)
+
+        if self.max_exact_documents and len(self.ids) > self.max_exact_documents:
+            self._switch_to_hnsw()
+        return len(keep)
+
+    def _switch_to_hnsw(self) -> None:
+        """Move every stored vector into a Chroma HNSW collection."""
+        import chromadb
+
+        print(
+            f"{self.collection_name} has {len(self.ids)} documents (> {self.max_exact_documents}); "
+            f"switching from exact search to HNSW"
+        )
+        self._client = chromadb.EphemeralClient()
+        # Ephemeral clients share one in-memory database per process
+        self.hnsw_collection = self._client.create_collection(
+            name=f"{self.collection_name}-{uuid.uuid4().hex[:8]}",
+            embedding_function=self.embedding_function,
+            metadata={"hnsw:space": "cosine"}
+        )
+        self._add_to_hnsw(self.ids, self.embeddings, self.documents, self.metadatas)
+        self.ids, self.documents, self.metadatas = [], [], []
+        self._matrix = np.empty((0, 0), dtype=np.float32)
+
+    def _add_to_hnsw(self, ids: List[str], vectors: np.ndarray, documents: List[str], metadatas: List[Dict]) -> None:
+        """Write records to the HNSW collection below Chroma's maximum batch size."""
+        for batch in split_batches(range(len(ids)), self._client.get_max_batch_size()):
+            self.hnsw_collection.add(
+                ids=[ids[i] for i in batch],
+                embeddings=vectors[batch.start:batch.stop].tolist(),
+                documents=[documents[i] for i in batch],
+                metadatas=[metadatas[i] or None for i in batch]
+            )
+
+    def query(
+        self,
+        query_texts: Optional[List[str]] = None,
+        n_results: int = 3,
+        where: Optional[Dict] = None,
+        where_document: Optional[Dict] = None,
+        query_embeddings: Optional[Any] = None
+    ) -> Dict[str, List]:
+        """
+        Query the vector store for similar documents.
+
+        All queries are answered together with one matrix product.
+
+        Args:
+            query_texts: List of query strings
+            n_results: Number of results to return per query
+            where: Optional filter conditions for metadata
+            where_document: Optional filter conditions for documents
+            query_embeddings: Precomputed query embeddings, instead of query_texts
+
+        Returns:
+            Dict containing ids, documents, metadatas, and cosine distances,
+            one list per query as returned by RaysVectorStore.query
+        """
+        if query_embeddings is None:
+            from src.rag.embeddings.cache import uncached
+
+            # Queries skip the on-disk embedding cache, which is for ingest
+            query_embeddings = uncached(self.embedding_function)(query_texts)
+        queries = np.atleast_2d(np.asarray(query_embeddings, dtype=np.float32))
+
+        if self.uses_hnsw:
+            return self.hnsw_collection.query(
+                query_embeddings=queries.tolist(),
+                n_results=n_results,
+                where=where,
+                where_document=where_document,
+                include=['documents', 'metadatas', 'distances']
+            )
+
+        results: Dict[str, List] = {"ids": [], "documents": [], "metadatas": [], "distances": []}
+        if not self.ids:
+            for values in results.values():
+                values.extend([] for _ in queries)
+            return results
+
+        queries = queries / np.clip(np.linalg.norm(queries, axis=1, keepdims=True), 1e-12, None)
+        scores = queries @ self.embeddings.T
+        mask = filter_mask(self.metadatas, self.documents, where, where_document)
+        available = len(self.ids)
+        if mask is not None:
+            scores[:, ~mask] = -np.inf
+            available = int(mask.sum())
+        k = min(n_results, available)
+
+        if k == 0:
+            top = np.empty((len(queries), 0), dtype=np.int64)
+        elif k < len(self.ids):
+            # k <= number of rows passing the filter, so no filtered row is picked
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        else:
+            top = np.tile(np.arange(len(self.ids)), (len(queries), 1))
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind="stable")
+        top = np.take_along_axis(top, order, axis=1)
+        distances = 1.0 - np.take_along_axis(top_scores, order, axis=1)
+
+        for rows, row_distances in zip(top, distances):
+            results["ids"].append([self.ids[i] for i in rows])
+            results["documents"].append([self.documents[i] for i in rows])
+            results["metadatas"].append([self.metadatas[i] for i in rows])
+            results["distances"].append(row_distances.tolist())
+        return results
+
+    def get_collection_stats(self) -> Dict[str, Any]:
+        """
+        Get statistics about the store.
+
+        Returns:
+            Dict containing the document count, search mode, and matrix size
+        """
+        return {
+            "name": self.collection_name,
+            "count": self.count(),
+            "search": "hnsw" if self.uses_hnsw else "exact",
+            "matrix_bytes": int(self.embeddings.nbytes),
+        }
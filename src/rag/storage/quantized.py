@@ -0,0 +1,413 @@
+"""
+Quantized vector store module for the RAG system.
+Provides a vector store that keeps int8 scalar-quantized codes in memory for
+the first-pass search and rescores a short candidate list with full-precision
+vectors kept on disk.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import time
+import weakref
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from src.rag.config.settings import EMBEDDING_BATCH_SIZE
+from .batching import iter_embedding_batches
+from .filters import filter_mask
+
+# Candidates per requested result that are rescored at full precision
+DEFAULT_RESCORE_FACTOR = 4
+
+# Rows dequantized per step of the scan; small enough to stay in cache
+SCAN_BLOCK_ROWS = 256
+
+# Records are written last and are the commit point: they fix how many rows of
+# the vectors and codes files belong to the store
+VECTORS_FILE = "vectors.f32"
+CODES_FILE = "codes.npz"
+RECORDS_FILE = "records.json"
+
+
+class ScalarQuantizer:
+    """Per-dimension affine int8 quantizer: x ~= offset + scale * (code + 128)."""
+
+    def __init__(self, offset: np.ndarray, scale: np.ndarray):
+        """
+        Initialize from fitted parameters; use `ScalarQuantizer.fit` to fit them.
+
+        Args:
+            offset: (dim,) minimum of each dimension
+            scale: (dim,) step between adjacent codes in each dimension
+        """
+        self.offset = np.asarray(offset, dtype=np.float32)
+        self.scale = np.asarray(scale, dtype=np.float32)
+
+    @classmethod
+    def fit(cls, vectors: np.ndarray) -> "ScalarQuantizer":
+        """
+        Fit the per-dimension range to a set of vectors.
+
+        Args:
+            vectors: (n, dim) float vectors
+
+        Returns:
+            ScalarQuantizer: Quantizer covering the vectors' range
+        """
+        low = vectors.min(axis=0)
+        high = vectors.max(axis=0)
+        return cls(low, np.maximum(high - low, 1e-12) / 255.0)
+
+    def covers(self, vectors: np.ndarray) -> bool:
+        """Whether every value of `vectors` is inside the quantizer's range."""
+        high = self.offset + 255.0 * self.scale
+        return bool(np.all(vectors >= self.offset) and np.all(vectors <= high))
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        """
+        Quantize vectors to int8 codes, clipping values outside the range.
+
+        Args:
+            vectors: (n, dim) float vectors
+
+        Returns:
+            np.ndarray: (n, dim) int8 codes
+        """
+        codes = np.rint((vectors - self.offset) / self.scale) - 128.0
+        return np.clip(codes, -128, 127).astype(np.int8)
+
+    def scores(self, codes: np.ndarray, queries: np.ndarray) -> np.ndarray:
+        """
+        Approximate inner products between float queries and quantized vectors.
+
+        Queries stay at full precision; the affine terms are folded into a
+        per-query weight vector and bias, so the scan is one float product
+        over dequantized blocks of codes.
+
+        Args:
+            codes: (n, dim) int8 codes
+            queries: (m, dim) float32 queries
+
+        Returns:
+            np.ndarray: (m, n) approximate scores
+        """
+        weights = np.ascontiguousarray((queries * self.scale).T, dtype=np.float32)
+        bias = queries @ self.offset + 128.0 * weights.sum(axis=0)
+        scores = np.empty((len(codes), len(queries)), dtype=np.float32)
+        block = np.empty((min(SCAN_BLOCK_ROWS, len(codes)), codes.shape[1]), dtype=np.float32)
+        for start in range(0, len(codes), SCAN_BLOCK_ROWS):
+            rows = codes[start:start + SCAN_BLOCK_ROWS]
+            buffer = block[:len(rows)]
+            np.copyto(buffer, rows, casting="unsafe")
+            np.matmul(buffer, weights, out=scores[start:start + len(rows)])
+        return scores.T + bias[:, None]
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """Scale each row to unit length."""
+    return matrix / np.clip(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12, None)
+
+
+class QuantizedVectorStore:
+    """Vector store with int8 codes in memory and float32 vectors on disk."""
+
+    def __init__(
+        self,
+        collection_name: str,
+        persist_dir: Optional[str] = None,
+        embedding_function: Optional[Any] = None,
+        embedding_batch_size: int = EMBEDDING_BATCH_SIZE,
+        rescore_factor: int = DEFAULT_RESCORE_FACTOR
+    ):
+        """
+        Initialize the vector store.
+
+        Args:
+            collection_name: Name of the collection to use
+            persist_dir: Optional directory for a persistent store; a
+                temporary directory holds the full-precision vectors otherwise
+            embedding_function: Optional Chroma embedding function; defaults to
+                the same model as RaysVectorStore
+            embedding_batch_size: Documents per embedding forward pass in add_documents
+            rescore_factor: Candidates per requested result that are rescored
+                with full-precision vectors
+        """
+        self.collection_name = collection_name
+        self.embedding_batch_size = embedding_batch_size
+        self.rescore_factor = rescore_factor
+        if embedding_function is None:
+            from src.rag.embeddings.backends import create_embedding_backend, embedding_model_id
+            from src.rag.embeddings.cache import cached_embedding_function
+            from .vectorstore import DEFAULT_EMBEDDING_MODEL
+
+            embedding_function = cached_embedding_function(
+                create_embedding_backend(DEFAULT_EMBEDDING_MODEL),
+                model_name=embedding_model_id(DEFAULT_EMBEDDING_MODEL)
+            )
+        self.embedding_function = embedding_function
+
+        self.persistent = persist_dir is not None
+        if self.persistent:
+            self.path = Path(persist_dir) / collection_name
+            self.path.mkdir(parents=True, exist_ok=True)
+        else:
+            self.path = Path(tempfile.mkdtemp(prefix=f"{collection_name}."))
+            weakref.finalize(self, shutil.rmtree, str(self.path), True)
+
+        self.ids: List[str] = []
+        self.documents: List[str] = []
+        self.metadatas: List[Dict] = []
+        self.codes = np.empty((0, 0), dtype=np.int8)
+        self.quantizer: Optional[ScalarQuantizer] = None
+        self._vectors: Optional[np.memmap] = None
+        if self.persistent and (self.path / RECORDS_FILE).is_file():
+            self._load()
+
+    @property
+    def dimension(self) -> int:
+        return self.codes.shape[1] if len(self.codes) else 0
+
+    def count(self) -> int:
+        """Number of stored documents."""
+        return len(self.ids)
+
+    def _load(self) -> None:
+        """Read a persisted store from disk."""
+        with open(self.path / RECORDS_FILE, "r", encoding="utf-8") as f:
+            records = json.load(f)
+        self.ids, self.documents, self.metadatas = records["ids"], records["documents"], records["metadatas"]
+        with np.load(self.path / CODES_FILE) as data:
+            # Codes may run ahead of the records if a save was interrupted; the
+            # leading rows are still valid under the stored quantizer
+            self.codes = data["codes"][:len(self.ids)]
+            self.quantizer = ScalarQuantizer(data["offset"], data["scale"])
+        self._open_vectors(self.codes.shape[1])
+        print(f"Using existing quantized collection: {self.collection_name} ({len(self.ids)} documents)")
+
+    def _replace_file(self, name: str, write) -> None:
+        """Write a file under a temporary name and atomically move it into place."""
+        tmp_path = self.path / f".{name}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                write(f)
+            os.replace(tmp_path, self.path / name)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+    def _save(self) -> None:
+        """Atomically write codes with their quantizer, then the records."""
+        self._replace_file(CODES_FILE, lambda f: np.savez(
+            f, codes=self.codes, offset=self.quantizer.offset, scale=self.quantizer.scale
+        ))
+        self._replace_file(RECORDS_FILE, lambda f: f.write(json.dumps(
+            {"ids": self.ids, "documents": self.documents, "metadatas": self.metadatas}
+        ).encode("utf-8")))
+
+    def _write_vectors(self, vectors: np.ndarray) -> None:
+        """Write new vectors right after the last committed row."""
+        path = self.path / VECTORS_FILE
+        with open(path, "r+b" if path.exists() else "wb") as f:
+            # Rows past the records are left over from an interrupted save
+            f.seek(len(self.ids) * vectors.shape[1] * vectors.itemsize)
+            f.write(vectors.tobytes())
+            f.truncate()
+
+    def _open_vectors(self, dimension: int) -> None:
+        """Memory-map the full-precision vectors file."""
+        self._vectors = np.memmap(
+            self.path / VECTORS_FILE, dtype=np.float32, mode="r", shape=(len(self.ids), dimension)
+        )
+
+    def add_documents(
+        self,
+        documents: List[str],
+        metadatas: Optional[List[Dict]] = None,
+        ids: Optional[List[str]] = None,
+        batch_size: Optional[int] = None
+    ) -> None:
+        """
+        Embed documents and add them to the store.
+
+        Args:
+            documents: List of text documents to add
+            metadatas: Optional list of metadata dictionaries
+            ids: Optional list of document IDs
+            batch_size: Documents per embedding forward pass; defaults to
+                the store's embedding_batch_size
+        """
+        if not documents:
+            return
+        if not ids:
+            ids = [f"doc_{len(self.ids) + i}" for i in range(len(documents))]
+        if not metadatas:
+            metadatas = [{} for _ in documents]
+        if len(documents) != len(metadatas) or len(documents) != len(ids):
+            raise ValueError("Length mismatch between documents, metadatas, and ids")
+
+        start = time.perf_counter()
+        embeddings: List[Any] = [None] * len(documents)
+        batches = iter_embedding_batches(self.embedding_function, documents, batch_size or self.embedding_batch_size)
+        for indices, batch_embeddings, _ in batches:
+            for index, embedding in zip(indices, batch_embeddings):
+                embeddings[index] = embedding
+        self.add_embeddings(ids, embeddings, documents, metadatas)
+        total = time.perf_counter() - start
+        print(
+            f"Added {len(documents)} documents to quantized store for {self.collection_name} "
+            f"in {total:.2f}s ({len(documents) / max(total, 1e-9):.1f} docs/sec)"
+        )
+
+    def add_embeddings(
+        self,
+        ids: Sequence[str],
+        embeddings: Any,
+        documents: Sequence[str],
+        metadatas: Sequence[Dict]
+    ) -> int:
+        """
+        Add precomputed embeddings, e.g. from an index snapshot.
+
+        Vectors are normalized for cosine search. IDs already in the store,
+        and repeats of an ID within `ids`, are skipped. When new vectors fall
+        outside the quantizer's range, it is refitted and every code is
+        re-derived from the full-precision vectors.
+
+        Args:
+            ids: Document IDs
+            embeddings: (n, dim) embeddings
+            documents: Document texts
+            metadatas: Document metadata dictionaries
+
+        Returns:
+            int: Number of documents added
+        """
+        known = set(self.ids)
+        keep = []
+        for i, doc_id in enumerate(ids):
+            # The first occurrence of an ID repeated within `ids` wins
+            if doc_id not in known:
+                known.add(doc_id)
+                keep.append(i)
+        if not keep:
+            return 0
+        vectors = _normalize_rows(np.asarray(embeddings, dtype=np.float32)[keep])
+        if self.dimension and vectors.shape[1] != self.dimension:
+            raise ValueError(f"Expected {self.dimension}-dim embeddings, got {vectors.shape[1]}")
+
+        self._write_vectors(vectors)
+        self.ids.extend(ids[i] for i in keep)
+        self.documents.extend(documents[i] for i in keep)
+        self.metadatas.extend(metadatas[i] for i in keep)
+        self._open_vectors(vectors.shape[1])
+
+        if self.quantizer is not None and self.quantizer.covers(vectors):
+            self.codes = np.concatenate([self.codes, self.quantizer.encode(vectors)])
+        else:
+            self.quantizer = ScalarQuantizer.fit(self._vectors)
+            self.codes = np.concatenate([
+                self.quantizer.encode(self._vectors[start:start + 4096])
+                for start in range(0, len(self.ids), 4096)
+            ])
+        if self.persistent:
+            self._save()
+        return len(keep)
+
+    def query(
+        self,
+        query_texts: Optional[List[str]] = None,
+        n_results: int = 3,
+        where: Optional[Dict] = None,
+        where_document: Optional[Dict] = None,
+        query_embeddings: Optional[Any] = None
+    ) -> Dict[str, List]:
+        """
+        Query the vector store for similar documents.
+
+        Args:
+            query_texts: List of query strings
+            n_results: Number of results to return per query
+            where: Optional filter conditions for metadata
+            where_document: Optional filter conditions for documents
+            query_embeddings: Precomputed query embeddings, instead of query_texts
+
+        Returns:
+            Dict containing ids, documents, metadatas, and cosine distances,
+            one list per query as returned by RaysVectorStore.query
+        """
+        if query_embeddings is None:
+            from src.rag.embeddings.cache import uncached
+
+            # Queries skip the on-disk embedding cache, which is for ingest
+            query_embeddings = uncached(self.embedding_function)(query_texts)
+        return self.query_by_embeddings(query_embeddings, n_results, where, where_document)
+
+    def query_by_embeddings(
+        self,
+        query_embeddings: Any,
+        n_results: int = 3,
+        where: Optional[Dict] = None,
+        where_document: Optional[Dict] = None
+    ) -> Dict[str, List]:
+        """
+        Query with precomputed query embeddings.
+
+        Args:
+            query_embeddings: (m, dim) query embeddings
+            n_results: Number of results to return per query
+            where: Optional filter conditions for metadata
+            where_document: Optional filter conditions for documents
+
+        Returns:
+            Dict containing ids, documents, metadatas, and cosine distances
+        """
+        queries = _normalize_rows(np.atleast_2d(np.asarray(query_embeddings, dtype=np.float32)))
+        results: Dict[str, List] = {"ids": [], "documents": [], "metadatas": [], "distances": []}
+        if not self.ids:
+            for values in results.values():
+                values.extend([] for _ in queries)
+            return results
+
+        approx = self.quantizer.scores(self.codes, queries)
+        mask = filter_mask(self.metadatas, self.documents, where, where_document)
+        available = len(self.ids)
+        if mask is not None:
+            approx[:, ~mask] = -np.inf
+            available = int(mask.sum())
+        n_results = min(n_results, available)
+        num_candidates = min(n_results * self.rescore_factor, available)
+
+        for query, row_scores in zip(queries, approx):
+            if n_results == 0:
+                top = np.empty(0, dtype=np.int64)
+                exact = np.empty(0, dtype=np.float32)
+            else:
+                candidates = np.argpartition(-row_scores, num_candidates - 1)[:num_candidates]
+                candidates.sort()  # sequential reads from the on-disk vectors
+                candidate_scores = self._vectors[candidates] @ query
+                best = np.argsort(-candidate_scores)[:n_results]
+                top, exact = candidates[best], candidate_scores[best]
+            results["ids"].append([self.ids[i] for i in top])
+            results["documents"].append([self.documents[i] for i in top])
+            results["metadatas"].append([self.metadatas[i] for i in top])
+            results["distances"].append([float(1.0 - score) for score in exact])
+        return results
+
+    def get_collection_stats(self) -> Dict[str, Any]:
+        """
+        Get statistics about the store.
+
+        Returns:
+            Dict containing the document count and in-memory and on-disk vector sizes
+        """
+        return {
+            "name": self.collection_name,
+            "count": self.count(),
+            "dimension": self.dimension,
+            "code_bytes": int(self.codes.nbytes),
+            "full_precision_bytes_on_disk": self.count() * self.dimension * 4,
+            "rescore_factor": self.rescore_factor,
+        }
@@ -0,0 +1,328 @@
+"""
+Index snapshot module for the RAG system.
+Provides functionality to write and load prebuilt, versioned index snapshots
+so a vector index can be opened without re-embedding the corpus.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+# Bump whenever the on-disk layout changes; older snapshots are then ignored
+SNAPSHOT_FORMAT_VERSION = 1
+
+MANIFEST_FILE = "manifest.json"
+EMBEDDINGS_FILE = "embeddings.npy"
+RECORDS_FILE = "records.json"
+PROJECTION_FILE = "projection.npz"
+
+# Fixed text embedded at build and load time to detect model changes
+FINGERPRINT_PROBE_TEXT = "Tampa Bay Rays tickets, parking and ballpark information"
+FINGERPRINT_MIN_COSINE = 0.999
+
+
+def file_sha256(path: Union[str, Path]) -> Optional[str]:
+    """
+    Compute the SHA-256 digest of a file.
+
+    Args:
+        path: Path of the file to hash
+
+    Returns:
+        Optional[str]: Hex digest, or None if the file does not exist
+    """
+    path = Path(path)
+    if not path.is_file():
+        return None
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _cosine(a: np.ndarray, b: np.ndarray) -> float:
+    """Cosine similarity between two vectors."""
+    denom = float(np.linalg.norm(a) * np.linalg.norm(b))
+    return float(np.dot(a, b) / denom) if denom else 0.0
+
+
+class IndexSnapshot:
+    """Read-only view of a prebuilt index snapshot on disk."""
+
+    def __init__(
+        self,
+        path: Path,
+        manifest: Dict[str, Any],
+        ids: List[str],
+        documents: List[str],
+        metadatas: List[Dict],
+        embeddings: np.ndarray
+    ):
+        """
+        Initialize the snapshot view. Use `IndexSnapshot.load` or
+        `IndexSnapshot.write` rather than calling this directly.
+
+        Args:
+            path: Snapshot directory
+            manifest: Parsed manifest contents
+            ids: Document IDs
+            documents: Document texts
+            metadatas: Document metadata dictionaries
+            embeddings: (n, dim) float32 matrix, possibly memory-mapped
+        """
+        self.path = path
+        self.manifest = manifest
+        self.ids = ids
+        self.documents = documents
+        self.metadatas = metadatas
+        self.embeddings = embeddings
+
+    @property
+    def version(self) -> str:
+        """Content-derived version identifier of the snapshot."""
+        return self.manifest["index_version"]
+
+    @property
+    def model_name(self) -> str:
+        """Name of the embedding model the vectors were built with."""
+        return self.manifest["model"]["name"]
+
+    def load_projection(self) -> Optional[Any]:
+        """
+        Load the dimension-reducing projection fitted when the snapshot was built.
+
+        The stored embeddings are always full-dimension; the projection is
+        applied when they are loaded into an index.
+
+        Returns:
+            Optional[PCAProjection]: The projection, or None if the snapshot has none
+        """
+        if not self.manifest.get("projection"):
+            return None
+        from src.rag.embeddings.projection import PCAProjection
+
+        return PCAProjection.load(self.path / PROJECTION_FILE)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @staticmethod
+    def compute_version(
+        ids: Sequence[str],
+        embeddings: np.ndarray,
+        model_name: str,
+        projection_version: Optional[str] = None
+    ) -> str:
+        """
+        Derive a stable version identifier from the snapshot contents.
+
+        Args:
+            ids: Document IDs
+            embeddings: Embedding matrix
+            model_name: Embedding model name
+            projection_version: Version of the stored projection, if any
+
+        Returns:
+            str: Short hex digest identifying this exact index
+        """
+        digest = hashlib.sha256(model_name.encode("utf-8"))
+        for doc_id in ids:
+            digest.update(doc_id.encode("utf-8"))
+            digest.update(b"\0")
+        digest.update(np.ascontiguousarray(embeddings, dtype=np.float32).tobytes())
+        if projection_version:
+            digest.update(projection_version.encode("utf-8"))
+        return digest.hexdigest()[:16]
+
+    @classmethod
+    def write(
+        cls,
+        path: Union[str, Path],
+        ids: List[str],
+        documents: List[str],
+        metadatas: List[Dict],
+        embeddings: Any,
+        model_name: str,
+        probe_embedding: Optional[Any] = None,
+        source_sha256: Optional[str] = None,
+        projection: Optional[Any] = None
+    ) -> "IndexSnapshot":
+        """
+        Write a snapshot atomically, replacing any existing snapshot at `path`.
+
+        Args:
+            path: Snapshot directory
+            ids: Document IDs
+            documents: Document texts
+            metadatas: Document metadata dictionaries
+            embeddings: Embeddings for each document
+            model_name: Embedding model name
+            probe_embedding: Embedding of FINGERPRINT_PROBE_TEXT from the same model
+            source_sha256: Digest of the source file the index was built from
+            projection: Optional PCAProjection fitted on `embeddings`, stored
+                alongside them
+
+        Returns:
+            IndexSnapshot: The snapshot that was written
+        """
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        if matrix.ndim != 2 or matrix.shape[0] != len(ids):
+            raise ValueError("Embeddings must be a 2-D matrix with one row per document")
+        if len(documents) != len(ids) or len(metadatas) != len(ids):
+            raise ValueError("Length mismatch between documents, metadatas, and ids")
+
+        path = Path(path)
+        manifest = {
+            "format_version": SNAPSHOT_FORMAT_VERSION,
+            "index_version": cls.compute_version(
+                ids, matrix, model_name, projection.version if projection is not None else None
+            ),
+            "created_at": datetime.now().isoformat(),
+            "count": len(ids),
+            "source_sha256": source_sha256,
+            "model": {
+                "name": model_name,
+                "dimension": int(matrix.shape[1]),
+                "probe": (
+                    np.asarray(probe_embedding, dtype=np.float32).tolist()
+                    if probe_embedding is not None else None
+                ),
+            },
+            "projection": (
+                {
+                    "dimension": projection.output_dim,
+                    "whiten": projection.whiten,
+                    "version": projection.version,
+                }
+                if projection is not None else None
+            ),
+        }
+
+        # Write into a sibling temp dir and swap it in with renames, so readers
+        # never see a partial snapshot and the old one is deleted only once the
+        # new one is in place
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_dir = Path(tempfile.mkdtemp(prefix=f".{path.name}.", dir=path.parent))
+        old_dir = None
+        try:
+            np.save(tmp_dir / EMBEDDINGS_FILE, matrix)
+            with open(tmp_dir / RECORDS_FILE, "w", encoding="utf-8") as f:
+                json.dump({"ids": ids, "documents": documents, "metadatas": metadatas}, f)
+            with open(tmp_dir / MANIFEST_FILE, "w", encoding="utf-8") as f:
+                json.dump(manifest, f, indent=2)
+            if projection is not None:
+                projection.save(tmp_dir / PROJECTION_FILE)
+            if path.exists():
+                old_dir = tmp_dir.with_name(tmp_dir.name + ".old")
+                os.replace(path, old_dir)
+            try:
+                os.replace(tmp_dir, path)
+            except Exception:
+                # Put the previous snapshot back rather than leave none
+                if old_dir is not None:
+                    os.replace(old_dir, path)
+                    old_dir = None
+                raise
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+        if old_dir is not None:
+            shutil.rmtree(old_dir, ignore_errors=True)
+
+        print(f"Wrote index snapshot {manifest['index_version']} ({len(ids)} documents) to {path}")
+        return cls(path, manifest, list(ids), list(documents), list(metadatas), matrix)
+
+    @classmethod
+    def load(
+        cls,
+        path: Union[str, Path],
+        model_name: Optional[str] = None,
+        source_sha256: Optional[str] = None,
+        probe_embedding: Optional[Any] = None,
+        mmap: bool = True
+    ) -> Optional["IndexSnapshot"]:
+        """
+        Load a snapshot if it exists and is valid for the given model and source.
+
+        Args:
+            path: Snapshot directory
+            model_name: Expected embedding model name
+            source_sha256: Expected digest of the source file, if known
+            probe_embedding: Embedding of FINGERPRINT_PROBE_TEXT from the current model
+            mmap: Memory-map the embedding matrix instead of reading it into memory
+
+        Returns:
+            Optional[IndexSnapshot]: The snapshot, or None if missing or invalid
+        """
+        path = Path(path)
+        manifest_path = path / MANIFEST_FILE
+        if not manifest_path.is_file():
+            return None
+
+        try:
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not read snapshot manifest at {manifest_path}: {e}")
+            return None
+
+        reason = cls._validate_manifest(manifest, model_name, source_sha256, probe_embedding)
+        if reason:
+            print(f"Ignoring index snapshot at {path}: {reason}")
+            return None
+
+        try:
+            embeddings = np.load(path / EMBEDDINGS_FILE, mmap_mode="r" if mmap else None)
+            with open(path / RECORDS_FILE, "r", encoding="utf-8") as f:
+                records = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not read index snapshot at {path}: {e}")
+            return None
+
+        ids = records["ids"]
+        if embeddings.shape != (manifest["count"], manifest["model"]["dimension"]) or len(ids) != manifest["count"]:
+            print(f"Ignoring index snapshot at {path}: contents do not match manifest")
+            return None
+
+        return cls(path, manifest, ids, records["documents"], records["metadatas"], embeddings)
+
+    @staticmethod
+    def _validate_manifest(
+        manifest: Dict[str, Any],
+        model_name: Optional[str],
+        source_sha256: Optional[str],
+        probe_embedding: Optional[Any]
+    ) -> Optional[str]:
+        """
+        Check a manifest against the current environment.
+
+        Returns:
+            Optional[str]: Reason the snapshot is invalid, or None if it is usable
+        """
+        if manifest.get("format_version") != SNAPSHOT_FORMAT_VERSION:
+            return f"format version {manifest.get('format_version')} != {SNAPSHOT_FORMAT_VERSION}"
+
+        model = manifest.get("model", {})
+        if model_name is not None and model.get("name") != model_name:
+            return f"built with model {model.get('name')}, expected {model_name}"
+
+        if source_sha256 is not None and manifest.get("source_sha256") not in (None, source_sha256):
+            return "source content has changed since the snapshot was built"
+
+        if probe_embedding is not None and model.get("probe") is not None:
+            probe = np.asarray(probe_embedding, dtype=np.float32)
+            stored = np.asarray(model["probe"], dtype=np.float32)
+            if probe.shape != stored.shape:
+                return f"embedding dimension {probe.shape[0]} != {stored.shape[0]}"
+            if _cosine(probe, stored) < FINGERPRINT_MIN_COSINE:
+                return "embedding model output differs from the one used at build time"
+
+        return None
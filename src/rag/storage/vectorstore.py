@@ -4,32 +4,82 @@ Provides functionality to store and retrieve content using ChromaDB.
 """
 
 import os
-from typing import List, Dict, Tuple, Optional, Any
-import torch
+import time
+from pathlib import Path
+from typing import List, Dict, Tuple, Optional, Any, Union
 import chromadb
-from chromadb.config import Settings
-from chromadb.utils import embedding_functions
 from chromadb import errors as chromadb_errors
-from sentence_transformers import SentenceTransformer
 from dotenv import load_dotenv
 
+from src.rag.config.settings import EMBEDDING_BATCH_SIZE
+from src.rag.embeddings.backends import create_embedding_backend, embedding_model_id
+from src.rag.embeddings.cache import cached_embedding_function
+from src.rag.embeddings.projection import PCAProjection, ProjectedEmbeddingFunction
+from .batching import iter_embedding_batches, split_batches
+
 # Load environment variables
 load_dotenv()
 
+DEFAULT_EMBEDDING_MODEL = "multi-qa-MiniLM-L6-cos-v1"
+
+# Used when the Chroma client cannot report its own limit
+DEFAULT_MAX_WRITE_BATCH_SIZE = 5000
+
 class RaysVectorStore:
     """Vector store class for managing content embeddings and retrieval."""
     
-    def __init__(self, collection_name: str):
+    # Metadata fields that describe a chunk's position within its page
+    POSITIONAL_METADATA_FIELDS = ("chunk_index", "total_chunks")
+    
+    def __init__(
+        self,
+        collection_name: str,
+        persist_dir: Optional[str] = None,
+        embedding_function: Optional[Any] = None,
+        embedding_batch_size: int = EMBEDDING_BATCH_SIZE,
+        projection: Optional[Union[PCAProjection, str, Path]] = None
+    ):
         """
         Initialize the vector store.
         
         Args:
             collection_name: Name of the collection to use
+            persist_dir: Optional directory for a persistent database;
+                an in-memory database is used when omitted
+            embedding_function: Optional Chroma embedding function; defaults to
+                the cached multi-qa-MiniLM-L6-cos-v1 sentence-transformers model
+                on EMBEDDING_BACKEND
+            embedding_batch_size: Documents per embedding forward pass in add_documents
+            projection: Optional PCAProjection (or a file saved by one) applied
+                to every document and query vector; a persisted collection
+                must always be opened with the projection it was built with
         """
         self.collection_name = collection_name
+        self.embedding_batch_size = embedding_batch_size
+        if embedding_function is None:
+            # Use sentence-transformers for better embeddings, on the configured
+            # backend and behind the on-disk cache
+            embedding_function = cached_embedding_function(
+                create_embedding_backend(DEFAULT_EMBEDDING_MODEL),
+                model_name=embedding_model_id(DEFAULT_EMBEDDING_MODEL)
+            )
+        if isinstance(projection, (str, Path)):
+            path = projection
+            projection = PCAProjection.load(path)
+            if projection is None:
+                raise FileNotFoundError(f"No embedding projection at {path}")
+        if projection is not None:
+            # Chroma embeds query_texts with the collection's function, so
+            # ingest and query vectors are projected the same way
+            embedding_function = ProjectedEmbeddingFunction(embedding_function, projection)
+        self.projection = projection
+        self.embedding_function = embedding_function
         
-        # Initialize ephemeral client (in-memory)
-        self.client = chromadb.EphemeralClient()
+        if persist_dir:
+            self.client = chromadb.PersistentClient(path=persist_dir)
+        else:
+            # Initialize ephemeral client (in-memory)
+            self.client = chromadb.EphemeralClient()
         self.collection = self._initialize_collection()
     
     def _initialize_collection(self):
@@ -39,10 +89,7 @@ class RaysVectorStore:
         Returns:
             chromadb.Collection: The initialized collection
         """
-        # Use sentence-transformers for better embeddings
-        embedding_function = embedding_functions.SentenceTransformerEmbeddingFunction(
-            model_name="multi-qa-MiniLM-L6-cos-v1"
-        )
+        embedding_function = self.embedding_function
         
         try:
             # Try to get existing collection
@@ -77,19 +124,38 @@ class RaysVectorStore:
         
         return collection
     
+    def _max_write_batch_size(self) -> int:
+        """
+        Get the largest number of records Chroma accepts in a single write.
+        
+        Returns:
+            int: Maximum write batch size
+        """
+        get_max_batch_size = getattr(self.client, "get_max_batch_size", None)
+        if get_max_batch_size is not None:
+            return get_max_batch_size()
+        return getattr(self.client, "max_batch_size", DEFAULT_MAX_WRITE_BATCH_SIZE)
+    
     def add_documents(
         self,
         documents: List[str],
         metadatas: Optional[List[Dict]] = None,
-        ids: Optional[List[str]] = None
+        ids: Optional[List[str]] = None,
+        batch_size: Optional[int] = None
     ) -> None:
         """
         Add documents to the vector store.
         
+        Documents are embedded here in length-sorted batches (to minimise
+        padding in the transformer) rather than by Chroma, and written to the
+        collection in chunks below Chroma's maximum batch size.
+        
         Args:
             documents: List of text documents to add
             metadatas: Optional list of metadata dictionaries
             ids: Optional list of document IDs
+            batch_size: Documents per embedding forward pass; defaults to
+                the store's embedding_batch_size
         """
         if not documents:
             return
@@ -106,13 +172,124 @@ class RaysVectorStore:
         if len(documents) != len(metadatas) or len(documents) != len(ids):
             raise ValueError("Length mismatch between documents, metadatas, and ids")
             
-        # Add to collection
-        self.collection.add(
-            documents=documents,
-            metadatas=metadatas,
-            ids=ids
+        batch_size = batch_size or self.embedding_batch_size
+        max_write = self._max_write_batch_size()
+        num_batches = -(-len(documents) // batch_size)
+        pending_indices: List[int] = []
+        pending_embeddings: List[Any] = []
+        total_start = time.perf_counter()
+        
+        batches = iter_embedding_batches(self.embedding_function, documents, batch_size)
+        for batch_number, (indices, embeddings, elapsed) in enumerate(batches, start=1):
+            print(
+                f"  Embedded batch {batch_number}/{num_batches}: {len(indices)} docs "
+                f"in {elapsed:.2f}s ({len(indices) / max(elapsed, 1e-9):.1f} docs/sec)"
+            )
+            pending_indices.extend(indices)
+            pending_embeddings.extend(embeddings)
+            
+            # Write to Chroma in chunks below its maximum batch size
+            if len(pending_indices) >= max_write or batch_number == num_batches:
+                for write in split_batches(range(len(pending_indices)), max_write):
+                    self.collection.add(
+                        ids=[ids[pending_indices[j]] for j in write],
+                        embeddings=[pending_embeddings[j] for j in write],
+                        documents=[documents[pending_indices[j]] for j in write],
+                        metadatas=[metadatas[pending_indices[j]] for j in write]
+                    )
+                pending_indices, pending_embeddings = [], []
+        
+        total = time.perf_counter() - total_start
+        print(
+            f"Added {len(documents)} documents to vector store for {self.collection_name} "
+            f"in {total:.2f}s ({len(documents) / max(total, 1e-9):.1f} docs/sec)"
+        )
+    
+    def sync_documents(
+        self,
+        documents: List[str],
+        metadatas: List[Dict],
+        ids: List[str],
+        prune_missing_sources: bool = False
+    ) -> Dict[str, int]:
+        """
+        Incrementally reindex documents, grouped by their `source_url` metadata.
+        
+        For each source the stored chunk IDs are diffed against the new ones:
+        only new chunks are embedded and added, vanished chunks are deleted,
+        and unchanged chunks are left alone (their positional metadata is
+        updated in place if it shifted, which does not re-embed them).
+        IDs are expected to be content hashes, as produced by ContentChunker.
+        
+        Args:
+            documents: List of text documents for the sources being synced
+            metadatas: List of metadata dictionaries, each with a `source_url`
+            ids: List of content-hash document IDs
+            prune_missing_sources: Also delete documents whose source is not in this batch
+            
+        Returns:
+            Dict[str, int]: Counts of added, deleted, updated and unchanged documents
+        """
+        if len(documents) != len(metadatas) or len(documents) != len(ids):
+            raise ValueError("Length mismatch between documents, metadatas, and ids")
+        
+        by_source: Dict[str, List[int]] = {}
+        for i, metadata in enumerate(metadatas):
+            if "source_url" not in metadata:
+                raise ValueError(f"Document {ids[i]} has no source_url metadata")
+            by_source.setdefault(metadata["source_url"], []).append(i)
+        
+        stats = {"added": 0, "deleted": 0, "updated": 0, "unchanged": 0}
+        for source_url, indices in by_source.items():
+            stored = self.collection.get(where={"source_url": source_url}, include=["metadatas"])
+            stored_metadata = dict(zip(stored["ids"], stored["metadatas"]))
+            new_ids = {ids[i] for i in indices}
+            
+            vanished = [doc_id for doc_id in stored_metadata if doc_id not in new_ids]
+            if vanished:
+                self.collection.delete(ids=vanished)
+            
+            added = [i for i in indices if ids[i] not in stored_metadata]
+            moved = [
+                i for i in indices
+                if ids[i] in stored_metadata and any(
+                    stored_metadata[ids[i]].get(field) != metadatas[i].get(field)
+                    for field in self.POSITIONAL_METADATA_FIELDS
+                )
+            ]
+            if moved:
+                self.collection.update(
+                    ids=[ids[i] for i in moved],
+                    metadatas=[metadatas[i] for i in moved]
+                )
+            if added:
+                self.add_documents(
+                    documents=[documents[i] for i in added],
+                    metadatas=[metadatas[i] for i in added],
+                    ids=[ids[i] for i in added]
+                )
+            
+            stats["added"] += len(added)
+            stats["deleted"] += len(vanished)
+            stats["updated"] += len(moved)
+            stats["unchanged"] += len(indices) - len(added) - len(moved)
+        
+        if prune_missing_sources:
+            stored = self.collection.get(include=["metadatas"])
+            orphaned = [
+                doc_id for doc_id, metadata in zip(stored["ids"], stored["metadatas"])
+                if (metadata or {}).get("source_url") not in by_source
+            ]
+            if orphaned:
+                self.collection.delete(ids=orphaned)
+            stats["deleted"] += len(orphaned)
+        
+        print(
+            f"Synced {len(by_source)} sources for {self.collection_name}: "
+            f"{stats['added']} added, {stats['deleted']} deleted, "
+            f"{stats['updated']} updated, {stats['unchanged']} unchanged"
         )
-        print(f"Added {len(documents)} documents to vector store for {self.collection_name}")
+        return stats
     
     def query(
         self,
@@ -153,7 +330,8 @@ class RaysVectorStore:
         return {
             "name": self.collection.name,
             "count": self.collection.count(),
-            "metadata": self.collection.metadata
+            "metadata": self.collection.metadata,
+            "projection_dim": self.projection.output_dim if self.projection is not None else None
         }
     
     def test_semantic_similarity(
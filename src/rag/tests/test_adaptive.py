@@ -0,0 +1,21 @@
+from src.rag.retrieval.adaptive import adaptive_k
+
+
+def test_keeps_results_within_margin_of_best():
+    # best 0.20 -> threshold 0.20 + max(0.05, 0.25 * 0.20) = 0.25
+    distances = [0.20, 0.24, 0.25, 0.40, 0.21]
+
+    assert adaptive_k(distances, min_k=1, max_k=6, relative_margin=0.25, absolute_margin=0.05) == 3
+
+
+def test_single_clear_winner_and_bounds():
+    assert adaptive_k([0.10, 0.45, 0.46], min_k=1, max_k=4, relative_margin=0.25, absolute_margin=0.05) == 1
+    assert adaptive_k([0.10, 0.45, 0.46], min_k=2, max_k=4, relative_margin=0.25, absolute_margin=0.05) == 2
+    assert adaptive_k([0.30] * 8, min_k=1, max_k=4, relative_margin=0.25, absolute_margin=0.05) == 4
+    assert adaptive_k([], min_k=1, max_k=4) == 0
+
+
+def test_keyword_only_results():
+    # A keyword-only match at rank 1 is kept by min_k; one later ends the list
+    assert adaptive_k([None, 0.20, 0.21, None, 0.22], min_k=1, max_k=6, relative_margin=0.25, absolute_margin=0.05) == 3
+    assert adaptive_k([None, None], min_k=1, max_k=6) == 2
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from src.rag.serving import answer_cache
+from src.rag.serving.answer_cache import SemanticAnswerCache
+
+
+def _unit(*values):
+    vector = np.zeros(8, dtype=np.float32)
+    vector[:len(values)] = values
+    return vector
+
+
+def test_lookup_hits_paraphrases_above_threshold():
+    cache = SemanticAnswerCache(similarity_threshold=0.9, max_entries=10, ttl_seconds=0)
+    cache.store(_unit(1.0), "Where do I park?", "Lots open two hours early.")
+
+    # cos = 0.995 and 0.707
+    assert cache.lookup(_unit(1.0, 0.1)) == "Lots open two hours early."
+    assert cache.lookup(_unit(1.0, 1.0)) is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_least_recently_used_entry_is_evicted_at_cap():
+    cache = SemanticAnswerCache(similarity_threshold=0.99, max_entries=2, ttl_seconds=0)
+    cache.store(_unit(1.0), "parking", "parking answer")
+    cache.store(_unit(0.0, 1.0), "bags", "bags answer")
+    assert cache.lookup(_unit(1.0)) == "parking answer"
+
+    cache.store(_unit(0.0, 0.0, 1.0), "students", "students answer")
+
+    assert len(cache) == 2
+    assert cache.lookup(_unit(0.0, 1.0)) is None
+    assert cache.lookup(_unit(1.0)) == "parking answer"
+    assert cache.lookup(_unit(0.0, 0.0, 1.0)) == "students answer"
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(answer_cache.time, "time", lambda: now[0])
+    cache = SemanticAnswerCache(similarity_threshold=0.9, max_entries=10, ttl_seconds=60)
+    cache.store(_unit(1.0), "parking", "parking answer")
+
+    now[0] += 59
+    assert cache.lookup(_unit(1.0)) == "parking answer"
+    now[0] += 2
+    assert cache.lookup(_unit(1.0)) is None
+    assert len(cache) == 0
+
+
+def test_index_version_change_invalidates_entries():
+    cache = SemanticAnswerCache(similarity_threshold=0.9, max_entries=10, ttl_seconds=0)
+    cache.store(_unit(1.0), "parking", "old answer", index_version="v1")
+
+    assert cache.lookup(_unit(1.0), index_version="v1") == "old answer"
+    assert cache.lookup(_unit(1.0), index_version="v2") is None
+    assert len(cache) == 0
+
+
+def test_rejects_empty_cache_size():
+    with pytest.raises(ValueError):
+        SemanticAnswerCache(max_entries=0)
@@ -0,0 +1,110 @@
+import pytest
+
+from src.rag.processing.chunker import ContentChunker, TokenAwareChunker, create_chunker
+from src.rag.processing.pipeline import preprocess_sections
+
+
+def test_character_chunks_with_overlap():
+    chunker = ContentChunker(max_chunk_size=20, min_chunk_size=1, overlap_size=5)
+    content = "alpha beta\n\n\n\ngamma delta\n\n  \n\nepsilon zeta eta"
+
+    assert chunker.create_chunks(content) == [
+        "alpha beta",
+        "beta\n\ngamma delta",
+        "delta\n\nepsilon zeta eta",
+    ]
+
+
+def test_zero_overlap_does_not_carry_previous_chunk():
+    chunker = ContentChunker(max_chunk_size=12, min_chunk_size=1, overlap_size=0)
+
+    assert chunker.create_chunks("one two\n\nthree four\n\nfive six") == ["one two", "three four", "five six"]
+
+
+class WhitespaceTokenizer:
+    """Minimal tokenizer with the Hugging Face call signature; one token per word."""
+
+    model_max_length = 12
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, texts, **kwargs):
+        self.calls += 1
+        return {"input_ids": [list(range(len(text.split()))) for text in texts]}
+
+    def num_special_tokens_to_add(self, pair=False):
+        return 2
+
+
+def test_chunks_fit_budget_and_keep_short_paragraphs_whole():
+    tokenizer = WhitespaceTokenizer()
+    chunker = TokenAwareChunker(tokenizer=tokenizer, overlap_tokens=0)
+    content = (
+        "Gates open early. Bags are checked.\n\n"
+        "Parking is in lot seven. Lot six is closed today. Shuttles run often.\n\n"
+        "Tickets are at the box office."
+    )
+
+    chunks = chunker.create_chunks_with_token_counts(content)
+
+    assert chunker.token_budget == 10
+    assert all(tokens <= 10 for _, tokens in chunks)
+    assert [text for text, _ in chunks] == [
+        "Gates open early. Bags are checked.",
+        "Parking is in lot seven. Lot six is closed today.",
+        "Shuttles run often.\n\nTickets are at the box office.",
+    ]
+    # Sentences are counted in one batch, chunks in another
+    assert tokenizer.calls == 2
+
+
+def test_overlap_is_whole_sentences_within_token_limit():
+    chunker = TokenAwareChunker(tokenizer=WhitespaceTokenizer(), overlap_tokens=3)
+    content = "One two three. Four five six. Seven eight nine. Ten eleven twelve."
+
+    texts = chunker.create_chunks(content)
+
+    assert texts == [
+        "One two three. Four five six. Seven eight nine.",
+        "Seven eight nine. Ten eleven twelve.",
+    ]
+
+
+def test_oversized_sentence_is_hard_split():
+    chunker = TokenAwareChunker(tokenizer=WhitespaceTokenizer(), overlap_tokens=0)
+    sentence = " ".join(f"w{i}" for i in range(25)) + "."
+
+    chunks = chunker.create_chunks_with_token_counts(sentence)
+
+    assert [tokens for _, tokens in chunks] == [10, 10, 5]
+    assert " ".join(text for text, _ in chunks) == sentence
+
+
+def test_process_content_reports_token_counts():
+    chunker = TokenAwareChunker(tokenizer=WhitespaceTokenizer(), max_tokens=8)
+
+    records = chunker.process_content("Rays Rush is a student pass. It costs little.", "https://www.mlb.com/rays/rush")
+
+    assert [r["metadata"]["token_count"] for r in records] == [6, 3]
+    assert all(r["metadata"]["total_chunks"] == 2 for r in records)
+
+
+def test_create_chunker_modes():
+    assert type(create_chunker("characters")) is ContentChunker
+    assert isinstance(create_chunker("tokens", tokenizer=WhitespaceTokenizer()), TokenAwareChunker)
+    with pytest.raises(ValueError):
+        create_chunker("paragraphs")
+
+
+def test_pipeline_token_mode():
+    sections = [("https://www.mlb.com/rays/rush", "Rays Rush is a student pass. It costs little.")]
+
+    [(url, chunks)] = preprocess_sections(
+        sections,
+        workers=1,
+        chunking_mode="tokens",
+        chunker_options={"tokenizer": WhitespaceTokenizer(), "max_tokens": 8}
+    )
+
+    assert [c["text"] for c in chunks] == ["Rays Rush is a student pass.", "It costs little."]
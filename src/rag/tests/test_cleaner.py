@@ -0,0 +1,30 @@
+import random
+from pathlib import Path
+
+from src.rag.processing.cleaner import ContentCleaner
+
+ROOT_DIR = Path(__file__).resolve().parents[3]
+GOLDEN_DIR = Path(__file__).resolve().parent / "golden"
+
+
+def test_clean_content_matches_golden_output():
+    raw = (ROOT_DIR / "content" / "rays_content_raw.md").read_text(encoding="utf-8")
+    expected = (GOLDEN_DIR / "rays_content_raw.cleaned.txt").read_text(encoding="utf-8")
+
+    assert ContentCleaner().clean_content(raw) == expected
+    assert ContentCleaner.clean_content_stepwise(raw) == expected
+
+
+def test_clean_content_matches_stepwise_pipeline_on_random_input():
+    # Alphabet biased towards the characters every cleaning rule reacts to
+    pieces = [
+        "a", "B", "7", " ", "  ", "\n", "\r\n", "\r", "\t", "\xa0", " ",
+        "<", ">", "<b>", "</p>", "&", ";", "&amp;", "&nbsp;", "&am<i>p;",
+        "[", "]", "(", ")", "[link](http://x.io)", "https://", "http://a.b/c",
+        ".", ",", "!", "?", "...", "?!", "-", "_", "--", "__", "'", '"', "—",
+    ]
+    rng = random.Random(1234)
+    cleaner = ContentCleaner()
+    for _ in range(3000):
+        text = "".join(rng.choice(pieces) for _ in range(rng.randint(1, 40)))
+        assert cleaner.clean_content(text) == (ContentCleaner.clean_content_stepwise(text) or None), repr(text)
@@ -0,0 +1,64 @@
+from src.rag.processing.chunker import ContentChunker
+from src.rag.retrieval.context import assemble_context, estimate_tokens, merge_overlapping
+
+PAGE = "https://www.mlb.com/rays/parking"
+OTHER = "https://www.mlb.com/rays/tickets"
+
+
+def _page_chunks():
+    text = "\n\n".join(
+        f"Lot {i} opens two hours before first pitch and costs {10 + i} dollars." for i in range(4)
+    )
+    return ContentChunker(max_chunk_size=120, min_chunk_size=10, overlap_size=50).create_chunks(text)
+
+
+def test_merge_overlapping():
+    assert merge_overlapping("Gates open at noon for all fans", "at noon for all fans and members") == (
+        "Gates open at noon for all fans and members"
+    )
+    assert merge_overlapping("Gates open at noon", "Parking is free") is None
+    assert merge_overlapping("Gates open at noon for all fans", "open at noon") == "Gates open at noon for all fans"
+
+
+def test_adjacent_chunks_are_merged_without_overlap_and_source_given_once():
+    chunks = _page_chunks()
+    # Retrieved out of order, with a gap at chunk 2
+    context = assemble_context(
+        [chunks[1], chunks[3], chunks[0]],
+        [{"source_url": PAGE, "chunk_index": i} for i in (1, 3, 0)],
+        token_budget=0,
+    )
+
+    assert context.count("Source: ") == 1
+    assert context.startswith(f"Source: {PAGE}\n")
+    for i in (0, 1, 3):
+        assert context.count(f"Lot {i} opens") == 1
+    assert "Lot 2 opens" not in context
+    # Chunks 0 and 1 join exactly where the overlap was; chunk 3 is a separate span
+    assert "costs 10 dollars.\n\nLot 1 opens" in context
+    assert "costs 11 dollars.\n...\n" in context
+
+
+def test_near_duplicates_dropped_and_budget_respected():
+    boilerplate = "Download the MLB Ballpark app for mobile tickets, parking passes and in-seat ordering."
+    documents = [
+        "Rays Rush members get student tickets for every home game. " + boilerplate,
+        boilerplate,
+        "Season ticket members save on parking at every lot.",
+        "Group tickets are available for parties of fifteen or more.",
+    ]
+    metadatas = [
+        {"source_url": OTHER, "chunk_index": 0},
+        {"source_url": PAGE, "chunk_index": 5},
+        {"source_url": PAGE, "chunk_index": 0},
+        {"source_url": OTHER, "chunk_index": 7},
+    ]
+
+    context = assemble_context(documents, metadatas, token_budget=0)
+    assert context.count("Download the MLB Ballpark app") == 1
+    assert context.index(OTHER) < context.index(PAGE)
+
+    budget = estimate_tokens(f"Source: {OTHER}\n") + estimate_tokens(documents[0])
+    packed = assemble_context(documents, metadatas, token_budget=budget)
+    assert estimate_tokens(packed) <= budget + 1
+    assert packed == f"Source: {OTHER}\n{documents[0]}"
@@ -0,0 +1,116 @@
+import numpy as np
+import pytest
+
+from src.rag.embeddings import backends
+from src.rag.embeddings.backends import create_embedding_backend, embedding_model_id
+from src.rag.embeddings.onnx_backend import pool_embeddings
+
+
+def test_pooling_matches_sentence_transformers_semantics():
+    hidden = np.array([
+        [[1.0, 0.0], [3.0, 4.0], [100.0, 100.0]],
+        [[0.0, 2.0], [0.0, 2.0], [0.0, 2.0]],
+    ], dtype=np.float32)
+    mask = np.array([[1, 1, 0], [1, 1, 1]])
+
+    cls = pool_embeddings(hidden, mask, "cls", normalize=False)
+    mean = pool_embeddings(hidden, mask, "mean", normalize=False)
+    unit = pool_embeddings(hidden, mask, "mean", normalize=True)
+
+    np.testing.assert_allclose(cls, [[1.0, 0.0], [0.0, 2.0]])
+    # Padding positions are excluded from the mean
+    np.testing.assert_allclose(mean, [[2.0, 2.0], [0.0, 2.0]])
+    np.testing.assert_allclose(np.linalg.norm(unit, axis=1), [1.0, 1.0], rtol=1e-6)
+    with pytest.raises(ValueError):
+        pool_embeddings(hidden, mask, "max", normalize=False)
+
+
+def test_model_id_distinguishes_backends():
+    assert embedding_model_id("BAAI/bge-large-en-v1.5", "torch") == "BAAI/bge-large-en-v1.5"
+    assert embedding_model_id("BAAI/bge-large-en-v1.5", "onnx-int8") == "BAAI/bge-large-en-v1.5@onnx-int8"
+
+
+def test_onnx_backend_requires_an_export(tmp_path, monkeypatch):
+    monkeypatch.setattr(backends, "ONNX_MODEL_DIR", tmp_path)
+
+    assert backends.onnx_model_dir("BAAI/bge-large-en-v1.5") == tmp_path / "BAAI__bge-large-en-v1.5"
+    with pytest.raises(RuntimeError, match="onnx_backend export"):
+        create_embedding_backend("BAAI/bge-large-en-v1.5", backend="onnx-int8")
+    with pytest.raises(ValueError):
+        create_embedding_backend("BAAI/bge-large-en-v1.5", backend="tensorrt")
+
+
+class _StubEncoding:
+    def __init__(self, ids, length):
+        self.ids = ids + [0] * (length - len(ids))
+        self.attention_mask = [1] * len(ids) + [0] * (length - len(ids))
+        self.type_ids = [0] * length
+
+
+class _StubTokenizer:
+    """One token per word, whose id is the word's length; pads to the longest text in the batch."""
+
+    @classmethod
+    def from_file(cls, path):
+        return cls()
+
+    def enable_truncation(self, max_length):
+        pass
+
+    def enable_padding(self, pad_id, pad_token):
+        pass
+
+    def encode_batch(self, texts):
+        ids = [[len(word) for word in text.split()] for text in texts]
+        length = max(len(row) for row in ids)
+        return [_StubEncoding(row, length) for row in ids]
+
+
+class _StubSession:
+    """Returns token states [id, 1], so mean pooling gives [mean word length, 1]."""
+
+    def __init__(self, inputs):
+        self.inputs = inputs
+        self.feeds = []
+
+    def get_inputs(self):
+        from types import SimpleNamespace
+
+        return [SimpleNamespace(name=name) for name in self.inputs]
+
+    def run(self, output_names, feed):
+        self.feeds.append(feed)
+        ids = feed["input_ids"].astype(np.float32)
+        return [np.stack([ids, np.ones_like(ids)], axis=-1)]
+
+
+@pytest.mark.parametrize("inputs", [
+    ["input_ids", "attention_mask", "token_type_ids"],
+    ["input_ids", "attention_mask"],
+])
+def test_onnx_function_pools_in_input_order(tmp_path, monkeypatch, inputs):
+    import json
+    import sys
+    from types import SimpleNamespace
+
+    import onnxruntime
+
+    from src.rag.embeddings.onnx_backend import EXPORT_CONFIG_FILE, OnnxEmbeddingFunction
+
+    config = {"pooling": "mean", "normalize": True, "max_length": 16, "pad_token": "[PAD]", "pad_token_id": 0}
+    (tmp_path / EXPORT_CONFIG_FILE).write_text(json.dumps(config), encoding="utf-8")
+    session = _StubSession(inputs)
+    monkeypatch.setattr(onnxruntime, "InferenceSession", lambda *args, **kwargs: session)
+    monkeypatch.setitem(sys.modules, "tokenizers", SimpleNamespace(Tokenizer=_StubTokenizer))
+
+    texts = ["a bb ccc dddd eeeee", "parking", "Rays Rush student tickets", "gate", "clear bag policy"]
+    embed = OnnxEmbeddingFunction(tmp_path, batch_size=2)
+    vectors = embed(texts)
+
+    expected = np.array([[np.mean([len(word) for word in text.split()]), 1.0] for text in texts])
+    expected /= np.linalg.norm(expected, axis=1, keepdims=True)
+    np.testing.assert_allclose(np.stack(vectors), expected, rtol=1e-6)
+    # Ragged texts were regrouped into length-sorted batches, then put back in order
+    assert len(session.feeds) == 3
+    assert all(("token_type_ids" in feed) == ("token_type_ids" in inputs) for feed in session.feeds)
+    assert all(feed["input_ids"].dtype == np.int64 for feed in session.feeds)
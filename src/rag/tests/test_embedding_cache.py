@@ -0,0 +1,67 @@
+import numpy as np
+
+from src.rag.embeddings.cache import CachedEmbeddingFunction, EmbeddingCache
+from src.rag.tests.test_incremental_index import CountingEmbeddingFunction
+
+
+def test_cached_function_only_embeds_new_text(tmp_path):
+    base = CountingEmbeddingFunction()
+    cache = EmbeddingCache(tmp_path / "cache.sqlite3")
+    cached = CachedEmbeddingFunction(base, cache, model_name="m")
+
+    first = cached(["Rays Rush", "Salute to Service"])
+    second = cached(["Salute  to Service ", "Student tickets", "Rays Rush"])
+
+    assert base.calls == [["Rays Rush", "Salute to Service"], ["Student tickets"]]
+    np.testing.assert_allclose(second[0], first[1])
+    np.testing.assert_allclose(second[2], first[0])
+    assert cache.stats()["hits"] == 2
+
+    # A new process (fresh connection) reuses the stored vectors
+    reopened = CachedEmbeddingFunction(base, EmbeddingCache(tmp_path / "cache.sqlite3"), model_name="m")
+    reopened(["Student tickets"])
+    assert len(base.calls) == 2
+
+
+def test_cache_keys_include_model_and_revision(tmp_path):
+    base = CountingEmbeddingFunction()
+    cache = EmbeddingCache(tmp_path / "cache.sqlite3")
+
+    CachedEmbeddingFunction(base, cache, model_name="m", revision="1")(["parking"])
+    CachedEmbeddingFunction(base, cache, model_name="m", revision="2")(["parking"])
+    CachedEmbeddingFunction(base, cache, model_name="other")(["parking"])
+
+    assert len(base.calls) == 3
+
+
+def test_cache_revision_defaults_to_the_loaded_model(tmp_path, monkeypatch):
+    from types import SimpleNamespace
+
+    cache = EmbeddingCache(tmp_path / "cache.sqlite3")
+    onnx_function = CountingEmbeddingFunction()
+    onnx_function.config = {"revision": "abc123"}
+    torch_function = CountingEmbeddingFunction()
+    torch_function._model = [SimpleNamespace(auto_model=SimpleNamespace(config=SimpleNamespace(_commit_hash="def456")))]
+    monkeypatch.setattr("src.rag.embeddings.backends.EMBEDDING_MODEL_REVISION", "v2")
+
+    assert CachedEmbeddingFunction(onnx_function, cache, model_name="m").revision == "abc123"
+    assert CachedEmbeddingFunction(torch_function, cache, model_name="m").revision == "def456"
+    # Without a recorded commit, the configured revision is the best identity
+    assert CachedEmbeddingFunction(CountingEmbeddingFunction(), cache, model_name="m").revision == "v2"
+
+
+def test_cache_evicts_least_recently_used(tmp_path, monkeypatch):
+    clock = iter(range(1000))
+    monkeypatch.setattr("src.rag.embeddings.cache.time.time", lambda: next(clock))
+    entry_bytes = 16 * 2
+    cache = EmbeddingCache(tmp_path / "cache.sqlite3", max_bytes=4 * entry_bytes, dtype="float16")
+    vector = np.ones(16, dtype=np.float32)
+
+    for key in ["a", "b", "c", "d"]:
+        cache.put_many("m", "main", [(key, vector)])
+    cache.get_many("m", "main", ["a"])
+    cache.put_many("m", "main", [("e", vector)])
+
+    # Over budget: trimmed to 90% by dropping the two least recently used entries
+    assert set(cache.get_many("m", "main", ["a", "b", "c", "d", "e"])) == {"a", "d", "e"}
+    assert cache.stats()["size_bytes"] == 3 * entry_bytes
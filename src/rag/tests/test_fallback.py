@@ -0,0 +1,63 @@
+import pytest
+
+from src.rag.serving.fallback import (
+    FALLBACK_TEMPLATES,
+    calibrate_threshold,
+    detect_language,
+    fallback_answer,
+    is_low_confidence,
+)
+
+
+def test_detect_language():
+    assert detect_language("Where can I park for the game?") == "en"
+    assert detect_language("¿Dónde puedo estacionar para el juego?") == "es"
+    assert detect_language("Où est le stade et comment je peux y aller ?") == "fr"
+    assert detect_language("Rays") == "en"
+
+
+def test_is_low_confidence():
+    assert is_low_confidence([0.55, 0.60], threshold=0.4)
+    assert not is_low_confidence([0.55, 0.30], threshold=0.4)
+    assert is_low_confidence([], threshold=0.4)
+    # Keyword-only matches are trusted
+    assert not is_low_confidence([None], threshold=0.4)
+    # A strong keyword match is answered even when every dense match is weak
+    assert not is_low_confidence([0.55, 0.60], threshold=0.4, lexical_coverage=[None, 0.9])
+    assert is_low_confidence([0.55, 0.60], threshold=0.4, lexical_coverage=[0.3, None], min_lexical_coverage=0.75)
+
+
+def test_fallback_answer_links_closest_pages_once():
+    results = {
+        "metadatas": [
+            {"source_url": "https://www.mlb.com/rays/tickets"},
+            {"source_url": "https://www.mlb.com/rays/parking"},
+            {"source_url": "https://www.mlb.com/rays/tickets"},
+            {"source_url": "https://www.mlb.com/rays/food"},
+        ],
+        "distances": [0.60, 0.50, 0.45, None],
+    }
+
+    answer = fallback_answer("¿Dónde está la playa?", results, max_links=2)
+
+    assert answer.startswith(FALLBACK_TEMPLATES["es"]["answer"])
+    assert answer.endswith("- https://www.mlb.com/rays/tickets\n- https://www.mlb.com/rays/parking")
+    assert fallback_answer("Where is the beach?", {"metadatas": [], "distances": []}) == FALLBACK_TEMPLATES["en"]["answer"]
+
+
+def test_calibrate_threshold():
+    answerable = [0.10, 0.15, 0.20, 0.25, 0.30, 0.32, 0.35, 0.38, 0.40, 0.55]
+    unanswerable = [0.36, 0.45, 0.50, 0.60]
+
+    strict = calibrate_threshold(answerable, unanswerable, max_false_fallback_rate=0.0)
+    assert strict["threshold"] == 0.55
+    assert strict["false_fallback_rate"] == 0.0
+    assert strict["fallback_recall"] == 0.25
+
+    tolerant = calibrate_threshold(answerable, unanswerable, max_false_fallback_rate=0.1)
+    assert tolerant["threshold"] == 0.40
+    assert tolerant["false_fallback_rate"] == pytest.approx(0.1)
+    assert tolerant["fallback_recall"] == 0.75
+
+    with pytest.raises(ValueError):
+        calibrate_threshold([], unanswerable)
@@ -0,0 +1,44 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[3]
+
+HEAVY_MODULES = {
+    "torch",
+    "transformers",
+    "sentence_transformers",
+    "chromadb",
+    "crawl4ai",
+    "langchain_core",
+    "langchain_anthropic",
+    "streamlit",
+}
+
+
+def _modules_loaded_by(statement):
+    code = f"import sys\n{statement}\nprint('\\n'.join(sys.modules))"
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    return set(result.stdout.split())
+
+
+@pytest.mark.parametrize("statement", [
+    "import src.rag",
+    "from src.rag.processing import ContentCleaner, ContentChunker, preprocess_sections",
+    "from src.rag.utils import iter_markdown_file",
+    "from src.rag.storage import IndexSnapshot",
+    "import src.rag.config",
+])
+def test_light_imports_do_not_load_heavy_dependencies(statement):
+    assert not _modules_loaded_by(statement) & HEAVY_MODULES
+
+
+def test_lazy_exports_resolve_on_first_use():
+    loaded = _modules_loaded_by("import src.rag\nsrc.rag.ContentCleaner")
+
+    assert "src.rag.processing.cleaner" in loaded
+    assert "src.rag.storage.vectorstore" not in loaded
@@ -0,0 +1,91 @@
+import hashlib
+
+import numpy as np
+from chromadb import Documents, EmbeddingFunction, Embeddings
+
+from src.rag.storage.vectorstore import RaysVectorStore
+from src.rag.utils.hashing import chunk_id
+
+
+class CountingEmbeddingFunction(EmbeddingFunction[Documents]):
+    """Deterministic hash-based embeddings that record what was embedded."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, input: Documents) -> Embeddings:
+        self.calls.append(list(input))
+        vectors = []
+        for text in input:
+            seed = int(hashlib.sha256(text.encode("utf-8")).hexdigest()[:8], 16)
+            vectors.append(np.random.default_rng(seed).normal(size=16).astype(np.float32))
+        return vectors
+
+    @staticmethod
+    def name() -> str:
+        return "counting-test"
+
+
+def _chunks(url, paragraphs):
+    return [
+        {
+            "id": chunk_id(url, text),
+            "text": text,
+            "metadata": {"source_url": url, "chunk_index": i, "total_chunks": len(paragraphs)},
+        }
+        for i, text in enumerate(paragraphs)
+    ]
+
+
+def _sync(store, chunks):
+    return store.sync_documents(
+        documents=[c["text"] for c in chunks],
+        metadatas=[c["metadata"] for c in chunks],
+        ids=[c["id"] for c in chunks],
+    )
+
+
+def test_chunk_id_ignores_cosmetic_whitespace():
+    assert chunk_id("u", "Rays  Rush\n tickets ") == chunk_id("u", "Rays Rush tickets")
+    assert chunk_id("u", "Rays Rush") != chunk_id("v", "Rays Rush")
+
+
+def test_sync_only_embeds_changed_chunks():
+    embedding_function = CountingEmbeddingFunction()
+    store = RaysVectorStore("test_sync", embedding_function=embedding_function)
+    url = "https://www.mlb.com/rays/tickets/specials/rays-rush"
+    paragraphs = [f"Paragraph number {i} about Rays Rush tickets." for i in range(6)]
+
+    first = _sync(store, _chunks(url, paragraphs))
+    assert first["added"] == 6 and store.collection.count() == 6
+
+    embedding_function.calls.clear()
+    edited = paragraphs[:1] + ["A brand new first paragraph."] + paragraphs[2:]
+    second = _sync(store, _chunks(url, edited))
+
+    assert second == {"added": 1, "deleted": 1, "updated": 0, "unchanged": 5}
+    assert embedding_function.calls == [["A brand new first paragraph."]]
+    assert store.collection.count() == 6
+
+    embedding_function.calls.clear()
+    third = _sync(store, _chunks(url, paragraphs[1:]))
+    assert third == {"added": 1, "deleted": 2, "updated": 4, "unchanged": 0}
+    assert embedding_function.calls == [[paragraphs[1]]]
+    stored = store.collection.get(include=["metadatas"])
+    assert sorted(m["chunk_index"] for m in stored["metadatas"]) == list(range(5))
+
+
+def test_add_documents_batches_by_length_and_write_limit(monkeypatch):
+    embedding_function = CountingEmbeddingFunction()
+    store = RaysVectorStore("test_batching", embedding_function=embedding_function, embedding_batch_size=2)
+    monkeypatch.setattr(store, "_max_write_batch_size", lambda: 3)
+    writes = []
+    original_add = store.collection.add
+    monkeypatch.setattr(store.collection, "add", lambda **kw: (writes.append(len(kw["ids"])), original_add(**kw)))
+
+    documents = ["a" * n for n in (5, 50, 1, 20, 10)]
+    store.add_documents(documents, [{"n": len(d)} for d in documents], [f"d{i}" for i in range(5)])
+
+    assert [[len(d) for d in call] for call in embedding_function.calls] == [[50, 20], [10, 5], [1]]
+    assert max(writes) <= 3 and sum(writes) == 5
+    assert store.collection.count() == 5
@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+
+from src.rag.serving.intents import DEFAULT_INTENTS, IntentRouter, calibrate_similarity_threshold
+
+INTENTS = {
+    "greeting": {"examples": ["hi", "hello there"], "reply": "Hi!"},
+    "thanks": {"examples": ["thank you"], "reply": "You're welcome!"},
+}
+
+
+class KeywordEmbeddingFunction:
+    """Embeds text as counts of a few marker words, so similarity is predictable."""
+
+    WORDS = ["hi", "hello", "hey", "thank", "thanks", "park"]
+
+    def __call__(self, input):
+        return [np.array([text.lower().split().count(w) for w in self.WORDS], dtype=np.float32) + 1e-3 for text in input]
+
+
+def test_exact_phrases_route_without_embedding():
+    router = IntentRouter(INTENTS)
+
+    assert router.route("Hello there!") == "greeting"
+    assert router.route("  THANK you. ") == "thanks"
+    assert router.route("Where can I park?") is None
+    assert router.reply("thanks") == "You're welcome!"
+
+
+def test_similar_short_messages_route_by_centroid():
+    embed = KeywordEmbeddingFunction()
+    router = IntentRouter(INTENTS, embedding_function=embed, similarity_threshold=0.9, max_words=4)
+
+    assert router.route("hello hi", embed(["hello hi"])[0]) == "greeting"
+    assert router.route("park park", embed(["park park"])[0]) is None
+    # Long messages go to retrieval even when they look like small talk
+    long_message = "hi hi hi hi hi where is parking"
+    assert router.route(long_message, embed([long_message])[0]) is None
+
+
+def test_zero_threshold_routes_exact_phrases_only():
+    embed = KeywordEmbeddingFunction()
+    router = IntentRouter(INTENTS, embedding_function=embed, similarity_threshold=0.0)
+
+    assert router.route("hello hi", embed(["hello hi"])[0]) is None
+    assert router.route("hi", embed(["hi"])[0]) == "greeting"
+    # The centroids still exist for calibration
+    assert router.nearest("hello hi", embed(["hello hi"])[0])[0] == "greeting"
+
+
+def test_default_intents_have_examples_and_replies():
+    router = IntentRouter()
+
+    assert router.route("who are you?") == "identity"
+    assert router.route("Thanks!") == "thanks"
+    assert all(
+        set(intent["examples"]) == set(intent["reply"]) and all(intent["examples"].values())
+        for intent in DEFAULT_INTENTS.values()
+    )
+
+
+def test_replies_follow_the_language_of_the_message():
+    router = IntentRouter()
+
+    assert router.route("¡Hola!") == "greeting"
+    assert router.reply("greeting", "¡Hola!") == DEFAULT_INTENTS["greeting"]["reply"]["es"]
+    assert router.reply("thanks", "Muchas gracias") == DEFAULT_INTENTS["thanks"]["reply"]["es"]
+    assert router.reply("greeting", "hello") == DEFAULT_INTENTS["greeting"]["reply"]["en"]
+    assert router.reply("greeting") == DEFAULT_INTENTS["greeting"]["reply"]["en"]
+    # Plain-string replies are English and answer every language
+    assert IntentRouter(INTENTS).reply("greeting", "hola") == "Hi!"
+
+
+def test_calibrate_similarity_threshold():
+    small_talk = [0.95, 0.9, 0.8, 0.6]
+    questions = [0.85, 0.5, 0.4, 0.3]
+
+    strict = calibrate_similarity_threshold(small_talk, questions)
+    assert 0.85 < strict["threshold"] < 0.86
+    assert strict["false_route_rate"] == 0.0 and strict["route_recall"] == 0.5
+    tolerant = calibrate_similarity_threshold(small_talk, questions, max_false_route_rate=0.25)
+    assert 0.5 < tolerant["threshold"] < 0.51
+    assert tolerant["false_route_rate"] == 0.25 and tolerant["route_recall"] == 1.0
+    with pytest.raises(ValueError):
+        calibrate_similarity_threshold(small_talk, [])
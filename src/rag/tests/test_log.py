@@ -0,0 +1,30 @@
+import logging
+
+import pytest
+
+from src.rag.utils.log import PROJECT_LOGGERS, configure_logging
+
+
+@pytest.fixture
+def project_loggers():
+    """Restore the project loggers after the test."""
+    loggers = [logging.getLogger(name) for name in PROJECT_LOGGERS]
+    saved = [(logger.handlers[:], logger.level, logger.propagate) for logger in loggers]
+    for logger in loggers:
+        logger.handlers = []
+    yield loggers
+    for logger, (handlers, level, propagate) in zip(loggers, saved):
+        logger.handlers = handlers
+        logger.setLevel(level)
+        logger.propagate = propagate
+
+
+def test_configure_logging_adds_one_handler_per_project_logger(project_loggers):
+    # Streamlit reruns the app script, so this runs on every interaction
+    configure_logging("INFO")
+    configure_logging("INFO")
+
+    for logger in project_loggers:
+        assert len(logger.handlers) == 1
+        assert logger.level == logging.INFO and not logger.propagate
+    assert logging.getLogger("src.rag.serving.answer_cache").isEnabledFor(logging.INFO)
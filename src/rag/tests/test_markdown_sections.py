@@ -0,0 +1,83 @@
+import re
+from pathlib import Path
+
+from src.rag.utils.markdown_utils import iter_markdown_file, iter_markdown_sections
+
+RAW_CONTENT = Path(__file__).resolve().parents[3] / "crawl" / "content" / "rays_content_raw.md"
+
+# The regex load_knowledge_base used before the streaming parser
+LEGACY_SECTION_PATTERN = re.compile(
+    r"^##\s+(.*?)\s*\n+"
+    r"\*\*Source URL:\*\*\s*(.*?)\s*\n+"
+    r"(?:\*\*Crawled Length:\*\*.*?\n+)?"
+    r"### Content:\s*\n+"
+    r"([\s\S]*?)(?=^## |\Z)",
+    re.MULTILINE
+)
+
+
+def test_matches_legacy_regex_on_knowledge_base():
+    text = RAW_CONTENT.read_text(encoding="utf-8")
+
+    sections = list(iter_markdown_file(RAW_CONTENT))
+
+    assert sections
+    assert sections == LEGACY_SECTION_PATTERN.findall(text)
+
+
+def test_generator_format_keeps_unrelated_headings_in_content():
+    text = (
+        "# Title\n\n"
+        "## Table of Contents\n\n- [Tickets](#tickets)\n\n"
+        "## Tickets\n\n"
+        "**Source URL:** https://example.com/tickets \n\n"
+        "**Crawled Length:** 42 characters\n\n"
+        "### Content:\n\n\n"
+        "Buy tickets.\n"
+        "## Not a section\n"
+        "still tickets\n\n---\n\n"
+        "## Parking\n"
+        "**Source URL:** https://example.com/parking\n"
+        "### Content:\n"
+        "Lots open early."
+    )
+
+    sections = list(iter_markdown_sections(text.splitlines(keepends=True)))
+
+    assert sections == [
+        ("Tickets", "https://example.com/tickets",
+         "Buy tickets.\n## Not a section\nstill tickets\n\n---\n\n"),
+        ("Parking", "https://example.com/parking", "Lots open early."),
+    ]
+
+
+def test_crawler_source_format():
+    text = (
+        "# Crawled Content\n\n"
+        "## Source: https://example.com/rays-rush\n\n"
+        "Rays Rush details.\n\n---\n\n"
+        "## Source: https://example.com/student-tickets\n\n"
+        "Student pricing.\n"
+    )
+
+    sections = list(iter_markdown_sections(text.splitlines(keepends=True)))
+
+    assert sections == [
+        ("Rays Rush", "https://example.com/rays-rush", "Rays Rush details.\n\n---\n\n"),
+        ("Student Tickets", "https://example.com/student-tickets", "Student pricing.\n"),
+    ]
+
+
+def test_sections_are_yielded_before_input_is_exhausted():
+    consumed = []
+
+    def lines():
+        for line in ["## Source: https://example.com/a\n", "first\n",
+                     "## Source: https://example.com/b\n", "second\n", "more\n"]:
+            consumed.append(line)
+            yield line
+
+    first = next(iter_markdown_sections(lines()))
+
+    assert first == ("A", "https://example.com/a", "first\n")
+    assert len(consumed) == 3
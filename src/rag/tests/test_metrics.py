@@ -0,0 +1,17 @@
+import pytest
+
+from src.rag.serving.metrics import LatencyMetrics
+
+
+def test_summary_reports_window_percentiles_in_ms():
+    metrics = LatencyMetrics(window=3)
+    for seconds in (10.0, 0.1, 0.2, 0.3):
+        metrics.record("time_to_first_token", seconds)
+
+    summary = metrics.summary()["time_to_first_token"]
+
+    assert summary["count"] == 3
+    assert summary["last_ms"] == pytest.approx(300.0)
+    assert summary["p50_ms"] == pytest.approx(200.0)
+    assert summary["mean_ms"] == pytest.approx(200.0)
+    assert LatencyMetrics().summary() == {}
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from src.rag.storage.numpy_store import NumpyVectorStore
+from src.rag.tests.test_incremental_index import CountingEmbeddingFunction
+
+DOCUMENTS = [f"Rays ticket special number {i}" for i in range(30)]
+METADATAS = [{"source_url": f"https://www.mlb.com/rays/{i % 3}", "chunk_index": i} for i in range(30)]
+IDS = [f"d{i}" for i in range(30)]
+
+
+def _store(**kwargs):
+    store = NumpyVectorStore("test_numpy_store", CountingEmbeddingFunction(), **kwargs)
+    store.add_documents(DOCUMENTS, METADATAS, IDS)
+    return store
+
+
+def test_batched_query_is_exact():
+    store = _store()
+    queries = [DOCUMENTS[7], DOCUMENTS[12], "something else entirely"]
+
+    results = store.query(queries, n_results=5)
+
+    embeddings = np.asarray(CountingEmbeddingFunction()(queries))
+    embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+    expected = np.argsort(-(embeddings @ store.embeddings.T), axis=1)[:, :5]
+    assert results["ids"] == [[IDS[i] for i in row] for row in expected]
+    assert [ids[0] for ids in results["ids"][:2]] == ["d7", "d12"]
+    assert results["distances"][0][0] == pytest.approx(0.0, abs=1e-6)
+    assert results["metadatas"][1][0] == METADATAS[12]
+
+
+def test_query_with_filters_and_more_results_than_matches():
+    store = _store()
+
+    results = store.query([DOCUMENTS[7]], n_results=50, where={"source_url": "https://www.mlb.com/rays/1"})
+
+    assert len(results["ids"][0]) == 10
+    assert all(m["source_url"].endswith("/1") for m in results["metadatas"][0])
+    assert results["distances"][0] == sorted(results["distances"][0])
+
+
+def test_duplicate_ids_are_skipped_and_matrix_grows():
+    store = _store()
+
+    added = store.add_embeddings(["d0", "new"], np.ones((2, 16)), ["dup", "new doc"], [{"n": 0}, {"n": 1}])
+
+    assert added == 1 and store.count() == 31
+    assert store.embeddings.shape == (31, 16)
+    assert store.query(query_embeddings=np.ones(16), n_results=1)["ids"] == [["new"]]
+
+
+def test_repeated_ids_within_one_batch_are_added_once():
+    store = _store()
+    vectors = np.eye(16)[:3]
+
+    added = store.add_embeddings(["x", "y", "x"], vectors, ["first", "other", "second"], [{}, {}, {}])
+
+    assert added == 2 and store.count() == 32
+    assert store.ids[-2:] == ["x", "y"] and store.documents[-2:] == ["first", "other"]
+    assert store.embeddings.shape == (32, 16)
+    assert store.query(query_embeddings=vectors[0], n_results=3)["ids"][0].count("x") == 1
+
+
+def test_switches_to_hnsw_above_threshold():
+    store = _store(max_exact_documents=20)
+
+    results = store.query([DOCUMENTS[7]], n_results=3)
+
+    assert store.uses_hnsw and store.count() == 30
+    assert store.get_collection_stats()["search"] == "hnsw"
+    assert results["ids"][0][0] == "d7"
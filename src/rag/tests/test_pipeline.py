@@ -0,0 +1,30 @@
+from src.rag.processing.pipeline import preprocess_sections
+
+
+def _sections():
+    return [
+        (f"https://www.mlb.com/rays/page-{i}", f"## Page {i}\n\nRays tickets for game {i}. " * (i + 1))
+        for i in range(12)
+    ] + [("https://www.mlb.com/rays/empty", "<div></div>")]
+
+
+def _summary(results):
+    return [(url, [(c["id"], c["text"]) for c in chunks]) for url, chunks in results]
+
+
+def test_parallel_preprocessing_matches_serial_order_and_output():
+    serial = _summary(preprocess_sections(_sections(), workers=1))
+    parallel = _summary(preprocess_sections(iter(_sections()), workers=3, chunksize=2))
+
+    assert parallel == serial
+    assert [url for url, _ in parallel] == [url for url, _ in _sections()]
+    assert serial[-1] == ("https://www.mlb.com/rays/empty", [])
+
+
+def test_preprocessing_is_serial_by_default(monkeypatch):
+    def no_pool(*args, **kwargs):
+        raise AssertionError("default preprocessing must not start a process pool")
+
+    monkeypatch.setattr("src.rag.processing.pipeline.ProcessPoolExecutor", no_pool)
+
+    assert _summary(preprocess_sections(_sections())) == _summary(preprocess_sections(_sections(), workers=1))
@@ -0,0 +1,103 @@
+import numpy as np
+
+from src.rag.embeddings.cache import CachedEmbeddingFunction, EmbeddingCache, uncached
+from src.rag.embeddings.projection import (
+    PCAProjection,
+    ProjectedEmbeddingFunction,
+    corpus_projection,
+    recall_report,
+)
+from src.rag.storage.snapshot import IndexSnapshot
+from src.rag.storage.vectorstore import RaysVectorStore
+from src.rag.tests.test_incremental_index import CountingEmbeddingFunction
+
+
+def _low_rank_corpus(n=300, dim=64, rank=8, noise=0.01):
+    """Embeddings that mostly live in a `rank`-dimensional subspace."""
+    rng = np.random.default_rng(0)
+    basis = rng.normal(size=(rank, dim))
+    return (rng.normal(size=(n, rank)) @ basis + noise * rng.normal(size=(n, dim))).astype(np.float32)
+
+
+def test_projection_fit_transform_and_round_trip(tmp_path):
+    corpus = _low_rank_corpus()
+    projection = PCAProjection.fit(corpus, 8, whiten=True)
+
+    projected = projection.transform(corpus)
+    assert projected.shape == (300, 8)
+    np.testing.assert_allclose(np.linalg.norm(projected, axis=1), 1.0, rtol=1e-5)
+    assert projection.explained_variance_ratio > 0.99
+
+    projection.save(tmp_path / "projection.npz")
+    loaded = PCAProjection.load(tmp_path / "projection.npz")
+    assert loaded.whiten and loaded.version == projection.version
+    np.testing.assert_allclose(loaded.transform(corpus[:5]), projected[:5], rtol=1e-5)
+    assert PCAProjection.load(tmp_path / "missing.npz") is None
+
+
+def test_corpus_projection_reuses_matching_fit_and_skips_small_corpora():
+    corpus = _low_rank_corpus()
+    fitted = corpus_projection(corpus, 8)
+
+    assert corpus_projection(corpus, 0) is None
+    assert corpus_projection(corpus, 8, existing=fitted) is fitted
+    assert corpus_projection(corpus, 16, existing=fitted).output_dim == 16
+    assert corpus_projection(corpus[:4], 8) is None
+
+
+def test_recall_report_against_full_dimension():
+    rows = recall_report(_low_rank_corpus(), dims=[2, 8], ks=[1, 5], num_queries=50)
+
+    full, tiny, matched = rows
+    assert full["dim"] == 64 and full["recall@5"] == 1.0
+    assert matched["bytes_per_vector"] == 32
+    assert matched["recall@5"] > 0.9
+    assert tiny["recall@5"] < matched["recall@5"]
+
+
+def test_vector_store_projects_documents_and_queries():
+    embedding_function = CountingEmbeddingFunction()
+    documents = [f"Rays ticket special number {i}" for i in range(40)]
+    projection = PCAProjection.fit(embedding_function(documents), 8)
+    store = RaysVectorStore("test_projection", embedding_function=embedding_function, projection=projection)
+
+    store.add_documents(documents, [{"n": i} for i in range(40)], [f"d{i}" for i in range(40)])
+    stored = store.collection.get(ids=["d3"], include=["embeddings"])
+    results = store.query([documents[3]], n_results=1)
+
+    assert len(stored["embeddings"][0]) == 8
+    assert results["ids"][0] == ["d3"]
+    assert store.get_collection_stats()["projection_dim"] == 8
+
+
+def test_uncached_keeps_projection(tmp_path):
+    base = CountingEmbeddingFunction()
+    cached = CachedEmbeddingFunction(base, EmbeddingCache(tmp_path / "cache.sqlite3"), "counting-test")
+    projection = PCAProjection.fit(base([f"text {i}" for i in range(20)]), 4)
+    projected = ProjectedEmbeddingFunction(cached, projection)
+
+    unwrapped = uncached(projected)
+
+    assert unwrapped.embedding_function is base
+    assert len(unwrapped(["probe"])[0]) == 4
+    assert projected.name() == "counting-test-pca4"
+
+
+def test_snapshot_stores_projection(tmp_path):
+    corpus = _low_rank_corpus(n=20, dim=16, rank=4)
+    projection = PCAProjection.fit(corpus, 4)
+    kwargs = dict(
+        ids=[f"d{i}" for i in range(20)],
+        documents=[f"doc {i}" for i in range(20)],
+        metadatas=[{"source_url": "u"}] * 20,
+        embeddings=corpus,
+        model_name="test-model",
+    )
+    plain = IndexSnapshot.write(tmp_path / "plain", **kwargs)
+    written = IndexSnapshot.write(tmp_path / "projected", projection=projection, **kwargs)
+
+    loaded = IndexSnapshot.load(tmp_path / "projected")
+    assert loaded.embeddings.shape == (20, 16)
+    assert loaded.load_projection().version == projection.version
+    assert IndexSnapshot.load(tmp_path / "plain").load_projection() is None
+    assert plain.version != written.version
@@ -0,0 +1,119 @@
+import numpy as np
+import pytest
+
+from src.rag.storage.filters import matches_where, matches_where_document
+from src.rag.storage.quantized import QuantizedVectorStore, ScalarQuantizer
+from src.rag.tests.test_incremental_index import CountingEmbeddingFunction
+
+DOCUMENTS = [f"Rays ticket special number {i}" for i in range(30)]
+
+
+def _store(tmp_path=None, **kwargs):
+    store = QuantizedVectorStore(
+        "test_quantized",
+        persist_dir=str(tmp_path) if tmp_path else None,
+        embedding_function=CountingEmbeddingFunction(),
+        **kwargs,
+    )
+    store.add_documents(
+        DOCUMENTS,
+        [{"source_url": f"https://www.mlb.com/rays/{i % 3}", "chunk_index": i} for i in range(len(DOCUMENTS))],
+        [f"d{i}" for i in range(len(DOCUMENTS))],
+    )
+    return store
+
+
+def test_scalar_quantizer_scores_close_to_float():
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(500, 32)).astype(np.float32)
+    queries = rng.normal(size=(3, 32)).astype(np.float32)
+    quantizer = ScalarQuantizer.fit(vectors)
+
+    codes = quantizer.encode(vectors)
+
+    assert codes.dtype == np.int8
+    approx = quantizer.scores(codes, queries)
+    np.testing.assert_allclose(approx, queries @ vectors.T, atol=0.2)
+
+
+def test_query_matches_exact_search_with_chroma_result_shape():
+    store = _store()
+
+    results = store.query([DOCUMENTS[7], DOCUMENTS[12]], n_results=3)
+
+    assert [ids[0] for ids in results["ids"]] == ["d7", "d12"]
+    assert results["documents"][0][0] == DOCUMENTS[7]
+    assert results["distances"][0][0] == pytest.approx(0.0, abs=1e-5)
+    assert results["distances"][0] == sorted(results["distances"][0])
+    assert store.get_collection_stats()["code_bytes"] == 30 * 16
+
+
+def test_query_applies_metadata_and_document_filters():
+    store = _store()
+
+    results = store.query(
+        [DOCUMENTS[7]],
+        n_results=20,
+        where={"source_url": "https://www.mlb.com/rays/1"},
+        where_document={"$contains": "number 1"},
+    )
+
+    assert sorted(results["ids"][0]) == ["d1", "d10", "d13", "d16", "d19"]
+    assert all(m["source_url"].endswith("/1") for m in results["metadatas"][0])
+
+
+def test_out_of_range_vectors_requantize_and_store_persists(tmp_path):
+    store = _store(tmp_path)
+    scale_before = store.quantizer.scale.copy()
+
+    store.add_embeddings(["far"], [np.eye(16)[0]], ["far away"], [{"source_url": "u"}])
+    store.add_embeddings(["far"], [np.eye(16)[0]], ["far away"], [{"source_url": "u"}])
+
+    assert store.count() == 31
+    assert np.all(store.quantizer.scale >= scale_before) and not np.array_equal(store.quantizer.scale, scale_before)
+    reopened = QuantizedVectorStore("test_quantized", persist_dir=str(tmp_path), embedding_function=CountingEmbeddingFunction())
+    assert reopened.count() == 31
+    assert reopened.query([DOCUMENTS[4]], n_results=1)["ids"] == [["d4"]]
+
+
+def test_repeated_ids_within_one_batch_are_added_once():
+    store = _store()
+
+    added = store.add_embeddings(["x", "x"], np.eye(16)[:2], ["first", "second"], [{}, {}])
+
+    assert added == 1 and store.count() == 31
+    assert len(store.codes) == 31 and store._vectors.shape == (31, 16)
+    assert store.documents[-1] == "first"
+
+
+def test_interrupted_save_keeps_the_last_committed_store(tmp_path, monkeypatch):
+    store = _store(tmp_path)
+    write = store._replace_file
+
+    def crash_before_records(name, writer):
+        if name == "records.json":
+            raise OSError("disk full")
+        write(name, writer)
+
+    monkeypatch.setattr(store, "_replace_file", crash_before_records)
+    with pytest.raises(OSError):
+        # Out of range, so codes and quantizer are rewritten before the crash
+        store.add_embeddings(["far"], [np.eye(16)[0]], ["far away"], [{"source_url": "u"}])
+
+    reopened = QuantizedVectorStore("test_quantized", persist_dir=str(tmp_path), embedding_function=CountingEmbeddingFunction())
+    assert reopened.count() == 30 and len(reopened.codes) == 30
+    assert reopened.query([DOCUMENTS[4]], n_results=1)["ids"] == [["d4"]]
+    # The leftover vector row is overwritten, not appended after
+    reopened.add_embeddings(["copy"], [np.array(reopened._vectors[7])], ["copy"], [{"source_url": "u"}])
+    np.testing.assert_array_equal(reopened._vectors[30], reopened._vectors[7])
+    assert (tmp_path / "test_quantized" / "vectors.f32").stat().st_size == 31 * 16 * 4
+    assert not list(tmp_path.glob("test_quantized/.*.tmp"))
+
+
+def test_where_operators():
+    metadata = {"source_url": "a", "chunk_index": 3}
+
+    assert matches_where(metadata, {"$and": [{"source_url": "a"}, {"chunk_index": {"$gte": 3}}]})
+    assert matches_where(metadata, {"$or": [{"source_url": "b"}, {"chunk_index": {"$in": [1, 3]}}]})
+    assert not matches_where(metadata, {"chunk_index": {"$lt": 3}})
+    assert matches_where_document("Clear bag policy", {"$not_contains": "parking"})
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from src.rag.serving import query_cache
+from src.rag.serving.query_cache import LRUCache, normalize_query, retrieval_key
+
+
+def test_normalize_query():
+    assert normalize_query("  Where do I\tPARK?? ") == "where do i park"
+    assert normalize_query("Parking.") == normalize_query("parking")
+
+
+def test_retrieval_key_covers_vector_k_and_filters():
+    vector = np.arange(4, dtype=np.float32)
+    key = retrieval_key(vector, 4, {"source_url": "a", "chunk_index": 0})
+
+    assert key == retrieval_key(vector.tolist(), 4, {"chunk_index": 0, "source_url": "a"})
+    assert key != retrieval_key(vector, 5, {"source_url": "a", "chunk_index": 0})
+    assert key != retrieval_key(vector, 4, {"source_url": "b", "chunk_index": 0})
+    assert key != retrieval_key(vector + 1e-3, 4, {"source_url": "a", "chunk_index": 0})
+
+
+def test_lru_eviction_and_counters():
+    cache = LRUCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["hits"] == 3
+    assert cache.stats()["misses"] == 1
+
+
+def test_ttl_and_index_version(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(query_cache.time, "time", lambda: now[0])
+    cache = LRUCache(max_entries=10, ttl_seconds=60)
+    cache.put("a", 1, index_version="v1")
+    cache.put("b", 2, index_version="v1")
+
+    now[0] += 61
+    assert cache.get("a", index_version="v1") is None
+    cache.put("a", 1, index_version="v1")
+    assert cache.get("a", index_version="v2") is None
+    assert len(cache) == 0
+
+
+def test_rejects_empty_cache_size():
+    with pytest.raises(ValueError):
+        LRUCache(max_entries=0)
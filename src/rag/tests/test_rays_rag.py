@@ -0,0 +1,263 @@
+import asyncio
+
+import pytest
+from langchain_core.language_models import FakeListChatModel
+from langchain_core.runnables import RunnableLambda
+
+import rays_rag
+from rays_rag import RaysRAG
+from src.rag.retrieval import BM25Index, HybridRetriever
+from src.rag.serving.registry import ResourceRegistry
+from src.rag.storage.numpy_store import NumpyVectorStore
+from src.rag.tests.test_incremental_index import CountingEmbeddingFunction
+
+DOCUMENTS = [
+    "Rays Rush gives students discounted tickets for every home game.",
+    "Parking lots open two hours before first pitch.",
+    "Clear bags are required at all stadium gates.",
+]
+
+
+@pytest.fixture(autouse=True)
+def answer_every_question(monkeypatch):
+    """Hash embeddings are far from every document, so keep the fallback out of the way when a test enables it."""
+    monkeypatch.setattr(rays_rag, "FALLBACK_DISTANCE_THRESHOLD", 2.0)
+
+
+def _registry(llm):
+    """Registry pre-filled with a local vector store and the given chat model."""
+    registry = ResourceRegistry()
+    embedding_function = CountingEmbeddingFunction()
+    store = NumpyVectorStore("test_rays_rag", embedding_function)
+    store.add_documents(
+        DOCUMENTS,
+        [{"source_url": f"https://www.mlb.com/rays/{i}", "chunk_index": 0} for i in range(len(DOCUMENTS))],
+        [f"doc-{i}" for i in range(len(DOCUMENTS))],
+    )
+    retriever = HybridRetriever(store, BM25Index(store.ids, store.documents, store.metadatas))
+    registry.get("index", lambda: (retriever, embedding_function, "test-version"))
+    registry.get("llm", lambda: llm)
+    return registry
+
+
+@pytest.fixture
+def registry():
+    """Registry pre-filled with a local vector store and a scripted chat model."""
+    return _registry(FakeListChatModel(responses=["Rays Rush is $5 for students.", "Parking opens two hours early."]))
+
+
+def test_instances_share_registry_resources(registry):
+    first = RaysRAG(registry)
+    second = RaysRAG(registry)
+
+    assert first.store is second.store
+    assert first.llm is second.llm
+    assert first.index_version == "test-version"
+
+
+def test_ask_and_warm_up(registry):
+    rag = RaysRAG(registry)
+
+    rag.warm_up()
+
+    assert rag.ask("Are there student discounts?") == "Rays Rush is $5 for students."
+
+
+def test_repeated_question_is_answered_from_cache(registry):
+    rag = RaysRAG(registry)
+    embedding_function = rag.embedding_function
+    calls = len(embedding_function.calls)
+
+    assert rag.ask("Where can I park?") == "Rays Rush is $5 for students."
+    # A second LLM call would return the next scripted response
+    assert rag.ask("Where can I park?") == "Rays Rush is $5 for students."
+    # The question is embedded once, for both the answer cache and retrieval
+    assert embedding_function.calls[calls:] == [["Where can I park?"]]
+    assert rag.answer_cache.stats()["hits"] == 1
+
+
+def test_repeated_retrieval_reuses_query_vector_and_results(registry):
+    rag = RaysRAG(registry)
+    embedding_function = rag.embedding_function
+    calls = len(embedding_function.calls)
+
+    first = rag.retrieve("Where can I park?")
+    second = rag.retrieve("  where can i PARK ")
+
+    assert second == first
+    assert len(embedding_function.calls) == calls + 1
+    assert rag.query_embedding_cache.stats()["hits"] == 1
+    assert rag.retrieval_cache.stats()["hits"] == 1
+
+
+def test_stream_yields_pieces_and_records_time_to_first_token(registry):
+    rag = RaysRAG(registry)
+
+    pieces = list(rag.stream("Are there student discounts?"))
+
+    # The scripted chat model streams one character at a time
+    assert len(pieces) > 1
+    assert "".join(pieces) == "Rays Rush is $5 for students."
+    summary = rag.metrics.summary()
+    assert summary["time_to_first_token"]["count"] == 1
+    assert summary["time_to_first_token"]["last_ms"] <= summary["answer"]["last_ms"]
+    # The streamed answer was cached whole
+    assert list(rag.stream("Are there student discounts?")) == ["Rays Rush is $5 for students."]
+
+
+def test_aask_answers_concurrent_questions(registry):
+    rag = RaysRAG(registry)
+    questions = ["Are there student discounts?", "Where can I park?", "Can I bring a bag?"]
+
+    async def ask_all():
+        pieces = [piece async for piece in rag.astream(questions[0])]
+        answers = await asyncio.gather(*(rag.aask(question) for question in questions[1:]))
+        return pieces, answers
+
+    pieces, answers = asyncio.run(ask_all())
+
+    assert "".join(pieces) == "Rays Rush is $5 for students."
+    assert all(answer in ("Rays Rush is $5 for students.", "Parking opens two hours early.") for answer in answers)
+    assert rag.metrics.summary()["time_to_first_token"]["count"] == 3
+
+
+def test_ask_many_batches_and_isolates_failures():
+    llm_inputs = []
+
+    def llm(prompt_value):
+        question = prompt_value.to_messages()[-1].content
+        llm_inputs.append(question)
+        if "fireworks" in question:
+            raise RuntimeError("model overloaded")
+        return f"Answer to: {question}"
+
+    rag = RaysRAG(_registry(RunnableLambda(llm)))
+    embedding_function = rag.embedding_function
+    calls = len(embedding_function.calls)
+    questions = ["Where can I park?", "Are there fireworks?", "Can I bring a bag?", "where can i park"]
+
+    answers = rag.ask_many(questions, max_concurrency=2)
+
+    assert answers[0] == answers[3] == "Answer to: Where can I park?"
+    assert answers[1].startswith("Sorry, I encountered an error") and "model overloaded" in answers[1]
+    assert answers[2] == "Answer to: Can I bring a bag?"
+    # One embedding call for the batch, one LLM call per distinct question
+    assert embedding_function.calls[calls:] == [questions[:3]]
+    assert sorted(llm_inputs) == sorted(questions[:3])
+    # Failed answers are not cached; the rest are
+    assert rag.ask_many(["Can I bring a bag?"]) == ["Answer to: Can I bring a bag?"]
+    assert len(llm_inputs) == 3
+
+
+def test_build_context_keeps_only_close_matches(registry):
+    rag = RaysRAG(registry)
+    results = {
+        "ids": ["doc-0", "doc-1"],
+        "documents": DOCUMENTS[:2],
+        "metadatas": [{"source_url": f"https://www.mlb.com/rays/{i}", "chunk_index": 0} for i in range(2)],
+        "distances": [0.10, 0.60],
+    }
+
+    assert rag.n_candidates == 6
+    assert rag.build_context(results) == f"Source: https://www.mlb.com/rays/0\n{DOCUMENTS[0]}"
+
+
+def test_unrelated_question_gets_fallback_without_llm(monkeypatch):
+    llm_inputs = []
+
+    def llm(prompt_value):
+        llm_inputs.append(prompt_value)
+        return "LLM answer"
+
+    monkeypatch.setattr(rays_rag, "FALLBACK_ENABLED", True)
+    monkeypatch.setattr(rays_rag, "FALLBACK_DISTANCE_THRESHOLD", 0.0)
+    rag = RaysRAG(_registry(RunnableLambda(llm)))
+
+    answer = rag.ask("What's the weather in Tampa tomorrow?")
+    many = rag.ask_many(["Who won the Super Bowl?", "What's the weather in Tampa tomorrow?"])
+
+    assert answer.startswith("Sorry, I don't have information about that.")
+    assert "- https://www.mlb.com/rays/" in answer
+    assert many[1] == answer
+    assert llm_inputs == []
+
+
+def test_weak_dense_match_with_strong_keyword_match_is_answered(monkeypatch):
+    monkeypatch.setattr(rays_rag, "FALLBACK_ENABLED", True)
+    # Every dense match is too far to answer from
+    monkeypatch.setattr(rays_rag, "FALLBACK_DISTANCE_THRESHOLD", 0.0)
+    rag = RaysRAG(_registry(RunnableLambda(lambda prompt_value: "LLM answer")))
+
+    results = rag.retrieve("What is Rays Rush?", n_results=rag.n_candidates)
+    assert all(distance > 0.0 for distance in results["distances"])
+    assert rag.ask("What is Rays Rush?") == "LLM answer"
+    assert rag.ask("What's the weather in Tampa tomorrow?").startswith("Sorry, I don't have information about that.")
+
+
+def test_small_talk_skips_retrieval_and_llm():
+    llm_inputs = []
+
+    def llm(prompt_value):
+        llm_inputs.append(prompt_value)
+        return "LLM answer"
+
+    rag = RaysRAG(_registry(RunnableLambda(llm)))
+    embedding_function = rag.embedding_function
+    calls = len(embedding_function.calls)
+
+    assert rag.ask("Hi!") == rag.intent_router.reply("greeting")
+    assert rag.ask_many(["thanks", "Where can I park?"]) == [rag.intent_router.reply("thanks"), "LLM answer"]
+    assert embedding_function.calls[calls:] == [["Where can I park?"]]
+    assert len(llm_inputs) == 1
+
+
+def test_vector_store_setting_selects_the_int8_store(monkeypatch):
+    from src.rag.storage.quantized import QuantizedVectorStore
+
+    embedding_function = CountingEmbeddingFunction()
+    ids = [f"doc-{i}" for i in range(len(DOCUMENTS))]
+    metadatas = [{"source_url": f"https://www.mlb.com/rays/{i}", "chunk_index": 0} for i in range(len(DOCUMENTS))]
+    results = {}
+    for setting in ("numpy", "int8"):
+        monkeypatch.setattr(rays_rag, "VECTOR_STORE", setting)
+        store = rays_rag.create_vector_store(embedding_function)
+        store.add_embeddings(ids, embedding_function(DOCUMENTS), DOCUMENTS, metadatas)
+        results[setting] = store.query(query_embeddings=embedding_function([DOCUMENTS[1]]), n_results=2)["ids"]
+
+    assert isinstance(store, QuantizedVectorStore)
+    assert results["int8"] == results["numpy"]
+    monkeypatch.setattr(rays_rag, "VECTOR_STORE", "faiss")
+    with pytest.raises(ValueError):
+        rays_rag.create_vector_store(embedding_function)
+
+
+class _FailingChain:
+    """Generation chain that fails after streaming its first token."""
+
+    def stream(self, inputs):
+        yield "Rays Rush is"
+        raise RuntimeError("connection reset")
+
+    async def astream(self, inputs):
+        yield "Rays Rush is"
+        raise RuntimeError("connection reset")
+
+
+def test_error_after_first_token_is_set_apart_from_the_answer(registry):
+    rag = RaysRAG(registry)
+    rag.generation_chain = _FailingChain()
+
+    pieces = list(rag.stream("What is Rays Rush?"))
+    async_pieces = asyncio.run(_collect(rag.astream("What is Rays Rush?")))
+
+    assert pieces[0] == "Rays Rush is"
+    assert pieces[1].startswith(rays_rag.STREAM_ERROR_SEPARATOR)
+    assert "cut off by an error" in pieces[1] and "connection reset" not in pieces[1]
+    assert async_pieces == pieces
+    assert rag.ask("What is Rays Rush?") == "".join(pieces)
+    # A failed answer is never cached
+    assert rag.answer_cache is None or len(rag.answer_cache) == 0
+
+
+async def _collect(stream):
+    return [piece async for piece in stream]
@@ -0,0 +1,52 @@
+import threading
+import time
+
+from src.rag.serving.registry import ResourceRegistry
+
+
+def test_concurrent_callers_share_a_single_build():
+    registry = ResourceRegistry()
+    builds = []
+
+    def factory():
+        builds.append(threading.get_ident())
+        time.sleep(0.05)
+        return object()
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(registry.get("model", factory)))
+        for _ in range(16)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(builds) == 1
+    assert len(results) == 16
+    assert all(result is results[0] for result in results)
+    assert registry.names() == ["model"]
+
+
+def test_different_resources_build_independently():
+    registry = ResourceRegistry()
+    release = threading.Event()
+
+    slow = threading.Thread(target=lambda: registry.get("slow", lambda: release.wait(5)))
+    slow.start()
+    # Must not wait behind the slow build
+    assert registry.get("fast", lambda: "fast") == "fast"
+    release.set()
+    slow.join()
+
+    assert "slow" in registry
+
+
+def test_clear_rebuilds():
+    registry = ResourceRegistry()
+    first = registry.get("llm", object)
+
+    registry.clear()
+
+    assert registry.get("llm", object) is not first
@@ -0,0 +1,108 @@
+import math
+
+import numpy as np
+import pytest
+
+from src.rag.retrieval import BM25Index, HybridRetriever, reciprocal_rank_fusion, tokenize
+from src.rag.storage.numpy_store import NumpyVectorStore
+from src.rag.tests.test_incremental_index import CountingEmbeddingFunction
+
+DOCUMENTS = [
+    "Brooms are not permitted inside the ballpark.",
+    "Rays Rush is a ticket membership for students.",
+    "Parking lots open two hours before first pitch.",
+    "Salute to Service tickets honor military members and veterans.",
+    "Clear bags are required at all stadium gates.",
+    "Season ticket members get parking discounts.",
+]
+IDS = [f"doc-{i}" for i in range(len(DOCUMENTS))]
+METADATAS = [{"source_url": f"https://www.mlb.com/rays/{i}", "chunk_index": 0} for i in range(len(DOCUMENTS))]
+
+
+def test_tokenize_lowercases_and_drops_stopwords_and_plurals():
+    assert tokenize("Can I bring BROOMS to the game? Rays Rush, glass") == ["bring", "broom", "game", "ray", "rush", "glass"]
+
+
+def test_bm25_scores_match_reference_formula():
+    index = BM25Index(IDS, DOCUMENTS, METADATAS, k1=1.2, b=0.75)
+    tokenized = [tokenize(d) for d in DOCUMENTS]
+    average_length = sum(len(t) for t in tokenized) / len(tokenized)
+
+    def reference(query, terms):
+        score = 0.0
+        for term in set(tokenize(query)):
+            df = sum(term in t for t in tokenized)
+            tf = terms.count(term)
+            if not tf:
+                continue
+            idf = math.log(1 + (len(tokenized) - df + 0.5) / (df + 0.5))
+            score += idf * tf * 2.2 / (tf + 1.2 * (0.25 + 0.75 * len(terms) / average_length))
+        return score
+
+    query = "parking for season ticket members"
+    expected = [reference(query, terms) for terms in tokenized]
+    np.testing.assert_allclose(index.scores(query), expected, rtol=1e-5)
+    assert index.search(query, n_results=2)["ids"] == ["doc-5", "doc-3"]
+
+
+def test_bm25_search_respects_mask_and_ignores_unknown_terms():
+    index = BM25Index(IDS, DOCUMENTS, METADATAS)
+    mask = np.ones(len(IDS), dtype=bool)
+    mask[5] = False
+
+    assert index.search("parking", mask=mask)["ids"] == ["doc-2"]
+    assert index.search("hot dogs")["ids"] == []
+    assert index.get_stats()["documents"] == 6
+
+
+def test_bm25_coverage_is_share_of_query_idf():
+    index = BM25Index(IDS, DOCUMENTS, METADATAS)
+
+    full = index.search("Rays Rush")
+    partial = index.search("Rays Rush weather")
+
+    assert full["ids"] == ["doc-1"] and full["coverage"] == pytest.approx([1.0])
+    # The unknown term counts with the highest IDF, so it weighs most
+    assert 0.0 < partial["coverage"][0] < 2 / 3
+
+
+def test_reciprocal_rank_fusion():
+    fused = reciprocal_rank_fusion([["a", "b", "c"], ["c", "a"]], [1.0, 2.0], k=1)
+
+    assert [doc_id for doc_id, _ in fused] == ["c", "a", "b"]
+    assert fused[0][1] == pytest.approx(1 / 4 + 2 / 2)
+
+
+def test_hybrid_retriever_lifts_exact_term_matches():
+    store = NumpyVectorStore("test_retrieval", CountingEmbeddingFunction())
+    store.add_documents(DOCUMENTS, METADATAS, IDS)
+    hybrid = HybridRetriever(store, BM25Index(IDS, DOCUMENTS, METADATAS), dense_k=6, lexical_k=6)
+    dense_only = HybridRetriever(store)
+
+    results = hybrid.retrieve("Can I bring a broom?", n_results=2)
+
+    assert results["ids"][0] == "doc-0"
+    assert results["documents"][0] == DOCUMENTS[0]
+    assert len(results["distances"]) == 2 and all(0.0 <= d <= 2.0 for d in results["distances"])
+    assert dense_only.retrieve("Can I bring a broom?", n_results=3)["ids"] == store.query(["Can I bring a broom?"], n_results=3)["ids"][0]
+    filtered = hybrid.retrieve("parking", n_results=3, where={"source_url": "https://www.mlb.com/rays/5"})
+    assert filtered["ids"] == ["doc-5"]
+    assert hybrid.retrieve("Rays Rush", n_results=2)["lexical_coverage"][0] == pytest.approx(1.0)
+    assert dense_only.retrieve("parking", n_results=2)["lexical_coverage"] == [None, None]
+
+
+def test_retrieve_many_matches_single_queries():
+    store = NumpyVectorStore("test_retrieval_many", CountingEmbeddingFunction())
+    store.add_documents(DOCUMENTS, METADATAS, IDS)
+    hybrid = HybridRetriever(store, BM25Index(IDS, DOCUMENTS, METADATAS), dense_k=6, lexical_k=6)
+    queries = ["Can I bring a broom?", "parking for season ticket members", "student tickets"]
+
+    batched = hybrid.retrieve_many(queries, n_results=3)
+    single = [hybrid.retrieve(query, n_results=3) for query in queries]
+
+    for many, one in zip(batched, single):
+        assert many["ids"] == one["ids"]
+        assert many["scores"] == one["scores"]
+        # Batched and single-query matrix products can differ in the last bits
+        np.testing.assert_allclose(many["distances"], one["distances"], atol=1e-6)
+    assert hybrid.retrieve_many([]) == []
@@ -0,0 +1,79 @@
+import os
+
+import numpy as np
+import pytest
+
+from src.rag.storage.snapshot import IndexSnapshot
+
+
+def _write(path, **overrides):
+    embeddings = np.random.default_rng(0).normal(size=(3, 8)).astype(np.float32)
+    kwargs = dict(
+        ids=["a", "b", "c"],
+        documents=["Rays Rush", "Salute to Service", "Student tickets"],
+        metadatas=[{"source_url": "u1"}, {"source_url": "u2"}, {"source_url": "u3"}],
+        embeddings=embeddings,
+        model_name="test-model",
+        probe_embedding=embeddings[0],
+        source_sha256="abc",
+    )
+    kwargs.update(overrides)
+    return IndexSnapshot.write(path, **kwargs), embeddings
+
+
+def test_snapshot_round_trip(tmp_path):
+    written, embeddings = _write(tmp_path / "snap")
+
+    loaded = IndexSnapshot.load(
+        tmp_path / "snap",
+        model_name="test-model",
+        source_sha256="abc",
+        probe_embedding=embeddings[0],
+    )
+
+    assert loaded is not None
+    assert loaded.ids == ["a", "b", "c"]
+    assert loaded.metadatas[1] == {"source_url": "u2"}
+    assert loaded.version == written.version
+    assert isinstance(loaded.embeddings, np.memmap)
+    np.testing.assert_array_equal(loaded.embeddings, embeddings)
+
+
+def test_snapshot_rejects_stale_or_mismatched(tmp_path):
+    _, embeddings = _write(tmp_path / "snap")
+    path = tmp_path / "snap"
+
+    assert IndexSnapshot.load(tmp_path / "missing") is None
+    assert IndexSnapshot.load(path, model_name="other-model") is None
+    assert IndexSnapshot.load(path, source_sha256="changed") is None
+    assert IndexSnapshot.load(path, probe_embedding=-embeddings[0]) is None
+    assert IndexSnapshot.load(path, model_name="test-model") is not None
+
+
+def test_snapshot_version_tracks_contents(tmp_path):
+    first, embeddings = _write(tmp_path / "one")
+    second, _ = _write(tmp_path / "two", embeddings=embeddings * 2)
+
+    assert first.version != second.version
+
+
+def test_rewriting_a_snapshot_keeps_the_old_one_until_the_new_one_is_in(tmp_path, monkeypatch):
+    first, embeddings = _write(tmp_path / "snap")
+    second, _ = _write(tmp_path / "snap", embeddings=embeddings * 2)
+    assert IndexSnapshot.load(tmp_path / "snap").version == second.version
+    assert [p.name for p in tmp_path.iterdir()] == ["snap"]
+
+    real_replace = os.replace
+
+    def failing_replace(src, dst):
+        if str(dst) == str(tmp_path / "snap") and ".snap." in str(src) and not str(src).endswith(".old"):
+            raise OSError("rename failed")
+        real_replace(src, dst)
+
+    monkeypatch.setattr("src.rag.storage.snapshot.os.replace", failing_replace)
+    with pytest.raises(OSError):
+        _write(tmp_path / "snap", embeddings=embeddings * 3)
+
+    # The previous snapshot is restored and nothing is left behind
+    assert IndexSnapshot.load(tmp_path / "snap").version == second.version
+    assert [p.name for p in tmp_path.iterdir()] == ["snap"]
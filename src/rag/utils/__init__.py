@@ -3,8 +3,16 @@ Utilities package for the RAG system.
 Provides various utility functions and classes.
 """
 
-from .markdown_utils import MarkdownGenerator
+from .markdown_utils import MarkdownGenerator, iter_markdown_sections, iter_markdown_file
+from .hashing import normalize_text, text_hash, chunk_id
+from .log import configure_logging
 
 __all__ = [
     'MarkdownGenerator',
+    'iter_markdown_sections',
+    'iter_markdown_file',
+    'normalize_text',
+    'text_hash',
+    'chunk_id',
+    'configure_logging',
 ]
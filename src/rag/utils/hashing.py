@@ -0,0 +1,56 @@
+"""
+Hashing utilities module for the RAG system.
+Provides stable content hashes used for chunk IDs and cache keys.
+"""
+
+import hashlib
+import re
+import unicodedata
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize text so that cosmetic differences do not change its hash.
+
+    Args:
+        text: Text to normalize
+
+    Returns:
+        str: NFC-normalized text with whitespace runs collapsed and ends trimmed
+    """
+    return _WHITESPACE.sub(' ', unicodedata.normalize('NFC', text)).strip()
+
+
+def text_hash(text: str) -> str:
+    """
+    Hash the normalized form of a text.
+
+    Args:
+        text: Text to hash
+
+    Returns:
+        str: Hex SHA-256 digest of the normalized text
+    """
+    return hashlib.sha256(normalize_text(text).encode('utf-8')).hexdigest()
+
+
+def chunk_id(url: str, text: str) -> str:
+    """
+    Build a content-addressed ID for a chunk.
+
+    The ID only changes when the chunk's own text (or source) changes, so an
+    edit early in a page does not shift the IDs of every later chunk.
+
+    Args:
+        url: Source URL of the chunk
+        text: Chunk text
+
+    Returns:
+        str: Chunk ID
+    """
+    digest = hashlib.sha256(url.encode('utf-8'))
+    digest.update(b'\0')
+    digest.update(normalize_text(text).encode('utf-8'))
+    return digest.hexdigest()[:32]
@@ -0,0 +1,35 @@
+"""
+Lazy import helpers for the RAG system.
+Lets packages re-export names from heavy submodules without importing them
+until the name is first used (PEP 562 module __getattr__).
+"""
+
+import importlib
+import sys
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def lazy_exports(package: str, exports: Dict[str, str]) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    Build module-level `__getattr__` and `__dir__` functions for a package.
+
+    Args:
+        package: The package's `__name__`
+        exports: Exported name -> submodule that defines it, relative to the package
+
+    Returns:
+        Tuple of (__getattr__, __dir__) to assign in the package's __init__
+    """
+    def __getattr__(name: str) -> Any:
+        module_name = exports.get(name)
+        if module_name is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module_name, package), name)
+        # Cache on the package so later lookups skip __getattr__
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[package])) | set(exports))
+
+    return __getattr__, __dir__
@@ -0,0 +1,36 @@
+"""
+Logging setup module for the RAG system.
+Shows the project's log messages, such as intent routing, fallback, and
+adaptive top-k decisions, on stderr when an entry point asks for them.
+"""
+
+import logging
+
+from src.rag.config.settings import LOG_LEVEL
+
+# Loggers of this project; third-party libraries keep their own settings
+PROJECT_LOGGERS = ("rays_rag", "src.rag")
+
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+
+def configure_logging(level: str = LOG_LEVEL) -> None:
+    """
+    Send the project's log records to stderr.
+
+    Safe to call more than once, e.g. on every Streamlit rerun: the handler
+    is only added the first time.
+
+    Args:
+        level: Minimum level to show, e.g. "INFO" or "WARNING"
+    """
+    for name in PROJECT_LOGGERS:
+        logger = logging.getLogger(name)
+        logger.setLevel(level)
+        if not any(getattr(handler, "rays_rag_handler", False) for handler in logger.handlers):
+            handler = logging.StreamHandler()
+            handler.setFormatter(logging.Formatter(LOG_FORMAT))
+            handler.rays_rag_handler = True
+            logger.addHandler(handler)
+        # Records are shown once here, not again by a handler on the root logger
+        logger.propagate = False
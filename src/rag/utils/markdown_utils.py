@@ -4,10 +4,16 @@ Provides functionality to generate and manage markdown content.
 """
 
 import os
-from typing import Dict
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
 from datetime import datetime
 from pathlib import Path
 
+# Line prefixes of the section formats read by iter_markdown_sections
+SOURCE_URL_PREFIX = "**Source URL:**"
+CRAWLED_LENGTH_PREFIX = "**Crawled Length:**"
+CONTENT_MARKER = "### Content:"
+CRAWLER_SOURCE_PREFIX = "## Source:"
+
 class MarkdownGenerator:
     """Class for generating well-formatted markdown content."""
     
@@ -21,6 +27,19 @@ class MarkdownGenerator:
         self.content_dir = Path(content_dir)
         self.content_dir.mkdir(exist_ok=True)
     
+    @staticmethod
+    def title_from_url(url: str) -> str:
+        """
+        Create a page title from the last segment of a URL.
+        
+        Args:
+            url: Page URL
+            
+        Returns:
+            str: Title-cased page title
+        """
+        return url.split('/')[-1].replace('-', ' ').title()
+    
     def generate_header(self, title: str) -> str:
         """
         Generate a markdown header with title and timestamp.
@@ -53,7 +72,7 @@ This document contains raw content crawled from various {title} pages.
         
         for url in urls:
             # Create page title from URL
-            page_title = url.split('/')[-1].replace('-', ' ').title()
+            page_title = self.title_from_url(url)
             # Create anchor from last part of URL
             anchor = url.split('/')[-1].lower()
             toc += f"- [{page_title}](#{anchor})\n"
@@ -72,7 +91,7 @@ This document contains raw content crawled from various {title} pages.
             str: Formatted content section
         """
         # Create section title from URL
-        page_title = url.split('/')[-1].replace('-', ' ').title()
+        page_title = self.title_from_url(url)
         
         section = f"## {page_title}\n\n"
         section += f"**Source URL:** {url}\n\n"
@@ -162,3 +181,113 @@ This document contains raw content crawled from various {title} pages.
             output += f"Preview:\n```\n{doc[:max_preview_length]}...\n```\n\n"
         
         return output
+
+
+def _is_section_heading(line: str) -> bool:
+    """Check for a level-2 markdown heading (`## Title`)."""
+    return line.startswith("##") and len(line) > 2 and line[2] in " \t"
+
+
+def iter_markdown_sections(lines: Iterable[str]) -> Iterator[Tuple[str, str, str]]:
+    """
+    Parse knowledge-base markdown into sections, one line at a time.
+    
+    Two section formats are recognised:
+    
+    - MarkdownGenerator: `## Title`, a `**Source URL:**` line, an optional
+      `**Crawled Length:**` line, then `### Content:` followed by the content.
+    - crawler.main: `## Source: <url>` followed by the content; the section
+      name is derived from the URL.
+    
+    Content runs until the next section starts (leading blank lines are
+    skipped and line endings are kept). A `## ` heading that is not followed
+    by a source line stays part of the current section's content. Sections
+    are yielded as soon as the next one begins, so callers can start work
+    before the whole input has been read. Memory use is bounded by the
+    largest section.
+    
+    Args:
+        lines: Lines of the markdown document, including line endings
+        
+    Yields:
+        Tuple of (section name, source URL, content)
+    """
+    current: Optional[Tuple[str, str]] = None
+    content: List[str] = []
+    skipping_leading_blanks = False
+    
+    # A `## Title` heading is held back until we know whether it starts a section
+    candidate_name: Optional[str] = None
+    candidate_url: Optional[str] = None
+    candidate_seen_length = False
+    candidate_lines: List[str] = []
+    
+    def append_content(line: str) -> None:
+        nonlocal skipping_leading_blanks
+        if current is None:
+            return
+        if skipping_leading_blanks:
+            if not line.strip():
+                return
+            skipping_leading_blanks = False
+        content.append(line)
+    
+    for line in lines:
+        if candidate_name is not None:
+            stripped = line.strip()
+            candidate_lines.append(line)
+            if not stripped:
+                continue
+            if candidate_url is None and stripped.startswith(SOURCE_URL_PREFIX):
+                candidate_url = stripped[len(SOURCE_URL_PREFIX):].strip()
+                continue
+            if candidate_url is not None and not candidate_seen_length and stripped.startswith(CRAWLED_LENGTH_PREFIX):
+                candidate_seen_length = True
+                continue
+            if candidate_url is not None and stripped == CONTENT_MARKER:
+                if current is not None:
+                    yield current[0], current[1], "".join(content)
+                current, content, skipping_leading_blanks = (candidate_name, candidate_url), [], True
+                candidate_name = None
+                continue
+            
+            # Not a section after all: the held-back lines are ordinary content,
+            # except the current line, which may itself start a section
+            held_back = candidate_lines[:-1]
+            candidate_name = None
+            for held in held_back:
+                append_content(held)
+        
+        if line.startswith(CRAWLER_SOURCE_PREFIX):
+            if current is not None:
+                yield current[0], current[1], "".join(content)
+            url = line[len(CRAWLER_SOURCE_PREFIX):].strip()
+            current, content, skipping_leading_blanks = (MarkdownGenerator.title_from_url(url), url), [], True
+        elif _is_section_heading(line):
+            candidate_name = line[2:].strip()
+            candidate_url = None
+            candidate_seen_length = False
+            candidate_lines = [line]
+        else:
+            append_content(line)
+    
+    if candidate_name is not None:
+        for held in candidate_lines:
+            append_content(held)
+    if current is not None:
+        yield current[0], current[1], "".join(content)
+
+
+def iter_markdown_file(path: Union[str, Path], encoding: str = "utf-8") -> Iterator[Tuple[str, str, str]]:
+    """
+    Stream sections from a knowledge-base markdown file.
+    
+    Args:
+        path: Markdown file written by MarkdownGenerator or crawler.main
+        encoding: File encoding
+        
+    Yields:
+        Tuple of (section name, source URL, content)
+    """
+    with open(path, "r", encoding=encoding, newline="") as f:
+        yield from iter_markdown_sections(f)